@@ -22,6 +22,8 @@ from .clients.proteinmpnn import ProteinMPNNClient
 from .clients.rosetta_relax import RosettaRelaxClient
 from .clients.rfd3_runpod import RFD3RunPodClient
 from .clients.runpod import RunPodClient
+from .clients.runpod import receives_webhooks
+from .clients.runpod import webhook_callback_url
 from .clients.soluprot import SoluProtClient
 from .clients.gemini import GeminiClient
 from .clients.local_http import LocalHTTPAlphaFold2Client
@@ -58,6 +60,8 @@ def _runpod_for_provider(default_runpod: RunPodClient, provider: dict) -> RunPod
         skip_verify=default_runpod.skip_verify,
         timeout_s=default_runpod.timeout_s,
         poll_interval_s=default_runpod.poll_interval_s,
+        status_wait_s=default_runpod.status_wait_s,
+        webhook_url=default_runpod.webhook_url,
         on_job_complete=default_runpod.on_job_complete,
     )
 
@@ -69,6 +73,11 @@ def build_runner(*, provider_user: str | None = None) -> PipelineRunner:
         api_key=cfg.runpod.api_key,
         ca_bundle=cfg.runpod.ca_bundle,
         skip_verify=cfg.runpod.skip_verify,
+        webhook_url=(
+            webhook_callback_url(cfg.runpod.webhook_url, cfg.runpod.webhook_secret or "")
+            if cfg.runpod.webhook_url and receives_webhooks()
+            else None
+        ),
         on_job_complete=lambda eid, data: record_job_duration(cfg.output_root, eid, data),
     )
     mmseqs_provider = _provider(provider_store, "mmseqs", provider_user)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from dataclasses import field
+from functools import lru_cache
 import base64
 import hashlib
 import hmac
@@ -33,6 +35,11 @@ class AuthManager:
     config: AuthConfig
     users: dict[str, dict[str, Any]]
     secret: bytes
+    _signer: hmac.HMAC = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Keyed once: copying the HMAC reuses the absorbed ipad/opad blocks per token.
+        self._signer = hmac.new(self.secret, digestmod=hashlib.sha256)
 
     @property
     def enabled(self) -> bool:
@@ -40,8 +47,12 @@ class AuthManager:
 
     def save(self) -> None:
         payload = {"users": self.users}
-        self.config.store_path.parent.mkdir(parents=True, exist_ok=True)
-        self.config.store_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        path = self.config.store_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp, path)
+        _parse_users_file.cache_clear()
 
     def ensure_admin(self, username: str, password: str) -> None:
         _validate_username(username)
@@ -64,7 +75,7 @@ class AuthManager:
             return None
         if not _verify_password(password, str(user.get("password_hash") or "")):
             return None
-        token = _issue_token(self.secret, username=username, role=str(user.get("role") or "user"), ttl_s=self.config.token_ttl_s)
+        token = _issue_token(self._signer, username=username, role=str(user.get("role") or "user"), ttl_s=self.config.token_ttl_s)
         return {"token": token, "user": _public_user(user)}
 
     def issue_token(self, user: dict[str, Any]) -> dict[str, Any]:
@@ -76,11 +87,11 @@ class AuthManager:
         username = str(user.get("username") or "")
         role = str(user.get("role") or "user")
         ttl_s = int(self.config.token_ttl_s)
-        token = _issue_token(self.secret, username=username, role=role, ttl_s=ttl_s)
+        token = _issue_token(self._signer, username=username, role=role, ttl_s=ttl_s)
         return {"token": token, "expires_at": int(time.time()) + max(0, ttl_s)}
 
     def verify_token(self, token: str) -> dict[str, Any] | None:
-        payload = _verify_token(self.secret, token)
+        payload = _verify_token(self._signer, token)
         if payload is None:
             return None
         username = str(payload.get("sub") or "")
@@ -192,8 +203,11 @@ def _b64url_encode(data: bytes) -> str:
 
 
 def _b64url_decode(data: str) -> bytes:
-    pad = "=" * (-len(data) % 4)
-    return base64.urlsafe_b64decode(data + pad)
+    return _b64url_decode_bytes(data.encode("ascii"))
+
+
+def _b64url_decode_bytes(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) & 3))
 
 
 def _hash_password(password: str) -> str:
@@ -227,7 +241,13 @@ def _verify_password(password: str, stored: str) -> bool:
     return hmac.compare_digest(dk, expected)
 
 
-def _issue_token(secret: bytes, *, username: str, role: str, ttl_s: int) -> str:
+def _sign(signer: hmac.HMAC, body: bytes) -> bytes:
+    mac = signer.copy()
+    mac.update(body)
+    return mac.digest()
+
+
+def _issue_token(signer: hmac.HMAC, *, username: str, role: str, ttl_s: int) -> str:
     now = int(time.time())
     payload = {
         "sub": username,
@@ -237,24 +257,27 @@ def _issue_token(secret: bytes, *, username: str, role: str, ttl_s: int) -> str:
     }
     raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
     body = _b64url_encode(raw)
-    sig = hmac.new(secret, body.encode("ascii"), hashlib.sha256).digest()
+    sig = _sign(signer, body.encode("ascii"))
     return f"{body}.{_b64url_encode(sig)}"
 
 
-def _verify_token(secret: bytes, token: str) -> dict[str, Any] | None:
-    parts = (token or "").split(".")
-    if len(parts) != 2:
+def _verify_token(signer: hmac.HMAC, token: str) -> dict[str, Any] | None:
+    try:
+        raw = (token or "").encode("ascii")
+    except UnicodeEncodeError:
+        return None
+    body, dot, sig_raw = raw.partition(b".")
+    if not dot or b"." in sig_raw:
         return None
-    body, sig_raw = parts
+    # Check the signature before touching the payload so forged tokens never reach the JSON decoder.
     try:
-        expected = hmac.new(secret, body.encode("ascii"), hashlib.sha256).digest()
-        sig = _b64url_decode(sig_raw)
+        sig = _b64url_decode_bytes(sig_raw)
     except Exception:
         return None
-    if not hmac.compare_digest(expected, sig):
+    if not hmac.compare_digest(_sign(signer, body), sig):
         return None
     try:
-        payload = json.loads(_b64url_decode(body).decode("utf-8"))
+        payload = json.loads(_b64url_decode_bytes(body))
     except Exception:
         return None
     if not isinstance(payload, dict):
@@ -276,10 +299,19 @@ def _public_user(user: dict[str, Any]) -> dict[str, Any]:
 
 
 def _load_users(path: Path) -> dict[str, dict[str, Any]]:
-    if not path.exists():
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
         return {}
+    # The parsed store is shared across calls; hand out copies so callers can mutate freely.
+    cached = _parse_users_file(str(path), mtime_ns)
+    return {username: dict(user) for username, user in cached.items()}
+
+
+@lru_cache(maxsize=8)
+def _parse_users_file(path: str, mtime_ns: int) -> dict[str, dict[str, Any]]:
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
     except Exception:
         return {}
     users = payload.get("users") if isinstance(payload, dict) else None
@@ -2,17 +2,41 @@ from __future__ import annotations
 
 import base64
 from dataclasses import dataclass
-import gzip
 import math
+import zlib
+
+import numpy as np
 
 from .fasta import FastaRecord
 from .fasta import parse_fasta
 from .fasta import to_fasta
 
 
+_INFLATE_CHUNK = 64 * 1024
+_SKIP = 0xFF
+_GAP = ord("-")
+_DOT = ord(".")
+# Byte -> residue class: uppercase A-Z map to 0..25, everything else (gaps, insertions, junk) to _SKIP.
+_AA_LUT = np.full(256, _SKIP, dtype=np.uint8)
+_AA_LUT[np.frombuffer(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", dtype=np.uint8)] = np.arange(26, dtype=np.uint8)
+
+
 def decode_a3m_gz_b64(a3m_gz_b64: str) -> str:
-    raw = base64.b64decode(a3m_gz_b64)
-    return gzip.decompress(raw).decode("utf-8", errors="replace")
+    raw = memoryview(base64.b64decode(a3m_gz_b64))
+    out = bytearray()
+    pos = 0
+    # Inflate in fixed-size slices straight into one buffer instead of materialising
+    # an intermediate decompressed bytes object; concatenated members decode back to back.
+    while pos < len(raw):
+        dec = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        while pos < len(raw) and not dec.eof:
+            chunk = raw[pos : pos + _INFLATE_CHUNK]
+            pos += len(chunk)
+            out += dec.decompress(chunk)
+        if not dec.eof:
+            raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+        pos -= len(dec.unused_data)
+    return out.decode("utf-8", errors="replace")
 
 
 def strip_insertions(a3m_seq: str) -> str:
@@ -27,13 +51,29 @@ class Conservation:
 
 
 def _normalize_records(a3m_text: str) -> list[FastaRecord]:
-    records = parse_fasta(a3m_text)
+    return _strip_records(parse_fasta(a3m_text))
+
+
+def _strip_records(records: list[FastaRecord]) -> list[FastaRecord]:
     normalized: list[FastaRecord] = []
     for rec in records:
         normalized.append(FastaRecord(header=rec.header, sequence=strip_insertions(rec.sequence)))
     return normalized
 
 
+def _row_bytes(seqs: list[str], length: int) -> np.ndarray:
+    """Stack equal-length sequences into an (N, length) uint8 matrix (non-ASCII becomes ``?``)."""
+    if not seqs:
+        return np.empty((0, length), dtype=np.uint8)
+    raw = "".join(seqs).encode("ascii", errors="replace")
+    return np.frombuffer(raw, dtype=np.uint8).reshape(len(seqs), length)
+
+
+def _residue_codes(seqs: list[str], length: int) -> np.ndarray:
+    """Stack equal-length sequences into an (N, length) array of ``_AA_LUT`` codes."""
+    return _AA_LUT[_row_bytes(seqs, length)]
+
+
 def conservation_scores(a3m_text: str, *, weights: list[float] | None = None) -> list[float]:
     records = _normalize_records(a3m_text)
     query = records[0].sequence
@@ -41,35 +81,28 @@ def conservation_scores(a3m_text: str, *, weights: list[float] | None = None) ->
     if L <= 0:
         raise ValueError("A3M query sequence is empty")
 
-    counts: list[dict[str, float]] = [dict() for _ in range(L)]
-    totals: list[float] = [0.0 for _ in range(L)]
-
     hits = records[1:]
     hit_weights: list[float] = [1.0 for _ in hits] if weights is None else [float(x) for x in weights]
     if len(hit_weights) != len(hits):
         raise ValueError(f"Expected weights for {len(hits)} hits, got {len(hit_weights)}")
 
-    for rec, w in zip(hits, hit_weights, strict=False):
-        seq = rec.sequence
-        if len(seq) != L:
-            continue
-        for i, ch in enumerate(seq):
-            if ch in {"-", "."}:
-                continue
-            up = ch.upper()
-            if not up.isalpha():
-                continue
-            totals[i] += float(w)
-            counts[i][up] = counts[i].get(up, 0.0) + float(w)
+    usable = [(rec.sequence, w) for rec, w in zip(hits, hit_weights, strict=False) if len(rec.sequence) == L]
+    codes = _residue_codes([seq for seq, _w in usable], L)
+    row_weights = np.asarray([w for _seq, w in usable], dtype=np.float64)
 
-    scores: list[float] = []
-    for i in range(L):
-        if float(totals[i]) <= 0.0:
-            scores.append(0.0)
-            continue
-        max_count = max(counts[i].values(), default=0.0)
-        scores.append(float(max_count) / float(totals[i]))
-    return scores
+    valid = codes != _SKIP
+    cols = np.broadcast_to(np.arange(L), codes.shape)[valid]
+    cell_weights = np.broadcast_to(row_weights[:, None], codes.shape)[valid]
+    counts = np.bincount(
+        codes[valid].astype(np.intp) * L + cols,
+        weights=cell_weights,
+        minlength=26 * L,
+    ).reshape(26, L)
+    totals = counts.sum(axis=0)
+
+    scores = np.zeros(L, dtype=np.float64)
+    np.divide(counts.max(axis=0), totals, out=scores, where=totals > 0.0)
+    return scores.tolist()
 
 
 def fixed_positions(
@@ -85,23 +118,23 @@ def fixed_positions(
     if L == 0:
         return {tier: [] for tier in tiers}
 
-    pos_scores = [(idx + 1, float(score)) for idx, score in enumerate(scores)]
-    pos_scores.sort(key=lambda t: (-t[1], t[0]))
-
+    arr = np.asarray(scores, dtype=np.float64)
     out: dict[float, list[int]] = {}
     for tier in tiers:
         t = float(tier)
         if mode == "threshold":
-            fixed = [pos for pos, score in pos_scores if score >= t]
+            picked = np.flatnonzero(arr >= t)
         else:
-            k = int(math.floor(L * t))
-            if k < 0:
-                k = 0
-            if k > L:
-                k = L
-            fixed = [pos for pos, _score in pos_scores[:k]]
-        fixed.sort()
-        out[tier] = fixed
+            k = min(L, max(0, int(math.floor(L * t))))
+            if k == 0:
+                out[tier] = []
+                continue
+            # Top-k without a full sort; ties at the cutoff go to the lowest positions.
+            kth = np.partition(arr, L - k)[L - k]
+            above = np.flatnonzero(arr > kth)
+            ties = np.flatnonzero(arr == kth)[: k - above.size]
+            picked = np.sort(np.concatenate([above, ties]))
+        out[tier] = (picked + 1).tolist()
     return out
 
 
@@ -154,34 +187,17 @@ def msa_quality(a3m_text: str) -> dict[str, object]:
         raise ValueError("A3M query sequence is empty")
 
     total_hits = max(0, len(records) - 1)
-    usable_hits = 0
-    length_mismatch_hits = 0
-    coverages: list[float] = []
-    identities: list[float] = []
-    depths: list[int] = [0 for _ in range(L)]
-
-    for rec in records[1:]:
-        seq = rec.sequence
-        if len(seq) != L:
-            length_mismatch_hits += 1
-            continue
-        usable_hits += 1
-
-        non_gap = 0
-        matches = 0
-        for i, ch in enumerate(seq):
-            if ch in {"-", "."}:
-                continue
-            up = ch.upper()
-            if not up.isalpha():
-                continue
-            non_gap += 1
-            depths[i] += 1
-            if up == query[i].upper():
-                matches += 1
-
-        coverages.append(non_gap / L)
-        identities.append(matches / L)
+    usable = [rec.sequence for rec in records[1:] if len(rec.sequence) == L]
+    usable_hits = len(usable)
+    length_mismatch_hits = total_hits - usable_hits
+
+    matrix = _row_bytes(usable, L)
+    is_residue = _AA_LUT[matrix] != _SKIP
+    matches = is_residue & (matrix == _row_bytes([query.upper()], L))
+    coverage_arr = is_residue.sum(axis=1) / L
+    coverages = coverage_arr.tolist()
+    identities = (matches.sum(axis=1) / L).tolist()
+    depths = is_residue.sum(axis=0).tolist()
 
     warnings: list[str] = []
     if usable_hits < 10:
@@ -195,7 +211,7 @@ def msa_quality(a3m_text: str) -> dict[str, object]:
         warnings.append(f"median_depth={float(depth_stats.get('p50', 0.0)):.1f} (<10)")
 
     full_length_threshold = 0.7
-    full_length_hits = sum(1 for cov in coverages if cov >= full_length_threshold)
+    full_length_hits = int((coverage_arr >= full_length_threshold).sum())
     full_length_fraction = (full_length_hits / usable_hits) if usable_hits > 0 else 0.0
     if usable_hits > 0 and full_length_fraction < 0.05:
         warnings.append(
@@ -232,7 +248,7 @@ def filter_a3m(
         raise ValueError("min_identity must be within [0, 1]")
 
     records_raw = parse_fasta(a3m_text)
-    records = _normalize_records(a3m_text)
+    records = _strip_records(records_raw)
     if not records:
         return a3m_text, {"kept_hits": 0, "dropped_hits": 0, "reason": "empty_a3m"}
 
@@ -244,36 +260,20 @@ def filter_a3m(
     if min_coverage <= 0.0 and min_identity <= 0.0:
         return a3m_text, {"kept_hits": max(0, len(records) - 1), "dropped_hits": 0, "skipped": True}
 
-    kept: list[FastaRecord] = [records_raw[0]]
-    kept_hits = 0
-    dropped_hits = 0
-    dropped_length_mismatch = 0
-
-    for raw_rec, norm_rec in zip(records_raw[1:], records[1:], strict=False):
-        seq = norm_rec.sequence
-        if len(seq) != L:
-            dropped_hits += 1
-            dropped_length_mismatch += 1
-            continue
-
-        non_gap = 0
-        matches = 0
-        for i, ch in enumerate(seq):
-            if ch in {"-", "."}:
-                continue
-            non_gap += 1
-            if ch.upper() == query[i].upper():
-                matches += 1
+    usable = [idx for idx in range(1, len(records)) if len(records[idx].sequence) == L]
+    dropped_length_mismatch = len(records) - 1 - len(usable)
 
-        coverage = non_gap / L
-        identity = matches / L
+    # Per-hit coverage/identity as whole-matrix reductions over an (N, L) byte array.
+    matrix = _row_bytes([records[idx].sequence for idx in usable], L)
+    non_gap = (matrix != _GAP) & (matrix != _DOT)
+    coverage = non_gap.sum(axis=1) / L
+    identity = (non_gap & (matrix == _row_bytes([query], L))).sum(axis=1) / L
+    keep = (coverage >= min_coverage) & (identity >= min_identity)
 
-        if coverage < min_coverage or identity < min_identity:
-            dropped_hits += 1
-            continue
-
-        kept.append(raw_rec)
-        kept_hits += 1
+    kept: list[FastaRecord] = [records_raw[0]]
+    kept.extend(records_raw[idx] for idx, ok in zip(usable, keep.tolist(), strict=True) if ok)
+    kept_hits = len(kept) - 1
+    dropped_hits = len(records) - 1 - kept_hits
 
     return (
         to_fasta(kept),
@@ -3,6 +3,12 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 
+# Byte -> byte shifted left by 2/4/6 bits, used to pack direction codes (0..2) four per byte.
+_SHL2 = bytes((b << 2) & 0xFF for b in range(256))
+_SHL4 = bytes((b << 4) & 0xFF for b in range(256))
+_SHL6 = bytes((b << 6) & 0xFF for b in range(256))
+
+
 @dataclass(frozen=True)
 class AlignmentResult:
     query_len: int
@@ -84,21 +90,24 @@ def global_alignment_mapping(
         )
 
     stride = m + 1
-    ptr = bytearray((n + 1) * stride)
+    # Traceback pointers are stored at 2 bits per cell, one packed row of ``packed_stride`` bytes per i.
+    packed_stride = (stride + 3) // 4
+    ptr = bytearray((n + 1) * packed_stride)
+    row = bytearray(packed_stride * 4)
 
     # First row: only LEFT moves.
     for j in range(1, stride):
-        ptr[j] = 2
+        row[j] = 2
+    ptr[0:packed_stride] = _pack_directions(row)
 
     dp_prev = [gap_score * j for j in range(stride)]
 
     for i in range(1, n + 1):
         dp_cur = [0] * stride
         dp_cur[0] = gap_score * i
-        ptr[i * stride] = 1
+        row[0] = 1
 
         qch = query[i - 1]
-        base = i * stride
         diag_prev = dp_prev[0]
         for j in range(1, stride):
             t_prev = target[j - 1]
@@ -116,9 +125,10 @@ def global_alignment_mapping(
                 direction = 2
 
             dp_cur[j] = best
-            ptr[base + j] = direction
+            row[j] = direction
             diag_prev = dp_prev[j]
 
+        ptr[i * packed_stride : (i + 1) * packed_stride] = _pack_directions(row)
         dp_prev = dp_cur
 
     mapping: list[int | None] = [None for _ in range(n)]
@@ -131,7 +141,7 @@ def global_alignment_mapping(
     i = n
     j = m
     while i > 0 or j > 0:
-        direction = ptr[i * stride + j]
+        direction = (ptr[i * packed_stride + (j >> 2)] >> ((j & 3) << 1)) & 0b11
         if direction == 0:
             aligned_pairs += 1
             if query[i - 1] == target[j - 1]:
@@ -170,3 +180,14 @@ def global_alignment_mapping(
         coverage_target=coverage_target,
         mapping_query_to_target=mapping,
     )
+
+
+def _pack_directions(row: bytearray) -> bytes:
+    """Pack a row of direction codes (length a multiple of 4) into 2 bits per cell, little-endian."""
+    packed = (
+        int.from_bytes(row[0::4], "little")
+        | int.from_bytes(row[1::4].translate(_SHL2), "little")
+        | int.from_bytes(row[2::4].translate(_SHL4), "little")
+        | int.from_bytes(row[3::4].translate(_SHL6), "little")
+    )
+    return packed.to_bytes(len(row) // 4, "little")
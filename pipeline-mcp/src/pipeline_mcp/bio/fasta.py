@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import io
 import re
 
+from .pdb import _OTHER_LINE_BREAKS
+
 
 _HEADER_ID_RE = re.compile(r"^(\S+)")
+_HEADER_LINE_RE = re.compile(r"^[^\S\n]*>([^\n]*)", re.MULTILINE)
 
 
 @dataclass(frozen=True)
@@ -46,33 +50,23 @@ class FastaRecord:
 
 
 def parse_fasta(text: str) -> list[FastaRecord]:
+    # The header pattern only knows "\n"; other line boundaries splitlines() honours are mapped onto it.
+    if any(sep in text for sep in _OTHER_LINE_BREAKS):
+        text = "\n".join(text.splitlines())
+    # One C-level scan locates every header line; sequence blocks are the slices between them.
+    headers = list(_HEADER_LINE_RE.finditer(text))
+    leading = text[: headers[0].start()] if headers else text
+    if leading.strip():
+        raise ValueError("Invalid FASTA: sequence line before header")
+
     records: list[FastaRecord] = []
-    header: str | None = None
-    seq_parts: list[str] = []
-
-    def flush() -> None:
-        nonlocal header, seq_parts
-        if header is None:
-            return
-        seq = "".join(seq_parts).replace(" ", "").replace("\t", "").strip()
+    for idx, match in enumerate(headers):
+        header = match.group(1).strip()
+        block_end = headers[idx + 1].start() if idx + 1 < len(headers) else len(text)
+        seq = "".join(text[match.end() : block_end].split())
         if not seq:
             raise ValueError(f"Empty FASTA sequence for header: {header!r}")
         records.append(FastaRecord(header=header, sequence=seq))
-        header = None
-        seq_parts = []
-
-    for raw in text.splitlines():
-        line = raw.strip()
-        if not line:
-            continue
-        if line.startswith(">"):
-            flush()
-            header = line[1:].strip()
-            continue
-        if header is None:
-            raise ValueError("Invalid FASTA: sequence line before header")
-        seq_parts.append(line)
-    flush()
 
     if not records:
         raise ValueError("No FASTA records found")
@@ -80,11 +74,13 @@ def parse_fasta(text: str) -> list[FastaRecord]:
 
 
 def to_fasta(records: list[FastaRecord]) -> str:
-    lines: list[str] = []
+    buf = io.StringIO()
+    write = buf.write
     for rec in records:
-        header = rec.header.replace("\n", " ").strip()
-        seq = rec.sequence.replace("\n", "").strip()
-        lines.append(f">{header}")
-        lines.append(seq)
-    return "\n".join(lines) + "\n"
+        write(">")
+        write(rec.header.replace("\n", " ").strip())
+        write("\n")
+        write(rec.sequence.replace("\n", "").strip())
+        write("\n")
+    return buf.getvalue() or "\n"
 
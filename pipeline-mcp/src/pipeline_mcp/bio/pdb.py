@@ -1,12 +1,28 @@
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from functools import lru_cache
+from functools import partial
 import math
+import os
 import re
 
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
 
 _WATER_RESNAMES = {"HOH", "WAT", "H2O"}
+# Below this many atom pairs the dense broadcast beats building a KD-tree.
+_KDTREE_MIN_PAIRS = 1 << 14
+# Without SciPy, large searches go through a cell grid; below these sizes its fixed cost loses.
+_GRID_MIN_PAIRS = 1 << 17
+_GRID_MIN_TARGETS = 32
+_NEIGHBOUR_CELLS = np.array([(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)], dtype=np.int64)
 _AA3_TO_AA1: dict[str, str] = {
     "ALA": "A",
     "ARG": "R",
@@ -41,9 +57,17 @@ _AA3_TO_AA1: dict[str, str] = {
     "UNK": "X",
 }
 
+# Three uppercase letters packed base-26 -> ASCII one-letter code (0 for names not listed above).
+_AA3_LUT = np.zeros(26**3, dtype=np.uint8)
+_AA3_LUT[[(ord(a) - 65) * 676 + (ord(b) - 65) * 26 + (ord(c) - 65) for a, b, c in _AA3_TO_AA1]] = [
+    ord(aa) for aa in _AA3_TO_AA1.values()
+]
 
-@dataclass(frozen=True)
+
+@dataclass(eq=False, slots=True)
 class Atom:
+    """One parsed atom record; a plain carrier, so no value equality or hashing is generated."""
+
     record: str  # ATOM or HETATM
     atom_name: str
     resname: str
@@ -56,14 +80,16 @@ class Atom:
     element: str
 
 
-@dataclass(frozen=True)
+@dataclass(eq=False, slots=True)
 class Residue:
+    """One residue and its atoms in file order; like ``Atom``, compared and hashed by identity."""
+
     chain_id: str
     index: int  # 1-based within chain
     resname: str
     resseq: int
     icode: str
-    atoms: tuple[Atom, ...]
+    atoms: list[Atom]
 
 
 def _parse_int(value: str, default: int = 0) -> int:
@@ -93,7 +119,7 @@ _CIF_TOKEN_RE = re.compile(
 
 def looks_like_mmcif(text: str) -> bool:
     raw = str(text or "").lstrip()
-    return raw.lower().startswith("data_") and "_atom_site." in raw
+    return raw[:5].lower() == "data_" and "_atom_site." in raw
 
 
 def _clean_cif_token(value: str) -> str:
@@ -230,9 +256,9 @@ def strip_to_first_model(pdb_text: str) -> str:
     corrupting downstream sequence extraction. Single-model or model-less input is
     returned unchanged.
     """
-    lines = pdb_text.splitlines(keepends=True)
-    if not any(line[:5] == "MODEL" for line in lines):
+    if next(_model_line_starts(pdb_text), None) is None:
         return pdb_text
+    lines = pdb_text.splitlines(keepends=True)
     out: list[str] = []
     model_count = 0
     for line in lines:
@@ -250,30 +276,245 @@ def strip_to_first_model(pdb_text: str) -> str:
     return "".join(out)
 
 
+def _model_line_starts(pdb_text: str):
+    """Offsets of ``MODEL`` at the start of a line (any ``str.splitlines()`` boundary).
+
+    ``str.find`` jumps between the rare ``MODEL`` substrings, so the text is never split into lines.
+    """
+    pos = pdb_text.find("MODEL")
+    while pos != -1:
+        if pos == 0 or pdb_text[pos - 1] == "\n" or pdb_text[pos - 1] in _OTHER_LINE_BREAKS:
+            yield pos
+        pos = pdb_text.find("MODEL", pos + 1)
+
+
+def count_models(pdb_text: str) -> int:
+    """Number of lines starting with ``MODEL``."""
+    return sum(1 for _ in _model_line_starts(pdb_text))
+
+
 def normalize_structure_text(text: str) -> str:
     raw = str(text or "")
     pdb = mmcif_to_pdb(raw) if looks_like_mmcif(raw) else raw
     return strip_to_first_model(pdb)
 
 
-def iter_atoms(pdb_text: str):
-    for raw in pdb_text.splitlines():
-        if not raw:
-            continue
-        rec = raw[:6].strip().upper()
-        if rec not in {"ATOM", "HETATM"}:
-            continue
+_ATOM_RECORDS = {"ATOM", "HETATM"}
+# Line boundaries str.splitlines() honours besides "\n"; texts containing any are normalised first.
+_OTHER_LINE_BREAKS = ("\r", "\v", "\f", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029")
+_PDB_LINE_WIDTH = 80
+# Bytes str.strip() removes, as a lookup table over uint8 values.
+_STRIP_BYTES = np.zeros(256, dtype=bool)
+_STRIP_BYTES[np.frombuffer(b" \t\n\v\f\r\x1c\x1d\x1e\x1f", dtype=np.uint8)] = True
+
+
+@dataclass(frozen=True)
+class _AtomColumns:
+    """ATOM/HETATM records of a PDB text as parallel arrays (one entry per atom)."""
+
+    is_hetatm: np.ndarray  # bool
+    atom_name: np.ndarray  # str
+    resname: np.ndarray  # str
+    chain_id: np.ndarray  # str, "_" when blank
+    resseq: np.ndarray  # int64
+    icode: np.ndarray  # str
+    coords: np.ndarray  # float64, shape (N, 3)
+    element: np.ndarray  # str, upper-cased
+
+    def __len__(self) -> int:
+        return len(self.is_hetatm)
+
+
+def _fixed_numbers(field: np.ndarray, *, integer: bool) -> np.ndarray:
+    """Decode an (N, width) block of ASCII bytes holding one right-justified number per row.
+
+    Rows shaped ``[spaces][sign]digits[.digits][spaces]`` are decoded digit by digit, one column
+    at a time across all rows: the digits form an exact integer mantissa that is divided once by
+    a power of ten, which rounds exactly as ``float()`` does. Blank rows become 0; anything else
+    (exponents, stray characters) goes through ``_parse_int``/``_parse_float`` so the defaults
+    stay the same.
+    """
+    n = field.shape[0]
+    mantissa = np.zeros(n, dtype=np.int64)
+    frac_digits = np.zeros(n, dtype=np.int64)
+    n_digits = np.zeros(n, dtype=np.int64)
+    negative = np.zeros(n, dtype=bool)
+    seen_point = np.zeros(n, dtype=bool)
+    started = np.zeros(n, dtype=bool)
+    ended = np.zeros(n, dtype=bool)
+    bad = np.zeros(n, dtype=bool)
+    for column in np.ascontiguousarray(field.T).astype(np.int64):
+        digit = (column >= 48) & (column <= 57)
+        space = column == 32
+        sign = (column == 45) | (column == 43)
+        point = column == 46
+        bad |= (ended & ~space) | (sign & started) | (point & seen_point)
+        bad |= ~(digit | space | sign | point) if not integer else ~(digit | space | sign)
+        mantissa = np.where(digit, mantissa * 10 + (column - 48), mantissa)
+        frac_digits += digit & seen_point
+        n_digits += digit
+        negative |= (column == 45) & ~started
+        seen_point |= point
+        ended |= space & started
+        started |= ~space
+
+    blank = ~started
+    if integer:
+        out = np.where(negative, -mantissa, mantissa)
+    else:
+        value = mantissa / 10.0**frac_digits
+        out = np.where(negative, -value, value)
+    out[blank] = 0
+
+    odd = np.flatnonzero(~blank & (bad | (n_digits == 0)))
+    if len(odd):
+        parse = _parse_int if integer else _parse_float
+        out[odd] = [parse(bytes(row).decode("ascii")) for row in field[odd]]
+    return out
+
+
+def _upper_ascii(block: np.ndarray) -> np.ndarray:
+    return np.where((block >= ord("a")) & (block <= ord("z")), block - 32, block).astype(np.uint8)
+
+
+def _gather_lines(data: np.ndarray, starts: np.ndarray, ends: np.ndarray, width: int) -> np.ndarray:
+    """(N, width) uint8 matrix of ``data[starts[i]:ends[i]]``, cut or space-padded to ``width`` bytes."""
+    padded = np.concatenate([data, np.full(width, ord(" "), dtype=np.uint8)])
+    # Every row reads a full window from its start; bytes past the line end are then blanked.
+    out = np.lib.stride_tricks.sliding_window_view(padded, width)[starts]
+    out[np.arange(width) >= (ends - starts)[:, None]] = ord(" ")
+    return out
+
+
+def _record_rows(head: np.ndarray, record: bytes) -> np.ndarray:
+    """Rows whose upper-cased first six bytes strip to ``record``, like ``raw[:6].strip().upper() == record``."""
+    blank = _STRIP_BYTES[head]
+    name = np.frombuffer(record, dtype=np.uint8)
+    width = len(name)
+    found = np.zeros(len(head), dtype=bool)
+    for lead in range(7 - width):
+        found |= (
+            (head[:, lead : lead + width] == name).all(axis=1)
+            & blank[:, :lead].all(axis=1)
+            & blank[:, lead + width :].all(axis=1)
+        )
+    return found
+
+
+def _atom_columns(pdb_text: str) -> _AtomColumns:
+    if not pdb_text.isascii():
+        lines = [raw for raw in pdb_text.splitlines() if raw[:6].strip().upper() in _ATOM_RECORDS]
+        return _atom_columns_from_lines(lines)
+    if any(sep in pdb_text for sep in _OTHER_LINE_BREAKS):
+        pdb_text = "\n".join(pdb_text.splitlines())
+
+    # Find records by newline offsets over one byte buffer; only ATOM/HETATM lines are ever copied.
+    data = np.frombuffer((pdb_text + "\n").encode("ascii"), dtype=np.uint8)
+    ends = np.flatnonzero(data == ord("\n"))
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    head = _upper_ascii(_gather_lines(data, starts, ends, 6))
+    keep = _record_rows(head, b"ATOM") | _record_rows(head, b"HETATM")
+
+    # Fixed-column layout: every record cut or padded to 80 bytes, columns sliced out of one (N, 80) matrix.
+    n = int(keep.sum())
+    mat = _gather_lines(data, starts[keep], ends[keep], _PDB_LINE_WIDTH)
+
+    def stripped(block: np.ndarray) -> np.ndarray:
+        width = block.shape[1]
+        return np.char.strip(np.ascontiguousarray(block).view(f"S{width}").reshape(n))
+
+    def text(block: np.ndarray) -> np.ndarray:
+        return stripped(block).astype(f"U{block.shape[1]}")
+
+    atom_name_bytes = np.ascontiguousarray(stripped(mat[:, 12:16]))
+    atom_name = atom_name_bytes.astype("U4")
+    chain_id = text(mat[:, 21:22])
+    element = text(_upper_ascii(mat[:, 76:78]))
+    first_char = atom_name_bytes.view(np.uint8).reshape(n, atom_name_bytes.dtype.itemsize)[:, :1]
+    fallback_element = text(_upper_ascii(first_char))
+    return _AtomColumns(
+        is_hetatm=(head[keep] == np.frombuffer(b"HETATM", dtype=np.uint8)).all(axis=1),
+        atom_name=atom_name,
+        resname=text(mat[:, 17:20]),
+        chain_id=np.where(chain_id == "", "_", chain_id),
+        resseq=_fixed_numbers(mat[:, 22:26], integer=True),
+        icode=text(mat[:, 26:27]),
+        coords=np.stack(
+            [
+                _fixed_numbers(mat[:, 30:38], integer=False),
+                _fixed_numbers(mat[:, 38:46], integer=False),
+                _fixed_numbers(mat[:, 46:54], integer=False),
+            ],
+            axis=1,
+        ).reshape(n, 3),
+        element=np.where(element == "", fallback_element, element),
+    )
+
+
+def _atom_columns_from_lines(lines: list[str]) -> _AtomColumns:
+    """Per-line slicing fallback for non-ASCII text, where byte and character columns diverge."""
+    records: list[str] = []
+    atom_names: list[str] = []
+    resnames: list[str] = []
+    chain_ids: list[str] = []
+    icodes: list[str] = []
+    elements: list[str] = []
+    for raw in lines:
         atom_name = raw[12:16].strip()
-        resname = raw[17:20].strip()
-        chain_id = raw[21:22].strip() or "_"
-        resseq = _parse_int(raw[22:26])
-        icode = raw[26:27].strip()
-        x = _parse_float(raw[30:38])
-        y = _parse_float(raw[38:46])
-        z = _parse_float(raw[46:54])
+        records.append(raw[:6].strip().upper())
+        atom_names.append(atom_name)
+        resnames.append(raw[17:20].strip())
+        chain_ids.append(raw[21:22].strip() or "_")
+        icodes.append(raw[26:27].strip())
         element = raw[76:78].strip() or (atom_name[:1].strip().upper() if atom_name else "")
-        yield Atom(
-            record=rec,
+        elements.append(element.upper())
+    # int()/float() already skip surrounding blanks; the defaulting helpers only run once a
+    # field fails to parse.
+    try:
+        resseqs = [int(raw[22:26]) for raw in lines]
+    except ValueError:
+        resseqs = [_parse_int(raw[22:26]) for raw in lines]
+    try:
+        coords = [float(raw[start : start + 8]) for raw in lines for start in (30, 38, 46)]
+    except ValueError:
+        coords = [_parse_float(raw[start : start + 8]) for raw in lines for start in (30, 38, 46)]
+    return _AtomColumns(
+        is_hetatm=np.asarray([rec == "HETATM" for rec in records], dtype=bool),
+        atom_name=np.asarray(atom_names, dtype=str),
+        resname=np.asarray(resnames, dtype=str),
+        chain_id=np.asarray(chain_ids, dtype=str),
+        resseq=np.asarray(resseqs, dtype=np.int64),
+        icode=np.asarray(icodes, dtype=str),
+        coords=np.asarray(coords, dtype=np.float64).reshape(len(lines), 3),
+        element=np.asarray(elements, dtype=str),
+    )
+
+
+def _atoms_from_columns(cols: _AtomColumns, rows: np.ndarray | None = None) -> list[Atom]:
+    if rows is not None:
+        cols = _AtomColumns(
+            is_hetatm=cols.is_hetatm[rows],
+            atom_name=cols.atom_name[rows],
+            resname=cols.resname[rows],
+            chain_id=cols.chain_id[rows],
+            resseq=cols.resseq[rows],
+            icode=cols.icode[rows],
+            coords=cols.coords[rows],
+            element=cols.element[rows],
+        )
+    rows_iter = zip(
+        cols.is_hetatm.tolist(),
+        cols.atom_name.tolist(),
+        cols.resname.tolist(),
+        cols.chain_id.tolist(),
+        cols.resseq.tolist(),
+        cols.icode.tolist(),
+        cols.coords.tolist(),
+        cols.element.tolist(),
+    )
+    return [
+        Atom(
+            record="HETATM" if is_hetatm else "ATOM",
             atom_name=atom_name,
             resname=resname,
             chain_id=chain_id,
@@ -282,84 +523,193 @@ def iter_atoms(pdb_text: str):
             x=x,
             y=y,
             z=z,
-            element=element.upper(),
+            element=element,
         )
+        for is_hetatm, atom_name, resname, chain_id, resseq, icode, (x, y, z), element in rows_iter
+    ]
+
+
+def iter_atoms(pdb_text: str):
+    yield from _atoms_from_columns(_parse_pdb(pdb_text).atoms)
+
+
+def parse_pdb_arrays(pdb_text: str) -> dict[str, np.ndarray]:
+    """ATOM/HETATM records as parallel column arrays in file order, without per-atom objects.
+
+    ``xyz`` is an (N, 3) float64 array; string columns are stripped like the ``Atom`` fields.
+    The arrays come from the parse cache and are read-only.
+    """
+    cols = _parse_pdb(pdb_text).atoms
+    record = np.where(cols.is_hetatm, "HETATM", "ATOM")
+    record.flags.writeable = False
+    return {
+        "record": record,
+        "atom_name": cols.atom_name,
+        "resname": cols.resname,
+        "chain_id": cols.chain_id,
+        "resseq": cols.resseq,
+        "icode": cols.icode,
+        "xyz": cols.coords,
+        "element": cols.element,
+    }
+
+
+@dataclass(frozen=True)
+class _ResidueSpans:
+    """Residue boundaries over a subset of ``_AtomColumns`` rows, in file order."""
+
+    rows: np.ndarray  # intp, atom rows that belong to residues
+    offsets: np.ndarray  # intp, residue r spans rows[offsets[r]:offsets[r + 1]]
+    chain_id: np.ndarray  # str, per residue
+    index: np.ndarray  # int64, 1-based position of the residue within its chain
+    chain_order: list[str]  # chains in order of first appearance
+
+    def __len__(self) -> int:
+        return len(self.chain_id)
+
+    def first_rows(self) -> np.ndarray:
+        """Atom row of the first atom of every residue."""
+        return self.rows[self.offsets[:-1]]
+
+    def residue_of_rows(self) -> np.ndarray:
+        """Residue number for every entry of ``rows``."""
+        return np.repeat(np.arange(len(self), dtype=np.intp), np.diff(self.offsets))
+
+
+def _residue_spans(cols: _AtomColumns, *, only_atom_records: bool = True) -> _ResidueSpans:
+    rows = np.flatnonzero(~cols.is_hetatm) if only_atom_records else np.arange(len(cols), dtype=np.intp)
+    chain = cols.chain_id[rows]
+    resseq = cols.resseq[rows]
+    icode = cols.icode[rows]
+    # A residue starts wherever (chain, resseq, icode) differs from the previous atom.
+    changed = (chain[1:] != chain[:-1]) | (resseq[1:] != resseq[:-1]) | (icode[1:] != icode[:-1])
+    starts = np.concatenate([[0], np.flatnonzero(changed) + 1]) if len(rows) else np.zeros(0, dtype=np.intp)
+    offsets = np.append(starts, len(rows)).astype(np.intp)
+
+    res_chain = chain[starts]
+    n_res = len(starts)
+    # Number residues per chain: a stable sort groups each chain while keeping file order inside it.
+    order = np.argsort(res_chain, kind="stable")
+    grouped = res_chain[order]
+    first_of_group = np.ones(n_res, dtype=bool)
+    first_of_group[1:] = grouped[1:] != grouped[:-1]
+    group_start = np.maximum.accumulate(np.where(first_of_group, np.arange(n_res), 0)) if n_res else order
+    index = np.empty(n_res, dtype=np.int64)
+    index[order] = np.arange(n_res) - group_start + 1
+
+    _, first_seen = np.unique(res_chain, return_index=True)
+    chain_order = res_chain[np.sort(first_seen)].tolist()
+    return _ResidueSpans(rows=rows, offsets=offsets, chain_id=res_chain, index=index, chain_order=chain_order)
+
+
+@dataclass(frozen=True)
+class _ParsedPdb:
+    atoms: _AtomColumns
+    residues: _ResidueSpans  # ATOM records only
+
+
+@lru_cache(maxsize=8)
+def _parse_pdb(pdb_text: str) -> _ParsedPdb:
+    """Parse once per distinct text; pipelines ask several questions about the same structure."""
+    cols = _atom_columns(pdb_text)
+    spans = _residue_spans(cols, only_atom_records=True)
+    # The arrays are shared between callers through the cache, so make accidental writes fail loudly.
+    for arr in (*vars(cols).values(), *vars(spans).values()):
+        if isinstance(arr, np.ndarray):
+            arr.flags.writeable = False
+    return _ParsedPdb(atoms=cols, residues=spans)
 
 
 def residues_by_chain(pdb_text: str, *, only_atom_records: bool = True) -> dict[str, list[Residue]]:
-    residues: dict[str, list[Residue]] = {}
-    current_key: tuple[str, int, str] | None = None
-    current_atoms: list[Atom] = []
-    current_resname = ""
-    current_chain = ""
-    current_resseq = 0
-    current_icode = ""
-    chain_indices: dict[str, int] = {}
-
-    def flush() -> None:
-        nonlocal current_key, current_atoms, current_resname, current_chain, current_resseq, current_icode
-        if current_key is None:
-            return
-        chain = current_chain
-        chain_indices[chain] = chain_indices.get(chain, 0) + 1
-        idx = chain_indices[chain]
-        residues.setdefault(chain, []).append(
+    parsed = _parse_pdb(pdb_text)
+    cols = parsed.atoms
+    spans = parsed.residues if only_atom_records else _residue_spans(cols, only_atom_records=False)
+    atoms = _atoms_from_columns(cols, spans.rows)
+    first_rows = spans.first_rows()
+
+    residues: dict[str, list[Residue]] = {chain: [] for chain in spans.chain_order}
+    bounds = spans.offsets.tolist()
+    for r, (chain, index, resname, resseq, icode) in enumerate(
+        zip(
+            spans.chain_id.tolist(),
+            spans.index.tolist(),
+            cols.resname[first_rows].tolist(),
+            cols.resseq[first_rows].tolist(),
+            cols.icode[first_rows].tolist(),
+        )
+    ):
+        residues[chain].append(
             Residue(
                 chain_id=chain,
-                index=idx,
-                resname=current_resname,
-                resseq=current_resseq,
-                icode=current_icode,
-                atoms=tuple(current_atoms),
+                index=index,
+                resname=resname,
+                resseq=resseq,
+                icode=icode,
+                atoms=atoms[bounds[r] : bounds[r + 1]],
             )
         )
-        current_key = None
-        current_atoms = []
-        current_resname = ""
-        current_chain = ""
-        current_resseq = 0
-        current_icode = ""
-
-    for atom in iter_atoms(pdb_text):
-        if only_atom_records and atom.record != "ATOM":
-            continue
-        key = (atom.chain_id, atom.resseq, atom.icode)
-        if current_key is None:
-            current_key = key
-            current_chain = atom.chain_id
-            current_resseq = atom.resseq
-            current_icode = atom.icode
-            current_resname = atom.resname
-            current_atoms = [atom]
-            continue
-        if key != current_key:
-            flush()
-            current_key = key
-            current_chain = atom.chain_id
-            current_resseq = atom.resseq
-            current_icode = atom.icode
-            current_resname = atom.resname
-            current_atoms = [atom]
-            continue
-        current_atoms.append(atom)
-    flush()
     return residues
 
 
+def chain_ids(pdb_text: str) -> list[str]:
+    """Chains with ATOM residues, in file order; the keys of ``residues_by_chain`` without building residues."""
+    return list(_parse_pdb(pdb_text).residues.chain_order)
+
+
+def _chain_filter(chains: list[str] | None) -> frozenset[str] | None:
+    """Membership set for an optional ``chains`` argument, built once per call (``None`` keeps every chain)."""
+    return None if chains is None else frozenset(chains)
+
+
+def _aa1_codes(resnames: np.ndarray) -> np.ndarray:
+    """ASCII one-letter code for every residue name, or 0 where ``_AA3_TO_AA1`` has no entry."""
+    n = len(resnames)
+    width = resnames.dtype.itemsize // 4
+    if n == 0 or width < 3:
+        return np.zeros(n, dtype=np.uint8)
+    codepoints = np.ascontiguousarray(resnames).view(np.uint32).reshape(n, width).astype(np.int64)
+    wide = (codepoints > 0x7F).any(axis=1)
+    if wide.any():
+        # Non-ASCII names are rare; let str.upper() decide for those rows only.
+        upper = np.ascontiguousarray(np.char.upper(resnames[wide]).astype(resnames.dtype))
+        codepoints[wide] = upper.view(np.uint32).reshape(-1, width)
+    codepoints[:, :3] -= np.where((codepoints[:, :3] >= ord("a")) & (codepoints[:, :3] <= ord("z")), 32, 0)
+    letters = codepoints[:, :3] - ord("A")
+    valid = ((letters >= 0) & (letters < 26)).all(axis=1) & (codepoints[:, 3:] == 0).all(axis=1)
+    index = np.where(valid, letters[:, 0] * 676 + letters[:, 1] * 26 + letters[:, 2], 0)
+    return np.where(valid, _AA3_LUT[index], 0).astype(np.uint8)
+
+
+@lru_cache(maxsize=8)
+def _chain_sequences(pdb_text: str) -> dict[str, str]:
+    """One-letter sequence of every chain in first-appearance order, NUL marking unmapped residues.
+
+    Cached per text like ``_parse_pdb``; callers get filtered copies and never the cached dict.
+    """
+    parsed = _parse_pdb(pdb_text)
+    spans = parsed.residues
+    codes = _aa1_codes(parsed.atoms.resname[spans.first_rows()])
+    # Group residues by chain (file order kept inside each chain) and slice every sequence out of one buffer.
+    order = np.argsort(spans.chain_id, kind="stable")
+    names, starts = np.unique(spans.chain_id[order], return_index=True)
+    ends = [*starts[1:].tolist(), len(order)]
+    bounds = dict(zip(names.tolist(), zip(starts.tolist(), ends)))
+    raw = codes[order].tobytes()
+    return {chain_id: raw[slice(*bounds[chain_id])].decode("ascii") for chain_id in spans.chain_order}
+
+
 def sequence_by_chain(
     pdb_text: str,
     *,
     chains: list[str] | None = None,
     unknown: str = "X",
 ) -> dict[str, str]:
-    residues = residues_by_chain(pdb_text, only_atom_records=True)
-    chain_set = set(chains) if chains is not None else None
-
+    chain_filter = _chain_filter(chains)
     out: dict[str, str] = {}
-    for chain_id, res_list in residues.items():
-        if chain_set is not None and chain_id not in chain_set:
+    for chain_id, seq in _chain_sequences(pdb_text).items():
+        if chain_filter is not None and chain_id not in chain_filter:
             continue
-        seq = "".join(_AA3_TO_AA1.get(res.resname.upper(), unknown) for res in res_list)
+        seq = seq.replace("\0", unknown) if "\0" in seq else seq
         if seq:
             out[chain_id] = seq
     return out
@@ -369,6 +719,35 @@ def _is_heavy(atom: Atom) -> bool:
     return atom.element not in {"H", "D"}
 
 
+def _ligand_atom_mask(
+    cols: _AtomColumns,
+    *,
+    chains: list[str] | None,
+    ligand_resnames: list[str] | None,
+    ligand_atom_chains: list[str] | None,
+) -> np.ndarray:
+    """Select heavy ligand atoms: non-water HETATMs (optionally by resname) plus ATOMs of ligand chains."""
+    ligand_set = {name.strip().upper() for name in ligand_resnames or [] if name.strip()} or None
+    atom_chain_set = {c.strip() for c in (ligand_atom_chains or []) if str(c).strip()} or None
+    masked_chain_set = _chain_filter(chains) or frozenset()
+
+    # Residue names only matter on HETATM rows, usually a small fraction; upper-case just those.
+    het_rows = np.flatnonzero(cols.is_hetatm)
+    resname = np.char.upper(cols.resname[het_rows])
+    het_keep = ~np.isin(resname, sorted(_WATER_RESNAMES))
+    if ligand_set is not None:
+        het_keep &= np.isin(resname, sorted(ligand_set))
+    selected = np.zeros(len(cols.is_hetatm), dtype=bool)
+    selected[het_rows[het_keep]] = True
+    if atom_chain_set is not None:
+        selected |= (
+            ~cols.is_hetatm
+            & np.isin(cols.chain_id, sorted(atom_chain_set))
+            & ~np.isin(cols.chain_id, sorted(masked_chain_set))
+        )
+    return selected & ~np.isin(cols.element, ["H", "D"])
+
+
 def ligand_atoms_present(
     pdb_text: str,
     *,
@@ -376,28 +755,13 @@ def ligand_atoms_present(
     ligand_resnames: list[str] | None = None,
     ligand_atom_chains: list[str] | None = None,
 ) -> bool:
-    ligand_set = {name.strip().upper() for name in ligand_resnames or [] if name.strip()} or None
-    atom_chain_set = {c.strip() for c in (ligand_atom_chains or []) if str(c).strip()} or None
-    masked_chain_set = set(chains) if chains is not None else set()
-
-    for atom in iter_atoms(pdb_text):
-        if atom.record == "HETATM":
-            if atom.resname.upper() in _WATER_RESNAMES:
-                continue
-            if ligand_set is not None and atom.resname.upper() not in ligand_set:
-                continue
-            if _is_heavy(atom):
-                return True
-            continue
-
-        if atom.record == "ATOM" and atom_chain_set is not None:
-            if atom.chain_id not in atom_chain_set:
-                continue
-            if atom.chain_id in masked_chain_set:
-                continue
-            if _is_heavy(atom):
-                return True
-    return False
+    selected = _ligand_atom_mask(
+        _parse_pdb(pdb_text).atoms,
+        chains=chains,
+        ligand_resnames=ligand_resnames,
+        ligand_atom_chains=ligand_atom_chains,
+    )
+    return bool(selected.any())
 
 
 def ligand_proximity_mask(
@@ -408,59 +772,200 @@ def ligand_proximity_mask(
     ligand_resnames: list[str] | None = None,
     ligand_atom_chains: list[str] | None = None,
 ) -> dict[str, list[int]]:
-    ligand_set = {name.strip().upper() for name in ligand_resnames or [] if name.strip()} or None
-    atom_chain_set = {c.strip() for c in (ligand_atom_chains or []) if str(c).strip()} or None
-    masked_chain_set = set(chains) if chains is not None else set()
-
-    ligand_atoms: list[Atom] = []
-    for atom in iter_atoms(pdb_text):
-        if atom.record == "HETATM":
-            if atom.resname.upper() in _WATER_RESNAMES:
-                continue
-            if ligand_set is not None and atom.resname.upper() not in ligand_set:
-                continue
-            if _is_heavy(atom):
-                ligand_atoms.append(atom)
-            continue
-
-        if atom.record == "ATOM" and atom_chain_set is not None:
-            if atom.chain_id not in atom_chain_set:
-                continue
-            if atom.chain_id in masked_chain_set:
-                continue
-            if _is_heavy(atom):
-                ligand_atoms.append(atom)
-
-    if not ligand_atoms:
+    parsed = _parse_pdb(pdb_text)
+    cols = parsed.atoms
+    ligand_xyz = cols.coords[
+        _ligand_atom_mask(
+            cols,
+            chains=chains,
+            ligand_resnames=ligand_resnames,
+            ligand_atom_chains=ligand_atom_chains,
+        )
+    ]
+    if not len(ligand_xyz):
         return {chain: [] for chain in (chains or [])} if chains else {}
 
-    dist2 = float(distance_angstrom) ** 2
-    residues = residues_by_chain(pdb_text, only_atom_records=True)
-
-    mask: dict[str, list[int]] = {}
-    for chain_id, res_list in residues.items():
-        if chains is not None and chain_id not in set(chains):
+    spans = parsed.residues
+    chain_filter = _chain_filter(chains)
+
+    # Protein heavy atoms of the selected chains, each tagged with the residue it belongs to.
+    atom_res = spans.residue_of_rows()
+    keep = ~np.isin(cols.element[spans.rows], ["H", "D"])
+    if chain_filter is not None:
+        keep &= np.isin(spans.chain_id, sorted(chain_filter))[atom_res]
+    cutoff = float(distance_angstrom)
+    xyz = cols.coords[spans.rows]
+    # Atoms outside the ligand's bounding box grown by the cutoff can never hit. The box test is
+    # a few comparisons per atom, so it runs first and the per-residue spheres and exact
+    # distances below only see what survives it (fmin/fmax skip NaN targets, which never hit).
+    slack = cutoff + 1e-6
+    lo = np.fmin.reduce(ligand_xyz, axis=0) - slack
+    hi = np.fmax.reduce(ligand_xyz, axis=0) + slack
+    keep &= ((xyz >= lo) & (xyz <= hi)).all(axis=1)
+    keep &= _near_bounding_sphere(xyz, atom_res, keep, len(spans), ligand_xyz, cutoff)[atom_res]
+
+    close = _atoms_within(xyz[keep], ligand_xyz, cutoff)
+    # Scatter atom hits onto their residues; flatnonzero returns them in file order without a sort.
+    res_hit = np.zeros(len(spans), dtype=bool)
+    res_hit[atom_res[keep][close]] = True
+    hit_res = np.flatnonzero(res_hit)
+
+    by_chain: dict[str, list[int]] = {}
+    for chain_id, index in zip(spans.chain_id[hit_res].tolist(), spans.index[hit_res].tolist()):
+        by_chain.setdefault(chain_id, []).append(index)
+    return {chain_id: by_chain[chain_id] for chain_id in spans.chain_order if chain_id in by_chain}
+
+
+def _near_bounding_sphere(
+    xyz: np.ndarray,
+    group: np.ndarray,
+    keep: np.ndarray,
+    n_groups: int,
+    targets: np.ndarray,
+    cutoff: float,
+) -> np.ndarray:
+    """Per group: False when no kept atom of the group can be within ``cutoff`` of any target.
+
+    Each group and the target set are bounded by a sphere around their centroid; if the
+    spheres are further apart than ``cutoff`` every pairwise distance is too (triangle inequality).
+    ``group`` must be non-decreasing, as residue numbers of atoms in file order are.
+    """
+    xyz = xyz[keep]
+    group = group[keep]
+    counts = np.bincount(group, minlength=n_groups)
+    centroids = np.zeros((n_groups, 3), dtype=np.float64)
+    for axis in range(3):
+        np.divide(np.bincount(group, weights=xyz[:, axis], minlength=n_groups), counts, out=centroids[:, axis], where=counts > 0)
+    radii = np.zeros(n_groups, dtype=np.float64)
+    if len(group):
+        # Groups are contiguous runs, so one reduceat replaces a scattered maximum.at.
+        firsts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+        radii[group[firsts]] = np.maximum.reduceat(np.linalg.norm(xyz - centroids[group], axis=1), firsts)
+
+    # NaN targets never hit (the box prefilter skips them too); left in, they would poison the centroid.
+    targets = targets[np.isfinite(targets).all(axis=1)]
+    if not len(targets):
+        return np.zeros(n_groups, dtype=bool)
+    target_center = targets.mean(axis=0)
+    target_radius = float(np.linalg.norm(targets - target_center, axis=1).max())
+    gap = np.linalg.norm(centroids - target_center, axis=1)
+    # Small slack so rounding in the centroid arithmetic never drops a pair sitting exactly on the cutoff.
+    return (counts > 0) & (gap <= radii + target_radius + cutoff + 1e-6)
+
+
+def _milli_angstrom(coords: np.ndarray) -> np.ndarray | None:
+    """``coords`` as exact int32 thousandths of an Angstrom, or None when that would round or overflow."""
+    scaled = np.rint(coords * 1000.0)
+    # PDB columns are %8.3f, so this only fails for hand-edited files with extra decimals or NaN/inf.
+    if not (np.abs(scaled) < 2**30).all() or not (scaled / 1000.0 == coords).all():
+        return None
+    return scaled.astype(np.int32)
+
+
+def _atoms_within(points: np.ndarray, targets: np.ndarray, cutoff: float, *, block_cells: int = 1 << 18) -> np.ndarray:
+    """Boolean mask over ``points`` (N, 3): True where any of ``targets`` (M, 3) lies within ``cutoff``."""
+    if not len(points) or not len(targets):
+        return np.zeros(len(points), dtype=bool)
+    if (
+        cKDTree is not None
+        and len(points) * len(targets) >= _KDTREE_MIN_PAIRS
+        and cutoff > 0.0
+        and np.isfinite(targets).all()
+    ):
+        # Index the (usually small) ligand set and ask for each atom's nearest target only; the
+        # search is pruned just past the cutoff (the bound is exclusive and compared squared), and
+        # unmatched atoms come back as inf. cKDTree rejects NaN data, so those go to the dense path.
+        nearest, _ = cKDTree(targets).query(points, k=1, distance_upper_bound=cutoff + 1e-6)
+        return nearest <= cutoff
+    if (
+        len(points) * len(targets) >= _GRID_MIN_PAIRS
+        and len(targets) >= _GRID_MIN_TARGETS
+        and cutoff > 0.0
+        and np.isfinite(targets).all()
+    ):
+        hit = _grid_within(points, targets, cutoff)
+        if hit is not None:
+            return hit
+    return _dense_within(points, targets, cutoff, block_cells=block_cells)
+
+
+def _grid_within(points: np.ndarray, targets: np.ndarray, cutoff: float) -> np.ndarray | None:
+    """Cell-list variant of ``_atoms_within`` for when SciPy is missing.
+
+    Targets are binned into cubes of side ``cutoff``, so every target within reach of a point sits
+    in one of the 27 cubes around the point's own. Returns None when the grid would not fit int64 keys.
+    """
+    size = cutoff * (1.0 + 1e-9)
+    origin = targets.min(axis=0)
+    # One empty layer of cells on every side, so neighbour offsets never leave the grid for kept points.
+    target_cells = np.floor((targets - origin) / size).astype(np.int64) + 1
+    dims = target_cells.max(axis=0) + 2
+    if float(np.prod(dims.astype(np.float64))) >= 2.0**62:
+        return None
+    point_cells = np.floor((points - origin) / size) + 1
+    inside = np.flatnonzero(((point_cells >= 0) & (point_cells < dims)).all(axis=1))
+    cells = point_cells[inside].astype(np.int64)
+
+    def cell_key(c: np.ndarray) -> np.ndarray:
+        return (c[:, 0] * dims[1] + c[:, 1]) * dims[2] + c[:, 2]
+
+    order = np.argsort(cell_key(target_cells), kind="stable")
+    sorted_keys = cell_key(target_cells)[order]
+    dist2 = cutoff * cutoff
+    hit = np.zeros(len(inside), dtype=bool)
+    for offset in _NEIGHBOUR_CELLS:
+        near = cells + offset
+        # Points already matched are not searched again, the vector form of an early break.
+        pending = np.flatnonzero(~hit & ((near >= 0) & (near < dims)).all(axis=1))
+        keys = cell_key(near[pending])
+        lo = np.searchsorted(sorted_keys, keys, side="left")
+        counts = np.searchsorted(sorted_keys, keys, side="right") - lo
+        if not counts.any():
             continue
-        hits: list[int] = []
-        for res in res_list:
-            close = False
-            for at in res.atoms:
-                if not _is_heavy(at):
-                    continue
-                for lig in ligand_atoms:
-                    dx = at.x - lig.x
-                    dy = at.y - lig.y
-                    dz = at.z - lig.z
-                    if (dx * dx + dy * dy + dz * dz) <= dist2:
-                        close = True
-                        break
-                if close:
-                    break
-            if close:
-                hits.append(res.index)
-        if hits:
-            mask[chain_id] = hits
-    return mask
+        pair_point = np.repeat(pending, counts)
+        pair_target = order[np.repeat(lo - (np.cumsum(counts) - counts), counts) + np.arange(int(counts.sum()))]
+        d = points[inside[pair_point]] - targets[pair_target]
+        close = (d[:, 0] * d[:, 0] + d[:, 1] * d[:, 1] + d[:, 2] * d[:, 2]) <= dist2
+        hit[pair_point[close]] = True
+    out = np.zeros(len(points), dtype=bool)
+    out[inside] = hit
+    return out
+
+
+def _dense_within(points: np.ndarray, targets: np.ndarray, cutoff: float, *, block_cells: int) -> np.ndarray:
+    """All-pairs ``_atoms_within`` over bounded row blocks."""
+    out = np.zeros(len(points), dtype=bool)
+    dist2: float = cutoff * cutoff
+    clamp = None
+    # Integer thousandths are exact for PDB coordinates and half the width of float64. Per-axis
+    # offsets are clamped just past the cutoff so three squares always fit in int32.
+    milli_cutoff = math.floor(cutoff * 1000.0)
+    if 0 <= milli_cutoff and 3 * (milli_cutoff + 1) ** 2 < 2**31:
+        fixed_points = _milli_angstrom(points)
+        fixed_targets = _milli_angstrom(targets) if fixed_points is not None else None
+        if fixed_targets is not None:
+            points, targets = fixed_points, fixed_targets
+            dist2 = math.floor((cutoff * 1000.0) ** 2)
+            clamp = np.int32(milli_cutoff + 1)
+
+    # Row blocks keep the (rows, M) scratch buffers cache-sized; every step writes into them in place.
+    step = max(1, block_cells // len(targets))
+    acc = np.empty((min(step, len(points)), len(targets)), dtype=points.dtype)
+    scratch = np.empty_like(acc)
+    for start in range(0, len(points), step):
+        block = points[start : start + step]
+        total = acc[: len(block)]
+        part = scratch[: len(block)]
+        for axis, buf in ((0, total), (1, part), (2, part)):
+            np.subtract(block[:, axis, None], targets[:, axis], out=buf)
+            if clamp is not None:
+                np.abs(buf, out=buf)
+                np.minimum(buf, clamp, out=buf)
+            np.multiply(buf, buf, out=buf)
+            if buf is part:
+                total += part
+        out[start : start + len(block)] = (total <= dist2).any(axis=1)
+    return out
 
 
 def _rewrite_pdb_resseq_icode(raw: str, *, resseq: int, icode: str) -> str:
@@ -472,15 +977,27 @@ def _rewrite_pdb_resseq_icode(raw: str, *, resseq: int, icode: str) -> str:
     return f"{line[:22]}{res_field}{icode_field}{line[27:]}"
 
 
-def preprocess_pdb(
-    pdb_text: str,
-    *,
-    chains: list[str] | None = None,
-    strip_nonpositive_resseq: bool = False,
-    renumber_resseq_from_1: bool = False,
-) -> tuple[str, dict[str, list[dict[str, object]]]]:
-    chain_set = set(chains) if chains is not None else None
+def _renumber_line(buf: bytearray, pending: bytes, raw: str, resseq: int) -> None:
+    """Append ``pending`` (unchanged lines, then ``raw`` and its newline) with ``raw`` renumbered."""
+    if raw.isascii() and len(raw) >= 27:
+        buf.extend(pending)
+        start = len(buf) - len(raw) - 1
+        buf[start + 22 : start + 27] = b"%4d " % resseq
+        return
+    line_bytes = len(raw.encode("utf-8", "surrogatepass")) + 1
+    buf.extend(pending[:-line_bytes])
+    buf.extend(_rewrite_pdb_resseq_icode(raw, resseq=resseq, icode=" ").encode("utf-8", "surrogatepass"))
+    buf.extend(b"\n")
+
 
+def _preprocess_lines(
+    text: str,
+    chain_filter: frozenset[str] | None,
+    *,
+    strip_nonpositive_resseq: bool,
+    renumber_resseq_from_1: bool,
+) -> tuple[bytearray, dict[str, list[dict[str, object]]]]:
+    """Per-line ``preprocess_pdb`` for text with non-ASCII characters (byte and character columns diverge) or NULs."""
     renumber_map: dict[str, dict[tuple[int, str], int]] = {}
     next_renum: dict[str, int] = {}
     residue_index: dict[str, int] = {}
@@ -489,204 +1006,313 @@ def preprocess_pdb(
     mapping: dict[str, list[dict[str, object]]] = {}
     seen_residue: set[tuple[str, int, str]] = set()
 
-    out_lines: list[str] = []
-
-    for raw in pdb_text.splitlines():
+    # The output is the encoded input copied in runs: untouched lines are never re-encoded or
+    # re-joined; dropped records are skipped and renumbered ones are patched in place.
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    data = text.encode("utf-8", "surrogatepass")
+    if lines and not data.endswith(b"\n"):
+        data += b"\n"
+    ends = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == 0x0A).tolist()
+    starts = [0] + [end + 1 for end in ends[:-1]]
+    buf = bytearray()
+    copied = 0  # data[:copied] is already in buf (or deliberately skipped)
+
+    for raw, pos, end in zip(lines, starts, ends):
         rec = raw[:6].strip().upper()
         if rec not in {"ATOM", "HETATM", "TER"}:
-            out_lines.append(raw)
             continue
 
         chain_id = raw[21:22].strip() or "_"
-        if chain_set is not None and chain_id not in chain_set:
-            out_lines.append(raw)
+        if chain_filter is not None and chain_id not in chain_filter:
             continue
 
         resseq = _parse_int(raw[22:26])
         icode = raw[26:27].strip()
 
-        if strip_nonpositive_resseq and rec in {"ATOM", "HETATM"} and int(resseq) <= 0:
+        if strip_nonpositive_resseq and resseq <= 0 and rec != "TER":
+            buf.extend(data[copied:pos])
+            copied = end + 1
             continue
 
         if rec == "TER":
             if renumber_resseq_from_1 and chain_id in last_resseq:
-                out_lines.append(_rewrite_pdb_resseq_icode(raw, resseq=last_resseq[chain_id], icode=" "))
-            else:
-                out_lines.append(raw)
+                _renumber_line(buf, data[copied : end + 1], raw, last_resseq[chain_id])
+                copied = end + 1
             continue
 
-        key = (int(resseq), str(icode))
-        new_resseq = int(resseq)
-        new_icode = str(icode)
+        new_resseq = resseq
+        new_icode = icode
         if renumber_resseq_from_1:
             per_chain = renumber_map.setdefault(chain_id, {})
-            if key not in per_chain:
-                per_chain[key] = int(next_renum.get(chain_id, 1))
-                next_renum[chain_id] = per_chain[key] + 1
-            new_resseq = per_chain[key]
-            new_icode = " "
+            new_resseq = per_chain.get((resseq, icode))
+            if new_resseq is None:
+                new_resseq = per_chain[(resseq, icode)] = next_renum.get(chain_id, 1)
+                next_renum[chain_id] = new_resseq + 1
+            new_icode = ""
 
-        residue_key = (chain_id, int(resseq), str(icode))
+        residue_key = (chain_id, resseq, icode)
         if residue_key not in seen_residue:
             seen_residue.add(residue_key)
-            idx = int(residue_index.get(chain_id, 0)) + 1
+            idx = residue_index.get(chain_id, 0) + 1
             residue_index[chain_id] = idx
             mapping.setdefault(chain_id, []).append(
                 {
                     "index": idx,
-                    "original_resseq": int(resseq),
-                    "original_icode": str(icode or ""),
-                    "processed_resseq": int(new_resseq),
-                    "processed_icode": str(new_icode or "").strip(),
+                    "original_resseq": resseq,
+                    "original_icode": icode,
+                    "processed_resseq": new_resseq,
+                    "processed_icode": new_icode,
                 }
             )
 
-        last_resseq[chain_id] = int(new_resseq)
+        last_resseq[chain_id] = new_resseq
         if renumber_resseq_from_1:
-            out_lines.append(_rewrite_pdb_resseq_icode(raw, resseq=new_resseq, icode=new_icode))
-        else:
-            out_lines.append(raw)
+            if end - pos == len(raw) >= 27:
+                # ASCII line, so columns are bytes: patch resseq + blank icode (cols 23-27) in place.
+                buf.extend(data[copied : end + 1])
+                field = len(buf) - (end + 1 - pos) + 22
+                buf[field : field + 5] = b"%4d " % new_resseq
+            else:
+                _renumber_line(buf, data[copied : end + 1], raw, new_resseq)
+            copied = end + 1
 
-    return ("\n".join(out_lines) + ("\n" if pdb_text.endswith("\n") else "")), mapping
+    buf.extend(data[copied:])
+    return buf, mapping
 
 
-def _ca_coords_by_chain(pdb_text: str, *, chains: list[str] | None = None) -> dict[str, dict[tuple[int, str], tuple[float, float, float]]]:
-    residues = residues_by_chain(pdb_text, only_atom_records=True)
-    chain_set = set(chains) if chains is not None else None
-    out: dict[str, dict[tuple[int, str], tuple[float, float, float]]] = {}
-    for chain_id, res_list in residues.items():
-        if chain_set is not None and chain_id not in chain_set:
+def _preprocess_columns(
+    text: str,
+    chain_filter: frozenset[str] | None,
+    *,
+    strip_nonpositive_resseq: bool,
+    renumber_resseq_from_1: bool,
+) -> tuple[bytearray, dict[str, list[dict[str, object]]]]:
+    """``_preprocess_lines`` for ASCII text, with records classified and renumbered as byte columns.
+
+    Renumbered fields are written into a copy of the buffer in place; only dropped records and
+    the rare lines whose width changes (shorter than 27 bytes, or a 5-digit number) are handled
+    one at a time.
+    """
+    if text and not text.endswith("\n"):
+        text += "\n"
+    data = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    ends = np.flatnonzero(data == ord("\n"))
+    if not len(ends):
+        return bytearray(), {}
+    starts = np.concatenate([[0], ends[:-1] + 1])
+
+    block = _gather_lines(data, starts, ends, 27)
+    head = _upper_ascii(block[:, :6])
+    is_ter = _record_rows(head, b"TER")
+    chain = np.where(_STRIP_BYTES[block[:, 21]], ord("_"), block[:, 21])
+    rows = is_ter | _record_rows(head, b"ATOM") | _record_rows(head, b"HETATM")
+    if chain_filter is not None:
+        rows &= np.isin(chain, [ord(c) for c in chain_filter if len(c) == 1 and c.isascii()])
+    rows = np.flatnonzero(rows)
+
+    ter = is_ter[rows]
+    chain = chain[rows]
+    resseq = _fixed_numbers(block[rows, 22:26], integer=True)
+    icode = np.where(_STRIP_BYTES[block[rows, 26]], 0, block[rows, 26])
+    drop = ~ter & (resseq <= 0) if strip_nonpositive_resseq else np.zeros(len(rows), dtype=bool)
+    kept = np.flatnonzero(~ter & ~drop)
+
+    # Residues are distinct (chain, resseq, icode) keys, numbered per chain in order of first appearance.
+    keys = (chain[kept].astype(np.int64) << 32) | ((resseq[kept] + (1 << 20)) << 8) | icode[kept]
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    res_rows = kept[first[order]]
+    res_chain = chain[res_rows]
+    by_chain = np.argsort(res_chain, kind="stable")
+    sorted_chain = res_chain[by_chain]
+    group_start = np.flatnonzero(np.r_[True, sorted_chain[1:] != sorted_chain[:-1]]) if len(order) else order
+    index = np.empty(len(order), dtype=np.int64)
+    index[by_chain] = np.arange(len(order)) - np.repeat(group_start, np.diff(np.r_[group_start, len(order)])) + 1
+
+    mapping: dict[str, list[dict[str, object]]] = {}
+    processed = index if renumber_resseq_from_1 else resseq[res_rows]
+    # Byte codes to one-character strings in bulk; a NUL icode byte comes back as "".
+    chain_text = res_chain.astype(np.uint8).view("S1").astype("U1").tolist()
+    icode_text = icode[res_rows].astype(np.uint8).view("S1").astype("U1").tolist()
+    for chain_id, idx, orig, orig_icode, new_resseq in zip(
+        chain_text, index.tolist(), resseq[res_rows].tolist(), icode_text, processed.tolist()
+    ):
+        mapping.setdefault(chain_id, []).append(
+            {
+                "index": idx,
+                "original_resseq": orig,
+                "original_icode": orig_icode,
+                "processed_resseq": new_resseq,
+                "processed_icode": "" if renumber_resseq_from_1 else orig_icode,
+            }
+        )
+
+    out = data
+    events: list[tuple[int, int | None]] = [(line, None) for line in rows[drop].tolist()]
+    if renumber_resseq_from_1:
+        edit_lines = [rows[kept]]
+        edit_values = [index[rank[inverse]]]
+        # TER takes the number of the last kept ATOM/HETATM of its chain above it, and is left alone without one.
+        ter_at = np.flatnonzero(ter)
+        for ch in np.unique(chain[ter_at]).tolist():
+            at = ter_at[chain[ter_at] == ch]
+            same = chain[kept] == ch
+            prev = np.searchsorted(kept[same], at) - 1
+            edit_lines.append(rows[at[prev >= 0]])
+            edit_values.append(edit_values[0][same][prev[prev >= 0]])
+        lines = np.concatenate(edit_lines)
+        values = np.concatenate(edit_values)
+        inplace = ((ends - starts)[lines] >= 27) & (values <= 9999)
+
+        out = data.copy()
+        field = starts[lines[inplace]] + 22
+        v = values[inplace]
+        for offset, place in enumerate((1000, 100, 10, 1)):
+            out[field + offset] = np.where((v >= place) | (place == 1), ord("0") + v // place % 10, ord(" "))
+        out[field + 4] = ord(" ")
+        events += zip(lines[~inplace].tolist(), values[~inplace].tolist())
+
+    if not events:
+        return bytearray(out.tobytes()), mapping
+    view = memoryview(out)
+    buf = bytearray()
+    copied = 0
+    for line, value in sorted(events):
+        start = int(starts[line])
+        buf += view[copied:start]
+        if value is not None:
+            raw = text[start : int(ends[line])]
+            buf += _rewrite_pdb_resseq_icode(raw, resseq=value, icode=" ").encode("ascii")
+            buf += b"\n"
+        copied = int(ends[line]) + 1
+    buf += view[copied:]
+    return buf, mapping
+
+
+def preprocess_pdb(
+    pdb_text: str,
+    *,
+    chains: list[str] | None = None,
+    strip_nonpositive_resseq: bool = False,
+    renumber_resseq_from_1: bool = False,
+) -> tuple[str, dict[str, list[dict[str, object]]]]:
+    chain_filter = _chain_filter(chains)
+    plain = not any(sep in pdb_text for sep in _OTHER_LINE_BREAKS)
+    # Every line keeps a terminator, so a trailing blank line (e.g. "...\r\n\r\n") survives as one.
+    text = pdb_text if plain else "".join(line + "\n" for line in pdb_text.splitlines())
+    # NUL bytes stand for blank chain/icode columns in the vectorised path, so such texts go line by line.
+    preprocess = _preprocess_columns if text.isascii() and "\0" not in text else _preprocess_lines
+    buf, mapping = preprocess(
+        text,
+        chain_filter,
+        strip_nonpositive_resseq=strip_nonpositive_resseq,
+        renumber_resseq_from_1=renumber_resseq_from_1,
+    )
+    # Same shape as "\n".join(lines) plus a trailing newline only when the input had one.
+    if not pdb_text.endswith("\n"):
+        del buf[-1:]
+    elif not buf:
+        buf.extend(b"\n")
+    return buf.decode("utf-8", "surrogatepass"), mapping
+
+
+# Residue (resseq, icode) packed into one sortable int64: icode code point in the low bits.
+_ICODE_SPAN = 0x110000
+
+
+def _residue_keys(resseq: np.ndarray, icode: np.ndarray) -> np.ndarray:
+    codepoints = np.ascontiguousarray(icode, dtype="U1").view(np.uint32).astype(np.int64)
+    return resseq.astype(np.int64) * _ICODE_SPAN + codepoints
+
+
+@lru_cache(maxsize=8)
+def _ca_table(pdb_text: str) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    """Per chain: sorted unique residue keys and the matching (N, 3) CA coordinates."""
+    parsed = _parse_pdb(pdb_text)
+    cols = parsed.atoms
+    spans = parsed.residues
+
+    # First CA atom of every residue: CA positions mapped back onto residue spans.
+    ca_pos = np.flatnonzero(np.char.upper(cols.atom_name[spans.rows]) == "CA")
+    ca_res, first = np.unique(np.searchsorted(spans.offsets, ca_pos, side="right") - 1, return_index=True)
+    ca_xyz = cols.coords[spans.rows[ca_pos[first]]]
+    first_rows = spans.first_rows()[ca_res]
+    keys = _residue_keys(cols.resseq[first_rows], cols.icode[first_rows])
+    ca_chain = spans.chain_id[ca_res]
+
+    table: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+    for chain_id in spans.chain_order:
+        sel = np.flatnonzero(ca_chain == chain_id)
+        if not len(sel):
             continue
-        coords: dict[tuple[int, str], tuple[float, float, float]] = {}
-        for res in res_list:
-            ca = None
-            for atom in res.atoms:
-                if atom.atom_name.strip().upper() == "CA":
-                    ca = (atom.x, atom.y, atom.z)
-                    break
-            if ca is not None:
-                coords[(res.resseq, res.icode)] = ca
-        if coords:
-            out[chain_id] = coords
-    return out
+        # A residue key seen twice in one chain keeps its last CA, like a dict assignment would.
+        chain_keys = keys[sel][::-1]
+        uniq, last = np.unique(chain_keys, return_index=True)
+        coords = ca_xyz[sel][::-1][last]
+        uniq.flags.writeable = False
+        coords.flags.writeable = False
+        table[chain_id] = (uniq, coords)
+    return table
+
+
+def _ca_coords_by_chain(pdb_text: str, *, chains: list[str] | None = None) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    table = _ca_table(pdb_text)
+    if chains is None:
+        return dict(table)
+    chain_filter = _chain_filter(chains)
+    return {chain_id: entry for chain_id, entry in table.items() if chain_id in chain_filter}
 
 
 def _match_ca_coords(
-    ref_coords: dict[str, dict[tuple[int, str], tuple[float, float, float]]],
-    mob_coords: dict[str, dict[tuple[int, str], tuple[float, float, float]]],
+    ref_coords: dict[str, tuple[np.ndarray, np.ndarray]],
+    mob_coords: dict[str, tuple[np.ndarray, np.ndarray]],
     *,
     chains: list[str] | None = None,
     include_positions: dict[str, set[tuple[int, str]]] | None = None,
-) -> tuple[list[tuple[float, float, float]], list[tuple[float, float, float]]]:
+) -> tuple[np.ndarray, np.ndarray]:
     chain_order = chains or sorted(set(ref_coords) & set(mob_coords))
-    ref: list[tuple[float, float, float]] = []
-    mob: list[tuple[float, float, float]] = []
+    ref: list[np.ndarray] = []
+    mob: list[np.ndarray] = []
     for chain_id in chain_order:
-        ref_chain = ref_coords.get(chain_id) or {}
-        mob_chain = mob_coords.get(chain_id) or {}
-        if not ref_chain or not mob_chain:
+        if chain_id not in ref_coords or chain_id not in mob_coords:
             continue
-        for idx in sorted(set(ref_chain) & set(mob_chain)):
-            allowed = include_positions.get(chain_id) if isinstance(include_positions, dict) else None
-            if allowed is not None and idx not in allowed:
-                continue
-            ref.append(ref_chain[idx])
-            mob.append(mob_chain[idx])
-    return ref, mob
-
-
-def _centroid(coords: list[tuple[float, float, float]]) -> tuple[float, float, float]:
-    if not coords:
-        return (0.0, 0.0, 0.0)
-    inv = 1.0 / float(len(coords))
-    sx = sum(p[0] for p in coords)
-    sy = sum(p[1] for p in coords)
-    sz = sum(p[2] for p in coords)
-    return (sx * inv, sy * inv, sz * inv)
-
-
-def _center_coords(
-    coords: list[tuple[float, float, float]],
-    center: tuple[float, float, float],
-) -> list[tuple[float, float, float]]:
-    cx, cy, cz = center
-    return [(x - cx, y - cy, z - cz) for (x, y, z) in coords]
-
-
-def _covariance_matrix(
-    mob: list[tuple[float, float, float]],
-    ref: list[tuple[float, float, float]],
-) -> list[list[float]]:
-    sxx = syy = szz = sxy = sxz = syx = syz = szx = szy = 0.0
-    for (mx, my, mz), (rx, ry, rz) in zip(mob, ref):
-        sxx += mx * rx
-        sxy += mx * ry
-        sxz += mx * rz
-        syx += my * rx
-        syy += my * ry
-        syz += my * rz
-        szx += mz * rx
-        szy += mz * ry
-        szz += mz * rz
-    return [
-        [sxx, sxy, sxz],
-        [syx, syy, syz],
-        [szx, szy, szz],
-    ]
-
-
-def _quat_from_covariance(cov: list[list[float]]) -> tuple[float, float, float, float] | None:
-    sxx, sxy, sxz = cov[0]
-    syx, syy, syz = cov[1]
-    szx, szy, szz = cov[2]
-    n = [
-        [sxx + syy + szz, syz - szy, szx - sxz, sxy - syx],
-        [syz - szy, sxx - syy - szz, sxy + syx, szx + sxz],
-        [szx - sxz, sxy + syx, -sxx + syy - szz, syz + szy],
-        [sxy - syx, szx + sxz, syz + szy, -sxx - syy + szz],
-    ]
-    v = [1.0, 0.0, 0.0, 0.0]
-    for _ in range(32):
-        w0 = n[0][0] * v[0] + n[0][1] * v[1] + n[0][2] * v[2] + n[0][3] * v[3]
-        w1 = n[1][0] * v[0] + n[1][1] * v[1] + n[1][2] * v[2] + n[1][3] * v[3]
-        w2 = n[2][0] * v[0] + n[2][1] * v[1] + n[2][2] * v[2] + n[2][3] * v[3]
-        w3 = n[3][0] * v[0] + n[3][1] * v[1] + n[3][2] * v[2] + n[3][3] * v[3]
-        norm = math.sqrt(w0 * w0 + w1 * w1 + w2 * w2 + w3 * w3)
-        if norm <= 0.0:
-            return None
-        v = [w0 / norm, w1 / norm, w2 / norm, w3 / norm]
-    return (v[0], v[1], v[2], v[3])
-
-
-def _rotation_from_quat(q: tuple[float, float, float, float]) -> list[list[float]]:
-    w, x, y, z = q
-    ww = w * w
-    xx = x * x
-    yy = y * y
-    zz = z * z
-    wx = w * x
-    wy = w * y
-    wz = w * z
-    xy = x * y
-    xz = x * z
-    yz = y * z
-    return [
-        [ww + xx - yy - zz, 2.0 * (xy - wz), 2.0 * (xz + wy)],
-        [2.0 * (xy + wz), ww - xx + yy - zz, 2.0 * (yz - wx)],
-        [2.0 * (xz - wy), 2.0 * (yz + wx), ww - xx - yy + zz],
-    ]
-
-
-def _apply_rotation(
-    vec: tuple[float, float, float],
-    rot: list[list[float]],
-) -> tuple[float, float, float]:
-    x, y, z = vec
-    return (
-        rot[0][0] * x + rot[0][1] * y + rot[0][2] * z,
-        rot[1][0] * x + rot[1][1] * y + rot[1][2] * z,
-        rot[2][0] * x + rot[2][1] * y + rot[2][2] * z,
-    )
+        ref_keys, ref_xyz = ref_coords[chain_id]
+        mob_keys, mob_xyz = mob_coords[chain_id]
+        # Both key arrays are sorted and unique, so one intersect yields the matching rows on each side.
+        common, ref_rows, mob_rows = np.intersect1d(ref_keys, mob_keys, assume_unique=True, return_indices=True)
+        allowed = include_positions.get(chain_id) if isinstance(include_positions, dict) else None
+        if allowed is not None:
+            pairs = [(int(resseq), str(icode)) for resseq, icode in allowed if len(str(icode)) <= 1]
+            allowed_keys = _residue_keys(
+                np.asarray([resseq for resseq, _icode in pairs], dtype=np.int64),
+                np.asarray([icode for _resseq, icode in pairs], dtype="U1"),
+            )
+            keep = np.isin(common, allowed_keys)
+            ref_rows = ref_rows[keep]
+            mob_rows = mob_rows[keep]
+        ref.append(ref_xyz[ref_rows])
+        mob.append(mob_xyz[mob_rows])
+    if not ref:
+        return np.empty((0, 3)), np.empty((0, 3))
+    return np.concatenate(ref), np.concatenate(mob)
+
+
+def _kabsch_rotation(mob: np.ndarray, ref: np.ndarray) -> np.ndarray | None:
+    """Proper rotation (3x3) that best superposes centred ``mob`` onto centred ``ref`` (both (N, 3))."""
+    cov = mob.T @ ref
+    if not cov.any():
+        return None
+    # The SVD is exact for coincident singular values (planar or collinear sets), where an
+    # iterative eigen-solver on Horn's 4x4 quaternion matrix would converge poorly.
+    u, _s, vt = np.linalg.svd(cov)
+    # Flip the weakest axis when the optimal orthogonal map would be a reflection.
+    if np.linalg.det(u) * np.linalg.det(vt) < 0.0:
+        vt[2] = -vt[2]
+    return (u @ vt).T
 
 
 def ca_rmsd(
@@ -709,23 +1335,62 @@ def ca_rmsd(
     # to use as a structural gate.
     if len(ref) < 2 or len(mob) < 2:
         return None
-    ref_center = _centroid(ref)
-    mob_center = _centroid(mob)
-    ref_c = _center_coords(ref, ref_center)
-    mob_c = _center_coords(mob, mob_center)
-    cov = _covariance_matrix(mob_c, ref_c)
-    quat = _quat_from_covariance(cov)
-    if quat is None:
+    ref_c = ref - ref.mean(axis=0)
+    mob_c = mob - mob.mean(axis=0)
+    rot = _kabsch_rotation(mob_c, ref_c)
+    if rot is None:
         return None
-    rot = _rotation_from_quat(quat)
-    total = 0.0
-    for r, m in zip(ref_c, mob_c):
-        mx, my, mz = _apply_rotation(m, rot)
-        dx = r[0] - mx
-        dy = r[1] - my
-        dz = r[2] - mz
-        total += dx * dx + dy * dy + dz * dz
-    return math.sqrt(total / float(len(ref_c)))
+    # Rotate, subtract and reduce in place: one temporary, and the squared sum is a single dot product.
+    diff = mob_c @ rot.T
+    diff -= ref_c
+    return float(np.sqrt(np.vdot(diff, diff) / len(ref_c)))
+
+
+def _map_in_processes(fn, *iterables, n_items: int, max_workers: int | None):
+    workers = min(max(1, int(max_workers or os.cpu_count() or 1)), max(1, n_items))
+    if workers <= 1:
+        return list(map(fn, *iterables))
+    # Several items per task so pickling round-trips stay small next to the parsing work.
+    chunksize = max(1, n_items // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(fn, *iterables, chunksize=chunksize))
+
+
+def ligand_proximity_mask_batch(
+    pdb_texts: list[str],
+    *,
+    max_workers: int | None = None,
+    **kwargs,
+) -> list[dict[str, list[int]]]:
+    """``ligand_proximity_mask`` over many structures, spread across worker processes."""
+    texts = list(pdb_texts)
+    return _map_in_processes(
+        partial(ligand_proximity_mask, **kwargs),
+        texts,
+        n_items=len(texts),
+        max_workers=max_workers,
+    )
+
+
+def ca_rmsd_batch(
+    pdb_refs: list[str],
+    pdb_mobiles: list[str],
+    *,
+    max_workers: int | None = None,
+    **kwargs,
+) -> list[float | None]:
+    """``ca_rmsd`` for each (reference, mobile) pair, spread across worker processes."""
+    refs = list(pdb_refs)
+    mobiles = list(pdb_mobiles)
+    if len(refs) != len(mobiles):
+        raise ValueError(f"Expected as many mobile structures as references ({len(refs)}), got {len(mobiles)}")
+    return _map_in_processes(
+        partial(ca_rmsd, **kwargs),
+        refs,
+        mobiles,
+        n_items=len(refs),
+        max_workers=max_workers,
+    )
 
 
 def _require_numpy():
@@ -744,10 +1409,10 @@ def _dssp_complete_backbone_residues(
     chains: list[str] | None = None,
 ) -> dict[str, list[dict[str, object]]]:
     residues = residues_by_chain(pdb_text, only_atom_records=True)
-    chain_set = set(chains) if chains is not None else None
+    chain_filter = _chain_filter(chains)
     out: dict[str, list[dict[str, object]]] = {}
     for chain_id, res_list in residues.items():
-        if chain_set is not None and chain_id not in chain_set:
+        if chain_filter is not None and chain_id not in chain_filter:
             continue
         chain_entries: list[dict[str, object]] = []
         for res in res_list:
@@ -976,7 +1641,8 @@ def residue_sasa_by_chain(
 ) -> dict[str, dict[int, dict[str, float | str]]]:
     residues = residues_by_chain(pdb_text, only_atom_records=True)
     if chains is not None:
-        residues = {k: v for k, v in residues.items() if k in set(chains)}
+        chain_filter = _chain_filter(chains)
+        residues = {k: v for k, v in residues.items() if k in chain_filter}
 
     atoms: list[tuple[float, float, float, float, str, int, str]] = []
     for chain_id, res_list in residues.items():
@@ -2,6 +2,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
+
+
+# Fixed-column HETATM record: serial, atom name, resname, chain, resseq, x, y, z, element.
+_HETATM_LINE = "HETATM%5d %4s %3s %s%4d    %8.3f%8.3f%8.3f  1.00 20.00           %2s"
+
 
 @dataclass(frozen=True)
 class SdfAtom:
@@ -34,7 +40,8 @@ def _parse_counts_line(line: str) -> int:
     return 0
 
 
-def parse_sdf_atoms(sdf_text: str) -> list[SdfAtom]:
+def parse_sdf_arrays(sdf_text: str) -> dict[str, np.ndarray]:
+    """Atom block of the first SDF record as parallel arrays: (N, 3) float64 ``xyz`` and upper-cased ``element``."""
     block = str(sdf_text or "").split("$$$$", 1)[0]
     lines = [line.rstrip("\n") for line in block.splitlines()]
     if len(lines) < 4:
@@ -43,23 +50,25 @@ def parse_sdf_atoms(sdf_text: str) -> list[SdfAtom]:
     if n_atoms <= 0:
         raise ValueError("SDF parse failed: atom count missing")
 
-    atoms: list[SdfAtom] = []
     start = 4
-    for raw in lines[start : start + n_atoms]:
-        parts = raw.split()
-        if len(parts) < 4:
-            continue
-        x = _parse_float(parts[0])
-        y = _parse_float(parts[1])
-        z = _parse_float(parts[2])
-        element = str(parts[3]).strip().upper()
-        if not element:
-            continue
-        atoms.append(SdfAtom(x=x, y=y, z=z, element=element))
-
-    if not atoms:
+    rows = [parts for parts in (raw.split() for raw in lines[start : start + n_atoms]) if len(parts) >= 4]
+    if not rows:
         raise ValueError("SDF parse failed: no atoms found")
-    return atoms
+    try:
+        flat = [float(value) for parts in rows for value in parts[:3]]
+    except ValueError:
+        flat = [_parse_float(value) for parts in rows for value in parts[:3]]
+    xyz = np.array(flat, dtype=np.float64).reshape(len(rows), 3)
+    element = np.array([parts[3].upper() for parts in rows], dtype=str)
+    return {"xyz": xyz, "element": element}
+
+
+def parse_sdf_atoms(sdf_text: str) -> list[SdfAtom]:
+    arrays = parse_sdf_arrays(sdf_text)
+    return [
+        SdfAtom(x=x, y=y, z=z, element=element)
+        for (x, y, z), element in zip(arrays["xyz"].tolist(), arrays["element"].tolist(), strict=True)
+    ]
 
 
 def sdf_to_pdb(
@@ -69,17 +78,14 @@ def sdf_to_pdb(
     chain_id: str = "Z",
     resseq: int = 1,
 ) -> str:
-    atoms = parse_sdf_atoms(sdf_text)
-    lines: list[str] = []
-    serial = 1
-    for atom in atoms:
-        element = (atom.element or "C").upper()
-        atom_name = element
-        lines.append(
-            f"HETATM{serial:5d} {atom_name:>4s} {resname:>3s} {chain_id}{int(resseq):4d}    "
-            f"{atom.x:8.3f}{atom.y:8.3f}{atom.z:8.3f}  1.00 20.00           {element:>2s}"
+    arrays = parse_sdf_arrays(sdf_text)
+    resseq = int(resseq)
+    lines = [
+        _HETATM_LINE % (serial, element or "C", resname, chain_id, resseq, x, y, z, element or "C")
+        for serial, ((x, y, z), element) in enumerate(
+            zip(arrays["xyz"].tolist(), arrays["element"].tolist(), strict=True), start=1
         )
-        serial += 1
+    ]
     lines.append("END")
     return "\n".join(lines) + "\n"
 
@@ -1,16 +1,20 @@
 from __future__ import annotations
 
 import base64
+import binascii
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 import io
-import json
+from operator import itemgetter
 import tarfile
+import threading
 from typing import Any
 from collections.abc import Callable
 
 import requests
 
 from ..af2_utils import af2_error_is_missing_pdb_outputs
+from ..jsonio import load_json
 from .runpod import RunPodClient
 from ..models import SequenceRecord
 
@@ -48,17 +52,67 @@ def _archive_entries(output: dict[str, Any]) -> list[dict[str, str]]:
     raise RuntimeError("AlphaFold2 output did not include 'archives' or 'archive_base64'")
 
 
-def _extract_member_text(tar: tarfile.TarFile, suffix: str) -> str | None:
-    for member in tar.getmembers():
+class _Base64Reader(io.RawIOBase):
+    """Read-only stream over base64 text, decoding ``chunk_chars`` characters at a time.
+
+    Lets the gzip/tar readers pull bytes on demand, so the decoded archive never sits in memory
+    whole and nothing past the last member that is needed gets decoded at all. Slices are decoded
+    strictly; the first slice that is not plain base64 (line breaks, stray characters) hands the
+    rest of the text to ``base64.b64decode``, which skips junk exactly as decoding it whole would.
+    """
+
+    def __init__(self, text: str, *, chunk_chars: int = 64 * 1024) -> None:
+        super().__init__()
+        self._text = text
+        self._chunk = max(4, chunk_chars - chunk_chars % 4)
+        self._pos = 0
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def _decode_next(self) -> bytes:
+        start = self._pos
+        piece = self._text[start : start + self._chunk]
+        self._pos = start + len(piece)
+        # Padding may only close the text; anywhere else let the lenient decoder sort it out.
+        if self._pos == len(self._text) or "=" not in piece:
+            try:
+                return binascii.a2b_base64(piece, strict_mode=True)
+            except binascii.Error:
+                pass
+        self._pos = len(self._text)
+        return base64.b64decode(self._text[start:])
+
+    def readinto(self, buffer) -> int:
+        while not self._pending and self._pos < len(self._text):
+            self._pending = memoryview(self._decode_next())
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+
+def _extract_members(tar: tarfile.TarFile, suffixes: set[str]) -> dict[str, bytes]:
+    """Raw bytes of the first regular file ending in each suffix, found in one pass over the archive.
+
+    Iterating the tar (rather than ``getmembers()``) works on streamed archives and stops reading
+    as soon as every suffix has been matched.
+    """
+    found: dict[str, bytes] = {}
+    for member in tar:
         if not member.isfile():
             continue
-        if member.name.endswith(suffix):
-            f = tar.extractfile(member)
-            if f is None:
-                continue
-            raw = f.read()
-            return raw.decode("utf-8", errors="replace")
-    return None
+        suffix = next((suf for suf in suffixes if suf not in found and member.name.endswith(suf)), None)
+        if suffix is None:
+            continue
+        f = tar.extractfile(member)
+        if f is None:
+            continue
+        found[suffix] = f.read()
+        if len(found) == len(suffixes):
+            break
+    return found
 
 
 def _best_plddt_from_ranking_debug(ranking: dict[str, Any]) -> tuple[str | None, float]:
@@ -69,18 +123,15 @@ def _best_plddt_from_ranking_debug(ranking: dict[str, Any]) -> tuple[str | None,
             first = order[0]
             if isinstance(first, str) and isinstance(plddts.get(first), (int, float)):
                 return first, float(plddts[first])
-        best_model = None
-        best_score = float("-inf")
-        for k, v in plddts.items():
-            if not isinstance(k, str) or not isinstance(v, (int, float)):
-                continue
-            score = float(v)
-            if score > best_score:
-                best_score = score
-                best_model = k
-        if best_model is None:
+        # NaN and -inf can never win (the first of tied maxima does), so they are not candidates.
+        scored = [
+            (k, score)
+            for k, v in plddts.items()
+            if isinstance(k, str) and isinstance(v, (int, float)) and (score := float(v)) > float("-inf")
+        ]
+        if not scored:
             raise RuntimeError("ranking_debug.plddts contained no numeric scores")
-        return best_model, float(best_score)
+        return max(scored, key=itemgetter(1))
 
     for key in ("mean_plddt", "plddt", "avg_plddt"):
         v = ranking.get(key)
@@ -105,81 +156,123 @@ class AlphaFold2RunPodClient:
         extra_flags: str | None = None,
         on_job_id: Callable[[str, str], None] | None = None,
         resume_job_ids: dict[str, str] | None = None,
+        max_concurrency: int = 8,
     ) -> dict[str, Any]:
-        results: dict[str, Any] = {}
-        for seq in sequences:
-            payload: dict[str, Any] = {
-                "sequence": seq.sequence,
-                "model_preset": model_preset,
-                "db_preset": db_preset,
-                "max_template_date": max_template_date,
-            }
-            if extra_flags:
-                payload["alphafold_extra_flags"] = str(extra_flags)
+        payload: dict[str, Any] = {
+            "model_preset": model_preset,
+            "db_preset": db_preset,
+            "max_template_date": max_template_date,
+        }
+        if extra_flags:
+            payload["alphafold_extra_flags"] = str(extra_flags)
+
+        report_job_id: Callable[[str, str], None] | None = None
+        if on_job_id is not None:
+            lock = threading.Lock()
 
+            def _locked(seq_id: str, job_id: str) -> None:
+                with lock:
+                    on_job_id(seq_id, job_id)
+
+            report_job_id = _locked
+
+        def predict_one(seq: SequenceRecord) -> dict[str, Any]:
             existing_job_id = (resume_job_ids or {}).get(seq.id) if resume_job_ids else None
-            for attempt in range(2):
-                try:
-                    if isinstance(existing_job_id, str) and existing_job_id.strip():
-                        job_id = existing_job_id.strip()
-                        if on_job_id is not None:
-                            on_job_id(seq.id, job_id)
-                        try:
-                            job = self.runpod.wait(self.endpoint_id, job_id)
-                        except requests.HTTPError as exc:
-                            status_code = exc.response.status_code if exc.response is not None else None
-                            if status_code == 404:
-                                _, job = self.runpod.run_and_wait_with_job_id(
-                                    self.endpoint_id,
-                                    payload,
-                                    on_job_id=(lambda job_id, seq_id=seq.id: on_job_id(seq_id, job_id)) if on_job_id else None,
-                                )
-                            else:
-                                raise
-                    else:
-                        _, job = self.runpod.run_and_wait_with_job_id(
-                            self.endpoint_id,
-                            payload,
-                            on_job_id=(lambda job_id, seq_id=seq.id: on_job_id(seq_id, job_id)) if on_job_id else None,
-                        )
-                    if job.get("status") not in {"COMPLETED", "COMPLETED_WITH_ERRORS"}:
-                        raise RuntimeError(f"AlphaFold2 RunPod job not completed: {job}")
-
-                    output = job.get("output")
-                    if not isinstance(output, dict):
-                        raise RuntimeError(f"AlphaFold2 output missing/invalid: {job}")
-
-                    entries = _archive_entries(output)
-                    if len(entries) != 1:
-                        raise RuntimeError(
-                            "AlphaFold2 endpoint returned multiple archives for a single sequence; "
-                            "use an input archive for batch mode."
-                        )
-
-                    archive_name = entries[0]["name"]
-                    archive_bytes = base64.b64decode(entries[0]["base64"])
-                    with tarfile.open(fileobj=io.BytesIO(archive_bytes), mode="r:gz") as tar:
-                        ranking_text = _extract_member_text(tar, "ranking_debug.json")
-                        if ranking_text is None:
-                            raise RuntimeError("ranking_debug.json not found in AlphaFold2 archive")
-                        ranking = json.loads(ranking_text)
-                        if not isinstance(ranking, dict):
-                            raise RuntimeError("ranking_debug.json is not an object")
-
-                        ranked0 = _extract_member_text(tar, "ranked_0.pdb")
-                        best_model, best_plddt = _best_plddt_from_ranking_debug(ranking)
-
-                    results[seq.id] = {
-                        "archive_name": archive_name,
-                        "best_model": best_model,
-                        "best_plddt": best_plddt,
-                        "ranking_debug": ranking,
-                        "ranked_0_pdb": ranked0,
-                        "files": output.get("files"),
-                    }
-                    break
-                except Exception as exc:
-                    if attempt >= 1 or not af2_error_is_missing_pdb_outputs(str(exc)):
-                        raise
-                    existing_job_id = None
+            return self._predict_one(
+                seq,
+                {"sequence": seq.sequence, **payload},
+                on_job_id=report_job_id,
+                existing_job_id=existing_job_id,
+            )
+
+        # Each sequence is an independent remote job that mostly waits on the endpoint queue,
+        # so several are kept in flight at once; results and errors still follow input order.
+        workers = max(1, min(int(max_concurrency), len(sequences)))
+        if workers <= 1:
+            return {seq.id: predict_one(seq) for seq in sequences}
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = [executor.submit(predict_one, seq) for seq in sequences]
+            results = {seq.id: future.result() for seq, future in zip(sequences, futures, strict=True)}
+        except BaseException:
+            # Raise now rather than after every in-flight job finishes; queued ones never start.
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
         return results
+
+    def _predict_one(
+        self,
+        seq: SequenceRecord,
+        payload: dict[str, Any],
+        *,
+        on_job_id: Callable[[str, str], None] | None,
+        existing_job_id: str | None,
+    ) -> dict[str, Any]:
+        retried = False
+        while True:
+            try:
+                if isinstance(existing_job_id, str) and existing_job_id.strip():
+                    job_id = existing_job_id.strip()
+                    if on_job_id is not None:
+                        on_job_id(seq.id, job_id)
+                    try:
+                        job = self.runpod.wait(self.endpoint_id, job_id)
+                    except requests.HTTPError as exc:
+                        status_code = exc.response.status_code if exc.response is not None else None
+                        if status_code == 404:
+                            _, job = self.runpod.run_and_wait_with_job_id(
+                                self.endpoint_id,
+                                payload,
+                                on_job_id=(lambda job_id, seq_id=seq.id: on_job_id(seq_id, job_id)) if on_job_id else None,
+                            )
+                        else:
+                            raise
+                else:
+                    _, job = self.runpod.run_and_wait_with_job_id(
+                        self.endpoint_id,
+                        payload,
+                        on_job_id=(lambda job_id, seq_id=seq.id: on_job_id(seq_id, job_id)) if on_job_id else None,
+                    )
+                if job.get("status") not in {"COMPLETED", "COMPLETED_WITH_ERRORS"}:
+                    raise RuntimeError(f"AlphaFold2 RunPod job not completed: {job}")
+
+                output = job.get("output")
+                if not isinstance(output, dict):
+                    raise RuntimeError(f"AlphaFold2 output missing/invalid: {job}")
+
+                entries = _archive_entries(output)
+                if len(entries) != 1:
+                    raise RuntimeError(
+                        "AlphaFold2 endpoint returned multiple archives for a single sequence; "
+                        "use an input archive for batch mode."
+                    )
+
+                archive_name = entries[0]["name"]
+                # Decode, inflate and walk the tar as one stream: no member index, no seeking back.
+                with tarfile.open(fileobj=_Base64Reader(entries[0]["base64"]), mode="r|gz") as tar:
+                    members = _extract_members(tar, {"ranking_debug.json", "ranked_0.pdb"})
+                ranking_raw = members.get("ranking_debug.json")
+                if ranking_raw is None:
+                    raise RuntimeError("ranking_debug.json not found in AlphaFold2 archive")
+                ranking = load_json(ranking_raw)
+                if not isinstance(ranking, dict):
+                    raise RuntimeError("ranking_debug.json is not an object")
+
+                ranked0_raw = members.get("ranked_0.pdb")
+                ranked0 = ranked0_raw.decode("utf-8", errors="replace") if ranked0_raw is not None else None
+                best_model, best_plddt = _best_plddt_from_ranking_debug(ranking)
+
+                return {
+                    "archive_name": archive_name,
+                    "best_model": best_model,
+                    "best_plddt": best_plddt,
+                    "ranking_debug": ranking,
+                    "ranked_0_pdb": ranked0,
+                    "files": output.get("files"),
+                }
+            except Exception as exc:
+                if retried or not af2_error_is_missing_pdb_outputs(str(exc)):
+                    raise
+                retried = True
+                existing_job_id = None
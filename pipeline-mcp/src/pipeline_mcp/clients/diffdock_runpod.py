@@ -16,15 +16,32 @@ def _encode_file(name: str, content: str) -> dict[str, str]:
 
 
 def _select_rank1_sdf(names: list[str], complex_name: str | None) -> str | None:
-    candidates = [n for n in names if n.lower().endswith("/rank1.sdf") or n.lower().endswith("rank1.sdf")]
-    if complex_name:
-        preferred = [n for n in candidates if f"/{complex_name}/" in n or n.startswith(f"{complex_name}/")]
-        if preferred:
-            candidates = preferred
-    if not candidates:
-        return None
-    candidates.sort()
-    return candidates[0]
+    # One pass, keeping the smallest name overall and the smallest under ``complex_name``.
+    inner = f"/{complex_name}/"
+    prefix = f"{complex_name}/"
+    best: str | None = None
+    best_preferred: str | None = None
+    for n in names:
+        if not n.lower().endswith("rank1.sdf"):
+            continue
+        if best is None or n < best:
+            best = n
+        if complex_name and (inner in n or n.startswith(prefix)):
+            if best_preferred is None or n < best_preferred:
+                best_preferred = n
+    return best_preferred if best_preferred is not None else best
+
+
+def _without_inline_zip(output: dict[str, Any]) -> dict[str, Any]:
+    """``output`` with the decoded ``out_dir_zip_b64`` replaced by a marker; the bytes travel as ``zip_bytes``."""
+    out = dict(output)
+    zip_b64 = out.get("out_dir_zip_b64")
+    out["out_dir_zip_b64"] = {
+        "omitted": True,
+        "reason": "large inline archive payload",
+        "chars": len(zip_b64) if isinstance(zip_b64, str) else None,
+    }
+    return out
 
 
 @dataclass(frozen=True)
@@ -97,6 +114,9 @@ class DiffDockRunPodClient:
             raise RuntimeError(f"DiffDock output missing out_dir_zip_b64: {output.keys()}")
 
         zip_bytes = base64.b64decode(zip_b64)
+        # Keep only the decoded archive alive: the base64 text would otherwise ride along in ``output``.
+        del zip_b64
+        output = _without_inline_zip(output)
         with zipfile.ZipFile(io.BytesIO(zip_bytes), "r") as zf:
             names = zf.namelist()
             selected = _select_rank1_sdf(names, complex_name=complex_name)
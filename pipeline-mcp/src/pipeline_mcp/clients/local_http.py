@@ -91,15 +91,20 @@ def _strip_inline_archive_payloads(value: object, *, key: str = "") -> object:
 
 
 def _select_rank1_sdf(names: list[str], complex_name: str | None) -> str | None:
-    candidates = [name for name in names if name.lower().endswith("/rank1.sdf") or name.lower().endswith("rank1.sdf")]
-    if complex_name:
-        preferred = [name for name in candidates if f"/{complex_name}/" in name or name.startswith(f"{complex_name}/")]
-        if preferred:
-            candidates = preferred
-    if not candidates:
-        return None
-    candidates.sort()
-    return candidates[0]
+    # One pass, keeping the smallest name overall and the smallest under ``complex_name``.
+    inner = f"/{complex_name}/"
+    prefix = f"{complex_name}/"
+    best: str | None = None
+    best_preferred: str | None = None
+    for name in names:
+        if not name.lower().endswith("rank1.sdf"):
+            continue
+        if best is None or name < best:
+            best = name
+        if complex_name and (inner in name or name.startswith(prefix)):
+            if best_preferred is None or name < best_preferred:
+                best_preferred = name
+    return best_preferred if best_preferred is not None else best
 
 
 def _error_detail_from_response(response: Any) -> str | None:
@@ -353,7 +358,8 @@ class LocalHTTPDiffDockClient:
                 if selected:
                     return {
                         "job_id": str(output.get("job_id") or ""),
-                        "output": output,
+                        # The archive is returned decoded as zip_bytes; don't carry its base64 text too.
+                        "output": {**output, "out_dir_zip_b64": _omitted_inline_payload(zip_b64)},
                         "zip_bytes": zip_bytes,
                         "selected_sdf_name": selected,
                         "sdf_text": zf.read(selected).decode("utf-8", errors="replace"),
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import base64
+import binascii
 from dataclasses import dataclass
 import os
 from typing import Any
@@ -8,12 +9,40 @@ from collections.abc import Callable
 
 import requests
 
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+
 from .runpod import RunPodClient
 from ..models import SequenceRecord
 
 
+# Record fields carried as SequenceRecord.header/.sequence rather than copied into meta.
+_META_SKIP = frozenset({"header", "sequence"})
+# Output lists already turned into SequenceRecords by _parse_result.
+_OUTPUT_RECORD_KEYS = frozenset({"native", "samples"})
+
+
+# Multiple of 3, so every slice but the last encodes without padding.
+_B64_CHUNK_CHARS = 3 * 64 * 1024
+
+
 def _b64encode_text(text: str) -> str:
-    return base64.b64encode(text.encode("utf-8")).decode("ascii")
+    if pybase64 is not None:
+        # SIMD encoder that also builds the str directly, skipping the intermediate base64 bytes.
+        return pybase64.b64encode_as_string(text.encode("utf-8"))
+    if not text.isascii():
+        return base64.b64encode(text.encode("utf-8")).decode("ascii")
+    # PDB text is ASCII, so it can be encoded a slice at a time into one preallocated buffer: the
+    # full UTF-8 copy and the intermediate base64 bytes never exist alongside the result.
+    out = bytearray(4 * ((len(text) + 2) // 3))
+    pos = 0
+    for start in range(0, len(text), _B64_CHUNK_CHARS):
+        piece = binascii.b2a_base64(text[start : start + _B64_CHUNK_CHARS].encode("ascii"), newline=False)
+        out[pos : pos + len(piece)] = piece
+        pos += len(piece)
+    return out.decode("ascii")
 
 
 def _env_int(name: str, default: int) -> int:
@@ -27,7 +56,7 @@ def _env_int(name: str, default: int) -> int:
     return value if value > 0 else int(default)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ProteinMPNNClient:
     runpod: RunPodClient | None
     endpoint_id: str | None
@@ -50,7 +79,10 @@ class ProteinMPNNClient:
         seed: int = 0,
         backbone_noise: float = 0.0,
         on_job_id: Callable[[str], None] | None = None,
+        return_raw_output: bool = False,
     ) -> tuple[SequenceRecord, list[SequenceRecord], dict[str, Any]]:
+        # The third element is the job output minus its native/samples lists, which the returned
+        # records already carry; pass return_raw_output=True to get the untouched output instead.
         total_requested = int(num_seq_per_target)
         max_per_job = _env_int("PROTEINMPNN_MAX_SEQS_PER_JOB", 500)
         if total_requested > max_per_job:
@@ -88,7 +120,7 @@ class ProteinMPNNClient:
             payload["fixed_positions"] = fixed_positions
 
         result = self._run_payload(payload, on_job_id=on_job_id)
-        return self._parse_result(result)
+        return self._parse_result(result, return_raw_output=return_raw_output)
 
     def _design_chunked(
         self,
@@ -110,6 +142,8 @@ class ProteinMPNNClient:
         native_rec: SequenceRecord | None = None
         sample_recs: list[SequenceRecord] = []
         chunks: list[dict[str, Any]] = []
+        payloads: list[dict[str, Any]] = []
+        pdb_base64 = _b64encode_text(pdb_text)
         remaining = int(num_seq_per_target)
         chunk_index = 0
         while remaining > 0:
@@ -117,7 +151,7 @@ class ProteinMPNNClient:
             chunk_size = min(int(max_seq_per_job), remaining)
             chunk_seed = int(seed) + chunk_index - 1
             payload: dict[str, Any] = {
-                "pdb_base64": _b64encode_text(pdb_text),
+                "pdb_base64": pdb_base64,
                 "pdb_name": pdb_name,
                 "use_soluble_model": bool(use_soluble_model),
                 "model_name": model_name,
@@ -132,15 +166,27 @@ class ProteinMPNNClient:
                 payload["pdb_path_chains"] = pdb_path_chains
             if fixed_positions is not None:
                 payload["fixed_positions"] = fixed_positions
+            payloads.append(payload)
+            chunks.append(
+                {
+                    "chunk": chunk_index,
+                    "num_seq_per_target": chunk_size,
+                    "seed": chunk_seed,
+                    "job_ids": [],
+                }
+            )
+            remaining -= chunk_size
 
-            job_ids: list[str] = []
-
-            def _on_chunk_job(job_id: str) -> None:
-                job_ids.append(str(job_id))
-                if on_job_id is not None:
-                    on_job_id(str(job_id))
+        def _on_chunk_job(index: int, job_id: str) -> None:
+            chunks[index]["job_ids"].append(str(job_id))
+            if on_job_id is not None:
+                on_job_id(str(job_id))
 
-            result = self._run_payload(payload, on_job_id=_on_chunk_job)
+        # Chunks are independent jobs: all of them are queued before any is waited on.
+        results = self._run_payloads(payloads, on_job_id=_on_chunk_job)
+        for chunk, result in zip(chunks, results, strict=True):
+            chunk_index = chunk["chunk"]
+            chunk_seed = chunk["seed"]
             chunk_native, chunk_samples, _chunk_output = self._parse_result(result)
             if native_rec is None:
                 native_rec = chunk_native
@@ -163,16 +209,7 @@ class ProteinMPNNClient:
                         meta=meta,
                     )
                 )
-            chunks.append(
-                {
-                    "chunk": chunk_index,
-                    "num_seq_per_target": chunk_size,
-                    "seed": chunk_seed,
-                    "job_ids": job_ids,
-                    "sample_count": len(chunk_samples),
-                }
-            )
-            remaining -= chunk_size
+            chunk["sample_count"] = len(chunk_samples)
 
         if native_rec is None:
             raise RuntimeError("ProteinMPNN chunked run returned no native sequence")
@@ -205,8 +242,20 @@ class ProteinMPNNClient:
         )
         return result
 
+    def _run_payloads(
+        self,
+        payloads: list[dict[str, Any]],
+        *,
+        on_job_id: Callable[[int, str], None] | None = None,
+    ) -> list[dict[str, Any]]:
+        if self.gpu_url:
+            return [self._run_gpu_http(payload) for payload in payloads]
+        if self.runpod is None or not self.endpoint_id:
+            raise RuntimeError("ProteinMPNN RunPod client is not configured")
+        return [result for _, result in self.runpod.run_and_wait_many(self.endpoint_id, payloads, on_job_id=on_job_id)]
+
     def _parse_result(
-        self, result: dict[str, Any]
+        self, result: dict[str, Any], *, return_raw_output: bool = False
     ) -> tuple[SequenceRecord, list[SequenceRecord], dict[str, Any]]:
         if result.get("status") != "COMPLETED":
             raise RuntimeError(f"ProteinMPNN job not completed: {result}")
@@ -223,7 +272,7 @@ class ProteinMPNNClient:
             id=str(native.get("name") or "native"),
             header=str(native.get("header") or "native"),
             sequence=str(native.get("sequence") or ""),
-            meta={k: v for k, v in native.items() if k not in {"header", "sequence"}},
+            meta={k: v for k, v in native.items() if k not in _META_SKIP},
         )
         sample_recs: list[SequenceRecord] = []
         for i, s in enumerate(samples):
@@ -237,11 +286,13 @@ class ProteinMPNNClient:
                     id=sample_id,
                     header=header,
                     sequence=seq,
-                    meta={k: v for k, v in s.items() if k not in {"header", "sequence"}},
+                    meta={k: v for k, v in s.items() if k not in _META_SKIP},
                 )
             )
 
-        return native_rec, sample_recs, output
+        if return_raw_output:
+            return native_rec, sample_recs, output
+        return native_rec, sample_recs, {k: v for k, v in output.items() if k not in _OUTPUT_RECORD_KEYS}
 
     def _run_gpu_http(self, payload: dict[str, Any]) -> dict[str, Any]:
         if not self.gpu_url:
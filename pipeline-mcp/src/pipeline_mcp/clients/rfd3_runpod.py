@@ -9,7 +9,7 @@ import requests
 from .runpod import RunPodClient
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RFD3RunPodClient:
     runpod: RunPodClient
     endpoint_id: str
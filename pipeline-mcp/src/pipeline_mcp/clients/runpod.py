@@ -1,15 +1,28 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from dataclasses import field
 import os
+import re
+import threading
 import time
 from typing import Any
 from collections.abc import Callable
+from urllib.parse import urlencode
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 
 _RUNPOD_JOB_API_BASE = "https://api.runpod.ai/v2"
 _RUNPOD_REST_API_BASE = "https://rest.runpod.io/v1"
+_TERMINAL_STATUSES = frozenset({"COMPLETED", "COMPLETED_WITH_ERRORS", "FAILED", "CANCELLED", "TIMED_OUT"})
+_PENDING_STATUSES = frozenset({"IN_QUEUE", "IN_PROGRESS"})
+_STATUS_FIELD_RE = re.compile(rb'"status"\s*:\s*"([A-Z_]+)"')
+# Status bodies smaller than this are simply parsed; the peek only pays off on big partial output.
+_PEEK_MIN_BYTES = 64 * 1024
 
 
 def _status_message(status_code: int | None) -> str | None:
@@ -20,6 +33,25 @@ def _status_message(status_code: int | None) -> str | None:
     return None
 
 
+def _is_terminal(data: dict[str, Any]) -> bool:
+    return (data.get("status") or data.get("state")) in _TERMINAL_STATUSES
+
+
+def _peek_pending_status(content: bytes) -> str | None:
+    """The status of a large, still-running job's status body, found without parsing it all.
+
+    Only trusted when the body has exactly one "status" field and no "state" field, so a nested
+    status inside the job's (possibly streamed) output cannot be mistaken for the job's own.
+    """
+    if len(content) < _PEEK_MIN_BYTES or b'"state"' in content:
+        return None
+    matches = _STATUS_FIELD_RE.findall(content)
+    if len(matches) != 1:
+        return None
+    status = matches[0].decode("ascii")
+    return status if status in _PENDING_STATUSES else None
+
+
 def _env_true(name: str) -> bool:
     return os.environ.get(name, "").strip().lower() in {"1", "true", "yes", "y", "on"}
 
@@ -32,6 +64,100 @@ def requests_verify_arg(*, ca_bundle: str | None, skip_verify: bool) -> bool | s
     return True
 
 
+def webhook_callback_url(base_url: str, secret: str) -> str:
+    """URL handed to RunPod as a job's ``webhook``; the secret rides along as ``?token=``."""
+    sep = "&" if "?" in base_url else "?"
+    return f"{base_url}{sep}{urlencode({'token': secret})}"
+
+
+class _WebhookInbox:
+    """Job payloads POSTed back by RunPod webhooks, held until wait() on that job collects them.
+
+    Deliveries nobody collects (the job was already seen finishing through polling, or belongs to
+    another process) are dropped after ``max_age_s``.
+    """
+
+    def __init__(self, *, max_age_s: float = 3600.0) -> None:
+        self.max_age_s = max_age_s
+        self._cond = threading.Condition()
+        self._results: dict[str, tuple[float, dict[str, Any]]] = {}
+
+    def deliver(self, job_id: str, data: dict[str, Any]) -> None:
+        now = time.monotonic()
+        with self._cond:
+            stale = [k for k, (at, _) in self._results.items() if now - at >= self.max_age_s]
+            for k in stale:
+                del self._results[k]
+            self._results[job_id] = (now, data)
+            self._cond.notify_all()
+
+    def take(self, job_id: str, *, timeout: float) -> dict[str, Any] | None:
+        with self._cond:
+            self._cond.wait_for(lambda: job_id in self._results, timeout=max(0.0, timeout))
+            entry = self._results.pop(job_id, None)
+        return entry[1] if entry is not None else None
+
+
+_WEBHOOKS = _WebhookInbox()
+# Only the process serving /runpod/callback ever sees deliveries; everywhere else (stdio server,
+# scripts) a webhook would just leave wait() sleeping on an inbox nothing fills.
+_RECEIVES_WEBHOOKS = False
+
+
+def receive_webhooks() -> None:
+    """Mark this process as the one RunPod webhooks are delivered to."""
+    global _RECEIVES_WEBHOOKS
+    _RECEIVES_WEBHOOKS = True
+
+
+def receives_webhooks() -> bool:
+    return _RECEIVES_WEBHOOKS
+
+# Shared by every client for best-effort completion hooks, so they never hold up a polling thread.
+_CALLBACK_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="runpod-cb")
+
+
+def _call_quietly(fn: Callable[..., Any], *args: Any) -> None:
+    try:
+        fn(*args)
+    except Exception:
+        pass
+
+
+def deliver_webhook(data: dict[str, Any]) -> bool:
+    """Hand a RunPod webhook body ({id, status, output, ...}) to whoever is waiting on that job."""
+    job_id = str(data.get("id") or "").strip()
+    if not job_id:
+        return False
+    _WEBHOOKS.deliver(job_id, data)
+    return True
+
+
+def pooled_session(*, pool_maxsize: int = 32) -> requests.Session:
+    """Keep-alive session: connections (and their TLS handshakes) are reused across calls.
+
+    Idempotent requests are retried a few times on connection errors and 502/503/504; the last
+    response is still returned, so callers see the same errors as before. Responses may come back
+    brotli/zstd-compressed when the matching decoder is installed, not just gzip/deflate.
+    """
+    session = requests.Session()
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504), raise_on_status=False),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@dataclass
+class _JobWatch:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: dict[str, Any] | None = None
+
+
 @dataclass(frozen=True)
 class RunPodClient:
     api_key: str
@@ -39,10 +165,37 @@ class RunPodClient:
     skip_verify: bool = False
     timeout_s: float = 60.0
     poll_interval_s: float = 2.0
+    # Long-poll window for job status: RunPod holds the status request open for up to this long
+    # while the job is still running, so completion is seen as it happens. 0 disables it.
+    status_wait_s: float = 30.0
+    # Plain status() calls within this many seconds of the last fetch for the same job reuse that
+    # response instead of issuing another GET. 0 disables it; wait() always fetches.
+    status_ttl_s: float = 0.5
+    # When set, submitted jobs ask RunPod to POST their final result here (see
+    # webhook_callback_url) and wait() blocks on that delivery, falling back to one plain status
+    # poll every webhook_poll_s in case the callback never arrives.
+    webhook_url: str | None = None
+    webhook_poll_s: float = 60.0
     # Optional best-effort hook fired with (endpoint_id, job_data) when a job
     # reaches COMPLETED; used to record stage durations for queue-ETA. Never
-    # allowed to affect the job result (errors are swallowed).
+    # allowed to affect the job result (errors are swallowed), and run on a
+    # shared background pool so its I/O does not delay wait() returning.
     on_job_complete: Callable[[str, dict[str, Any]], None] | None = None
+    _session: requests.Session = field(default_factory=pooled_session, init=False, repr=False, compare=False)
+    _status_cache: dict[tuple[str, str], tuple[float, dict[str, Any]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _status_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    _watches: dict[tuple[str, str], _JobWatch] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Resolved once here rather than on every request (the verify check reads RUNPOD_INSECURE).
+    _verify: bool | str = field(init=False, repr=False, compare=False)
+    _auth_headers: dict[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "_verify", requests_verify_arg(ca_bundle=self.ca_bundle, skip_verify=self.skip_verify)
+        )
+        object.__setattr__(self, "_auth_headers", {"Authorization": f"Bearer {self.api_key}"})
 
     def _raise_for_status(self, response: requests.Response) -> None:
         try:
@@ -53,9 +206,6 @@ class RunPodClient:
                 raise RuntimeError(message) from exc
             raise
 
-    def _headers(self) -> dict[str, str]:
-        return {"Authorization": f"Bearer {self.api_key}"}
-
     def _rest(
         self,
         method: str,
@@ -65,14 +215,14 @@ class RunPodClient:
         json_body: dict[str, Any] | None = None,
     ) -> Any:
         url = f"{_RUNPOD_REST_API_BASE}{path}"
-        response = requests.request(
+        response = self._session.request(
             method=method.upper(),
             url=url,
-            headers=self._headers(),
+            headers=self._auth_headers,
             params=params,
             json=json_body,
             timeout=self.timeout_s,
-            verify=requests_verify_arg(ca_bundle=self.ca_bundle, skip_verify=self.skip_verify),
+            verify=self._verify,
         )
         self._raise_for_status(response)
         if not response.content:
@@ -81,12 +231,15 @@ class RunPodClient:
 
     def run(self, endpoint_id: str, input_payload: dict[str, Any]) -> str:
         url = f"{_RUNPOD_JOB_API_BASE}/{endpoint_id}/run"
-        r = requests.post(
+        body: dict[str, Any] = {"input": input_payload}
+        if self.webhook_url:
+            body["webhook"] = self.webhook_url
+        r = self._session.post(
             url,
-            headers=self._headers(),
-            json={"input": input_payload},
+            headers=self._auth_headers,
+            json=body,
             timeout=self.timeout_s,
-            verify=requests_verify_arg(ca_bundle=self.ca_bundle, skip_verify=self.skip_verify),
+            verify=self._verify,
         )
         self._raise_for_status(r)
         data = r.json()
@@ -95,27 +248,63 @@ class RunPodClient:
             raise RuntimeError(f"RunPod response missing job id: {data}")
         return str(job_id)
 
-    def status(self, endpoint_id: str, job_id: str) -> dict[str, Any]:
+    def status(self, endpoint_id: str, job_id: str, *, wait_s: float = 0.0) -> dict[str, Any]:
+        if wait_s <= 0 and self.status_ttl_s > 0:
+            with self._status_lock:
+                cached = self._status_cache.get((endpoint_id, job_id))
+            if cached is not None and time.monotonic() - cached[0] < self.status_ttl_s:
+                return dict(cached[1])
+        return self._fetch_status(endpoint_id, job_id, wait_s=wait_s)
+
+    def _fetch_status(
+        self, endpoint_id: str, job_id: str, *, wait_s: float = 0.0, peek: bool = False
+    ) -> dict[str, Any]:
+        # peek=True (wait() only): a large body for a job that is still running comes back as just
+        # {"id", "status"}, skipping the JSON parse of partial output nobody reads before the end.
         url = f"{_RUNPOD_JOB_API_BASE}/{endpoint_id}/status/{job_id}"
-        r = requests.get(
+        wait_ms = int(max(0.0, wait_s) * 1000)
+        r = self._session.get(
             url,
-            headers=self._headers(),
-            timeout=self.timeout_s,
-            verify=requests_verify_arg(ca_bundle=self.ca_bundle, skip_verify=self.skip_verify),
+            headers=self._auth_headers,
+            params={"wait": wait_ms} if wait_ms else None,
+            timeout=self.timeout_s + wait_ms / 1000,
+            verify=self._verify,
         )
         self._raise_for_status(r)
+        if peek:
+            pending = _peek_pending_status(r.content)
+            if pending is not None:
+                return {"id": job_id, "status": pending}
         data = r.json()
         if not isinstance(data, dict):
             raise RuntimeError(f"Unexpected RunPod status response: {data!r}")
+        self._remember_status(endpoint_id, job_id, data)
         return data
 
+    def _remember_status(self, endpoint_id: str, job_id: str, data: dict[str, Any]) -> None:
+        # Stamped once the response is in, so a slow request does not arrive already expired.
+        # Terminal responses are dropped rather than cached: they carry the (often large) job
+        # output and the next caller should see completion from the API itself.
+        now = time.monotonic()
+        key = (endpoint_id, job_id)
+        with self._status_lock:
+            if _is_terminal(data):
+                self._status_cache.pop(key, None)
+                return
+            if self.status_ttl_s <= 0:
+                return
+            stale = [k for k, (at, _) in self._status_cache.items() if now - at >= self.status_ttl_s]
+            for k in stale:
+                del self._status_cache[k]
+            self._status_cache[key] = (now, dict(data))
+
     def cancel(self, endpoint_id: str, job_id: str) -> dict[str, Any]:
         url = f"{_RUNPOD_JOB_API_BASE}/{endpoint_id}/cancel/{job_id}"
-        r = requests.post(
+        r = self._session.post(
             url,
-            headers=self._headers(),
+            headers=self._auth_headers,
             timeout=self.timeout_s,
-            verify=requests_verify_arg(ca_bundle=self.ca_bundle, skip_verify=self.skip_verify),
+            verify=self._verify,
         )
         self._raise_for_status(r)
         data = r.json()
@@ -125,11 +314,11 @@ class RunPodClient:
 
     def health(self, endpoint_id: str) -> dict[str, Any]:
         url = f"{_RUNPOD_JOB_API_BASE}/{endpoint_id}/health"
-        r = requests.get(
+        r = self._session.get(
             url,
-            headers=self._headers(),
+            headers=self._auth_headers,
             timeout=self.timeout_s,
-            verify=requests_verify_arg(ca_bundle=self.ca_bundle, skip_verify=self.skip_verify),
+            verify=self._verify,
         )
         self._raise_for_status(r)
         data = r.json()
@@ -138,11 +327,38 @@ class RunPodClient:
         return data
 
     def wait(self, endpoint_id: str, job_id: str) -> dict[str, Any]:
+        # Concurrent waits on one job share a single poller: the first caller polls, later ones
+        # block until it finishes and get a copy of its result (or take over if it failed).
+        key = (endpoint_id, job_id)
+        with self._status_lock:
+            watch = self._watches.get(key)
+            leader = watch is None
+            if leader:
+                watch = self._watches[key] = _JobWatch()
+        if not leader:
+            watch.done.wait()
+            if watch.result is None:
+                return self.wait(endpoint_id, job_id)
+            return dict(watch.result)
+        try:
+            watch.result = self._poll_until_done(endpoint_id, job_id)
+            return watch.result
+        finally:
+            with self._status_lock:
+                self._watches.pop(key, None)
+            watch.done.set()
+
+    def _poll_until_done(self, endpoint_id: str, job_id: str) -> dict[str, Any]:
         start = time.monotonic()
         transient_failures = 0
+        idle_polls = 0
+        # With a webhook the completion is pushed, so fallback polls do not hold a request open:
+        # that would only delay noticing the delivery.
+        poll_wait_s = 0.0 if self.webhook_url else self.status_wait_s
         while True:
+            polled_at = time.monotonic()
             try:
-                data = self.status(endpoint_id, job_id)
+                data = self._fetch_status(endpoint_id, job_id, wait_s=poll_wait_s, peek=True)
                 transient_failures = 0
             except requests.HTTPError as exc:
                 status_code = exc.response.status_code if exc.response is not None else None
@@ -157,18 +373,29 @@ class RunPodClient:
                 delay = min(self.poll_interval_s * (2**min(transient_failures, 6)), 60.0)
                 time.sleep(delay)
                 continue
-            status = data.get("status") or data.get("state")
-            if status in {"COMPLETED", "COMPLETED_WITH_ERRORS", "FAILED", "CANCELLED", "TIMED_OUT"}:
-                if status == "COMPLETED" and self.on_job_complete is not None:
-                    try:
-                        self.on_job_complete(endpoint_id, data)
-                    except Exception:
-                        pass
+            if self.webhook_url and not _is_terminal(data):
+                pushed = _WEBHOOKS.take(job_id, timeout=self.webhook_poll_s)
+                if pushed is not None and _is_terminal(pushed):
+                    data = pushed
+                    self._remember_status(endpoint_id, job_id, data)
+            if _is_terminal(data):
+                if self.webhook_url:
+                    _WEBHOOKS.take(job_id, timeout=0.0)
+                if (data.get("status") or data.get("state")) == "COMPLETED" and self.on_job_complete is not None:
+                    _CALLBACK_POOL.submit(_call_quietly, self.on_job_complete, endpoint_id, dict(data))
                 return data
-            elapsed = time.monotonic() - start
-            if elapsed > 60 * 60 * 6:
+            now = time.monotonic()
+            if now - start > 60 * 60 * 6:
                 raise TimeoutError(f"RunPod job timeout (>6h): endpoint={endpoint_id} job_id={job_id}")
-            time.sleep(self.poll_interval_s)
+            if self.webhook_url:
+                continue
+            # Back off 0.5s, 1s, 2s, ... up to poll_interval_s between polls, counting the time the
+            # server already held the request: after a full long-poll window there is no extra sleep.
+            delay = min(self.poll_interval_s, 0.5 * (2**min(idle_polls, 6)))
+            idle_polls += 1
+            remaining = delay - (now - polled_at)
+            if remaining > 0:
+                time.sleep(remaining)
 
     def run_and_wait(self, endpoint_id: str, input_payload: dict[str, Any]) -> dict[str, Any]:
         return self.run_and_wait_with_job_id(endpoint_id, input_payload)[1]
@@ -186,6 +413,36 @@ class RunPodClient:
         data = self.wait(endpoint_id, job_id)
         return job_id, data
 
+    def run_and_wait_many(
+        self,
+        endpoint_id: str,
+        input_payloads: list[dict[str, Any]],
+        *,
+        on_job_id: Callable[[int, str], None] | None = None,
+        max_concurrency: int = 8,
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """Submit every payload before waiting on any, so the endpoint's workers run them side by side.
+
+        ``on_job_id`` gets ``(payload_index, job_id)`` in input order; results follow input order too.
+        """
+        if not input_payloads:
+            return []
+        workers = max(1, min(int(max_concurrency), len(input_payloads)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self.run, endpoint_id, payload) for payload in input_payloads]
+            try:
+                job_ids: list[str] = []
+                for index, future in enumerate(futures):
+                    job_ids.append(future.result())
+                    if on_job_id is not None:
+                        on_job_id(index, job_ids[-1])
+                futures = [executor.submit(self.wait, endpoint_id, job_id) for job_id in job_ids]
+                return [(job_id, future.result()) for job_id, future in zip(job_ids, futures, strict=True)]
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
     def list_endpoints(self, *, include_workers: bool = False, include_template: bool = True) -> Any:
         params = {
             "includeWorkers": "true" if include_workers else "false",
@@ -1,23 +1,51 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from dataclasses import field
 from typing import Any
 
 import requests
 
 from ..models import SequenceRecord
+from .runpod import pooled_session
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SoluProtClient:
     url: str
     timeout_s: float = 60.0
+    batch_size: int = 32
+    concurrency: int = 4
+    _session: requests.Session = field(default_factory=pooled_session, init=False, repr=False, compare=False)
 
     def score(self, sequences: list[SequenceRecord]) -> dict[str, float]:
+        # Large sample sets go out as fixed-size batches, several in flight at once, so one slow
+        # request does not hold up the rest; batches are merged back in input order.
+        size = max(1, int(self.batch_size))
+        batches = [sequences[i : i + size] for i in range(0, len(sequences), size)]
+        workers = max(1, min(int(self.concurrency), len(batches)))
+        if workers <= 1:
+            results = [self._score_batch(batch) for batch in batches or [sequences]]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(self._score_batch, batch) for batch in batches]
+                try:
+                    results = [future.result() for future in futures]
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        out: dict[str, float] = {}
+        for result in results:
+            out.update(result)
+        return out
+
+    def _score_batch(self, sequences: list[SequenceRecord]) -> dict[str, float]:
         payload = {
             "sequences": [{"id": s.id, "sequence": s.sequence} for s in sequences],
         }
-        r = requests.post(self.url, json=payload, timeout=self.timeout_s)
+        r = self._session.post(self.url, json=payload, timeout=self.timeout_s)
         r.raise_for_status()
         data = r.json()
         results = data.get("results")
@@ -32,4 +60,3 @@ class SoluProtClient:
             if sid and isinstance(score, (int, float)):
                 out[sid] = float(score)
         return out
-
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 import os
 
 
@@ -17,6 +18,8 @@ class RunPodConfig:
     relax_endpoint_id: str | None
     ca_bundle: str | None
     skip_verify: bool
+    webhook_url: str | None = None
+    webhook_secret: str | None = None
 
 
 @dataclass(frozen=True)
@@ -72,7 +75,10 @@ def _proteinmpnn_provider() -> str:
     return value
 
 
+@lru_cache(maxsize=1)
 def load_config() -> AppConfig:
+    # Read once per process: per-user runners are rebuilt on every authenticated request, and they
+    # should all see the same configuration. Call load_config.cache_clear() after changing the env.
     api_key = os.environ.get("RUNPOD_API_KEY", "").strip()
     if not api_key:
         raise RuntimeError("RUNPOD_API_KEY is required")
@@ -112,6 +118,10 @@ def load_config() -> AppConfig:
 
     ca_bundle = os.environ.get("RUNPOD_CA_BUNDLE", "").strip() or None
     skip_verify = _env_true("RUNPOD_SKIP_VERIFY") or _env_true("RUNPOD_INSECURE")
+    webhook_url = os.environ.get("RUNPOD_WEBHOOK_URL", "").strip() or None
+    webhook_secret = os.environ.get("RUNPOD_WEBHOOK_SECRET", "").strip() or None
+    if webhook_url and not webhook_secret:
+        raise RuntimeError("RUNPOD_WEBHOOK_SECRET is required when RUNPOD_WEBHOOK_URL is set")
 
     soluprot_url = os.environ.get("SOLUPROT_URL", "").strip() or None
     af2_url = os.environ.get("AF2_URL", "").strip() or None
@@ -141,6 +151,8 @@ def load_config() -> AppConfig:
             relax_endpoint_id=relax_endpoint_id,
             ca_bundle=ca_bundle,
             skip_verify=bool(skip_verify),
+            webhook_url=webhook_url,
+            webhook_secret=webhook_secret,
         ),
         proteinmpnn=ProteinMPNNConfig(
             provider=proteinmpnn_provider,
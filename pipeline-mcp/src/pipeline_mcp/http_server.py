@@ -1,18 +1,25 @@
 from __future__ import annotations
 
 import argparse
+import gzip
+import hmac
 import io
 import json
 import os
+import re
 import shutil
+from functools import lru_cache
+from http import HTTPStatus
 from http.cookies import SimpleCookie
 from http.server import BaseHTTPRequestHandler
 from http.server import ThreadingHTTPServer
 from pathlib import Path
 from typing import Any
+from urllib.parse import parse_qs
 from urllib.parse import quote
 from urllib.parse import unquote
 from urllib.parse import urlencode
+from urllib.parse import urlsplit
 import zipfile
 
 from .storage import new_run_id
@@ -20,6 +27,11 @@ from .storage import resolve_run_path
 from .auth import AuthError
 from .auth import load_auth_manager
 from .auth import safe_run_prefix
+from .clients.runpod import deliver_webhook
+from .clients.runpod import receive_webhooks
+from .config import load_config
+from .jsonio import dump_json
+from .jsonio import load_json
 from .oidc import claims_from_oidc_token_data
 from .oidc import claims_to_user
 from .oidc import account_console_url
@@ -34,13 +46,45 @@ from .pat_store import looks_like_pat
 from .tools import ToolDispatcher
 
 
+_HEALTHZ_BYTES = dump_json({"ok": True})
+
 _DISPATCHER: ToolDispatcher | None = None
+# Encoded /tools/list bodies by (full list, hide admin tools), each with the dispatcher it came
+# from; the tool definitions are fixed for a dispatcher's lifetime.
+_TOOLS_LIST_BYTES: dict[tuple[bool, bool], tuple[ToolDispatcher, bytes]] = {}
 _AUTH = None
 _OIDC = None
 _SESSIONS = None
 _PAT_KEYS = None
 _ALLOW_ALL_ORIGINS = True
 _ALLOWED_ORIGINS: set[str] = set()
+# How long browsers (and caches in front of us) may reuse a preflight answer; browsers cap it
+# themselves (Firefox at a day, Chromium at two hours).
+_CORS_MAX_AGE_S = 86400
+
+
+def _cors_static_header_bytes(max_age_s: int) -> bytes:
+    # The origin-independent CORS headers, encoded once instead of formatted by send_header per response.
+    return (
+        b"Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
+        b"Access-Control-Allow-Headers: Content-Type, Authorization\r\n"
+        b"Access-Control-Max-Age: %d\r\n" % max_age_s
+    )
+
+
+_CORS_STATIC_HEADER_BYTES = _cors_static_header_bytes(_CORS_MAX_AGE_S)
+# Query parameters whose values are credentials (the RunPod webhook secret, OAuth codes) and must
+# not reach the request log.
+_SECRET_QUERY_RE = re.compile(r"(?i)([?&](?:token|access_token|code)=)[^&\s]*")
+# Chunk-size line: hex digits, optional `;ext` / whitespace. Stricter than int(..., 16), which
+# would also take "0x10", "1_0" or a sign — forms a front proxy may frame differently.
+_CHUNK_SIZE_RE = re.compile(rb"[ \t]*([0-9A-Fa-f]{1,16})[ \t]*(?:;|\r?\n|$)")
+# JSON bodies above this size are gzipped for clients that accept it; level 1 keeps the CPU cost
+# well below the transfer time it saves on artifact listings and tool schemas.
+_GZIP_MIN_BYTES = 4096
+_GZIP_LEVEL = 1
+# Bodies up to this size are sent in the same write as the response headers.
+_COALESCE_BODY_MAX_BYTES = 64 * 1024
 _ADMIN_ONLY_TOOLS = {
     "pipeline.cath_get_batch_overview",
     "pipeline.cath_launch_batch",
@@ -122,6 +166,35 @@ _RUN_SCOPED_TOOLS = {
 }
 
 
+def _redact_query(text: str) -> str:
+    return _SECRET_QUERY_RE.sub(r"\1<redacted>", text)
+
+
+@lru_cache(maxsize=1024)
+def _run_prefix_for(username: str) -> str:
+    return safe_run_prefix(username)
+
+
+def _accepts_gzip(accept_encoding: str | None) -> bool:
+    for item in (accept_encoding or "").lower().split(","):
+        coding, _, params = item.partition(";")
+        if coding.strip() != "gzip":
+            continue
+        try:
+            return float(params.strip().removeprefix("q=") or 1) > 0
+        except ValueError:
+            return False
+    return False
+
+
+def _str_field(body: dict[str, Any], key: str, default: str = "") -> str:
+    # Same result as `str(body.get(key) or default)`, minus the str() call for the usual string value.
+    value = body.get(key)
+    if isinstance(value, str):
+        return value or default
+    return str(value) if value else default
+
+
 def _env_true(name: str) -> bool:
     return str(os.environ.get(name, "")).strip().lower() in {"1", "true", "yes", "on"}
 
@@ -136,6 +209,12 @@ def _init_cors() -> None:
     else:
         _ALLOW_ALL_ORIGINS = False
         _ALLOWED_ORIGINS = set(parts)
+    global _CORS_MAX_AGE_S, _CORS_STATIC_HEADER_BYTES
+    try:
+        _CORS_MAX_AGE_S = max(0, int(os.environ.get("PIPELINE_CORS_MAX_AGE", "86400").strip() or "86400"))
+    except ValueError:
+        _CORS_MAX_AGE_S = 86400
+    _CORS_STATIC_HEADER_BYTES = _cors_static_header_bytes(_CORS_MAX_AGE_S)
 
 
 class Handler(BaseHTTPRequestHandler):
@@ -151,6 +230,14 @@ class Handler(BaseHTTPRequestHandler):
     timeout = 65
     _MAX_BODY_BYTES = 50 * 1024 * 1024
     _MAX_CHUNK_LINE_BYTES = 1024
+    _CHUNK_READ_BYTES = 64 * 1024
+    _MAX_DRAIN_BYTES = 64 * 1024
+
+    def log_request(self, code: int | str = "-", size: int | str = "-") -> None:
+        # Same line BaseHTTPRequestHandler writes, minus secrets carried in the query string.
+        if isinstance(code, HTTPStatus):
+            code = code.value
+        self.log_message('"%s" %s %s', _redact_query(self.requestline), str(code), str(size))
 
     @property
     def dispatcher(self) -> ToolDispatcher:
@@ -180,18 +267,21 @@ class Handler(BaseHTTPRequestHandler):
             return True
         return self.oidc is not None
 
-    def _set_cors_headers(self) -> None:
+    def _set_cors_headers(self, *, vary_origin: bool = True) -> None:
         origin = self.headers.get("Origin")
         allow_origin = bool(origin and (_ALLOW_ALL_ORIGINS or origin in _ALLOWED_ORIGINS))
         if allow_origin:
             self.send_header("Access-Control-Allow-Origin", str(origin))
-            self.send_header("Vary", "Origin")
+            if vary_origin:
+                self.send_header("Vary", "Origin")
             self.send_header("Access-Control-Allow-Credentials", "true")
         elif _ALLOW_ALL_ORIGINS:
             self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type, Authorization")
-        self.send_header("Access-Control-Max-Age", "600")
+        # send_header only appends encoded lines to this buffer (absent for HTTP/0.9 requests, which
+        # get no headers at all); end_headers flushes it in one write.
+        buffer = getattr(self, "_headers_buffer", None)
+        if buffer is not None:
+            buffer.append(_CORS_STATIC_HEADER_BYTES)
 
     def _json(
         self,
@@ -200,15 +290,30 @@ class Handler(BaseHTTPRequestHandler):
         *,
         extra_headers: list[tuple[str, str]] | None = None,
     ) -> None:
-        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._json_bytes(code, dump_json(payload), extra_headers=extra_headers)
+
+    def _json_bytes(
+        self,
+        code: int,
+        data: bytes,
+        *,
+        extra_headers: list[tuple[str, str]] | None = None,
+    ) -> None:
+        varies = len(data) > _GZIP_MIN_BYTES
+        compressed = varies and _accepts_gzip(self.headers.get("Accept-Encoding"))
+        if compressed:
+            data = gzip.compress(data, compresslevel=_GZIP_LEVEL, mtime=0)
         self.send_response(code)
         self._set_cors_headers()
         self.send_header("Content-Type", "application/json; charset=utf-8")
+        if varies:
+            self.send_header("Vary", "Accept-Encoding")
+        if compressed:
+            self.send_header("Content-Encoding", "gzip")
         self.send_header("Content-Length", str(len(data)))
         for key, value in extra_headers or []:
             self.send_header(key, value)
-        self.end_headers()
-        self.wfile.write(data)
+        self._end_headers_with_body(data)
 
     def _binary(
         self,
@@ -224,8 +329,21 @@ class Handler(BaseHTTPRequestHandler):
         self.send_header("Content-Length", str(len(data)))
         for key, value in extra_headers or []:
             self.send_header(key, value)
-        self.end_headers()
-        self.wfile.write(data)
+        self._end_headers_with_body(data)
+
+    def _end_headers_with_body(self, data: bytes) -> None:
+        # A separate small body write after the header flush can sit behind Nagle until the
+        # client's delayed ACK (up to ~40 ms), so small bodies join the header buffer and the whole
+        # response leaves in one write. Larger ones go to the socket as is: sendall() sends straight
+        # from the bytes object, so slicing or wrapping it in a memoryview would gain nothing.
+        buffer = getattr(self, "_headers_buffer", None)
+        if buffer is None or len(data) > _COALESCE_BODY_MAX_BYTES:
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        buffer.append(b"\r\n")
+        buffer.append(data)
+        self.flush_headers()
 
     def _file_download(
         self,
@@ -247,46 +365,60 @@ class Handler(BaseHTTPRequestHandler):
         with path.open("rb") as source:
             shutil.copyfileobj(source, self.wfile, length=1024 * 1024)
 
-    def _read_chunked(self) -> bytes:
+    def _read_chunked(self) -> bytearray:
+        # Bound once: a large upload can arrive as thousands of frames.
+        readline = self.rfile.readline
+        readinto = self.rfile.readinto
+        max_line = self._MAX_CHUNK_LINE_BYTES
+        max_body = self._MAX_BODY_BYTES
         body = bytearray()
+        # Chunk data passes through one small reused buffer, so a huge chunk never needs a second
+        # allocation of its own size next to the body.
+        scratch = memoryview(bytearray(self._CHUNK_READ_BYTES))
         while True:
-            line = self.rfile.readline(self._MAX_CHUNK_LINE_BYTES + 2)
+            line = readline(max_line + 2)
             if not line:
                 raise ValueError("Unexpected EOF while reading chunked request body")
-            if len(line) > self._MAX_CHUNK_LINE_BYTES + 1 and not line.endswith(b"\n"):
+            if len(line) > max_line + 1 and not line.endswith(b"\n"):
                 raise ValueError("Chunk size line too long")
 
-            size_token = line.strip().split(b";", 1)[0].strip()
-            try:
-                chunk_size = int(size_token, 16)
-            except ValueError as exc:
-                raise ValueError("Invalid chunk size") from exc
+            match = _CHUNK_SIZE_RE.match(line)
+            if match is None:
+                raise ValueError("Invalid chunk size")
+            chunk_size = int(match.group(1), 16)
 
             if chunk_size == 0:
                 while True:
-                    trailer = self.rfile.readline(self._MAX_CHUNK_LINE_BYTES + 2)
+                    trailer = readline(max_line + 2)
                     if not trailer or trailer in (b"\r\n", b"\n"):
                         break
                 break
 
-            if len(body) + chunk_size > self._MAX_BODY_BYTES:
+            if len(body) + chunk_size > max_body:
                 raise ValueError("Request body too large")
 
-            chunk = self.rfile.read(chunk_size)
-            if len(chunk) != chunk_size:
-                raise ValueError("Unexpected EOF while reading chunk data")
-            body.extend(chunk)
+            remaining = chunk_size
+            while remaining:
+                count = readinto(scratch[: min(remaining, len(scratch))])
+                if not count:
+                    raise ValueError("Unexpected EOF while reading chunk data")
+                body += scratch[:count]
+                remaining -= count
 
-            terminator = self.rfile.readline(2)
+            terminator = readline(2)
             if terminator not in (b"\r\n", b"\n"):
                 raise ValueError("Invalid chunk terminator")
 
-        return bytes(body)
+        # Handed over as is: copying into bytes would briefly hold the whole body twice.
+        return body
 
-    def _read_body(self) -> bytes:
-        transfer_encoding = str(self.headers.get("Transfer-Encoding") or "").lower()
-        if "chunked" in transfer_encoding:
-            return self._read_chunked()
+    def _read_body(self) -> bytes | bytearray:
+        # Substring test, not equality: a coding list such as "gzip, chunked" still ends in chunked.
+        transfer_encoding = self.headers.get("Transfer-Encoding")
+        if transfer_encoding and "chunked" in transfer_encoding.lower():
+            body = self._read_chunked()
+            self._body_unread = False
+            return body
 
         length_raw = self.headers.get("Content-Length")
         if not length_raw:
@@ -299,11 +431,33 @@ class Handler(BaseHTTPRequestHandler):
             raise ValueError("Invalid Content-Length header")
         if length > self._MAX_BODY_BYTES:
             raise ValueError("Request body too large")
-        return self.rfile.read(length) if length else b""
+        # BufferedReader.read(n) allocates the result once and reads the socket straight into it.
+        data = self.rfile.read(length) if length else b""
+        self._body_unread = False
+        return data
+
+    def _discard_unread_body(self) -> None:
+        # On a keep-alive connection, body bytes a handler never read (a 401 sent before reading,
+        # say, or a read that failed half-way) would be parsed as the next request. A small
+        # Content-Length body is drained; anything else closes the connection after the response.
+        if not getattr(self, "_body_unread", False):
+            return
+        self._body_unread = False
+        length_raw = self.headers.get("Content-Length")
+        if not length_raw and not self.headers.get("Transfer-Encoding"):
+            return
+        try:
+            length = -1 if self.headers.get("Transfer-Encoding") else int(length_raw)
+        except ValueError:
+            length = -1
+        if 0 <= length <= self._MAX_DRAIN_BYTES:
+            self.rfile.read(length)
+        else:
+            self.close_connection = True
 
     def _read_json(self) -> dict[str, Any]:
         raw = self._read_body() or b"{}"
-        data = json.loads(raw.decode("utf-8", errors="replace"))
+        data = load_json(raw)
         if not isinstance(data, dict):
             raise ValueError("JSON body must be an object")
         return data
@@ -418,9 +572,7 @@ class Handler(BaseHTTPRequestHandler):
 
     def _require_user(self) -> dict[str, Any] | None:
         header = self.headers.get("Authorization") or ""
-        token = ""
-        if header.startswith("Bearer "):
-            token = header.removeprefix("Bearer ").strip()
+        token = header[7:].strip() if header.startswith("Bearer ") else ""
         if token:
             pat_store = self.pat_keys
             if pat_store is not None and looks_like_pat(token):
@@ -480,11 +632,16 @@ class Handler(BaseHTTPRequestHandler):
             return "user"
         raise AuthError("scope must be one of: global, user")
 
+    def _run_prefix(self, user: dict[str, Any] | None) -> str:
+        # Derived from the username on every call rather than stored on the user dict, which may be
+        # shared (token cache, sessions) and is echoed back by /auth/me; the sanitising is memoised.
+        return _run_prefix_for(str((user or {}).get("username") or "user"))
+
     def _user_context(self, user: dict[str, Any] | None) -> dict[str, str]:
         return {
             "username": str((user or {}).get("username") or ""),
             "role": str((user or {}).get("role") or ""),
-            "run_prefix": safe_run_prefix(str((user or {}).get("username") or "user")),
+            "run_prefix": self._run_prefix(user),
         }
 
     def _dispatcher_for_tool(self, user: dict[str, Any] | None, name: str) -> ToolDispatcher:
@@ -521,7 +678,7 @@ class Handler(BaseHTTPRequestHandler):
     def _enforce_run_access(self, user: dict[str, Any] | None, run_id: str) -> None:
         if user is None or self._is_admin(user):
             return
-        prefix = safe_run_prefix(str(user.get("username") or "user")) + "_"
+        prefix = self._run_prefix(user) + "_"
         if not str(run_id or "").startswith(prefix):
             raise AuthError("run_id not allowed for this user")
 
@@ -529,7 +686,7 @@ class Handler(BaseHTTPRequestHandler):
         raw = str(run_id or "").strip()
         if not raw or user is None or self._is_admin(user):
             return raw
-        prefix = safe_run_prefix(str(user.get("username") or "user"))
+        prefix = self._run_prefix(user)
         if raw.startswith(f"{prefix}_"):
             return raw
         normalized = safe_run_prefix(raw)
@@ -539,18 +696,21 @@ class Handler(BaseHTTPRequestHandler):
             return normalized
         return f"{prefix}_{normalized}"
 
+    def _tool_list_view(self, user: dict[str, Any] | None) -> tuple[bool, bool]:
+        # (advertise everything, hide admin-only tools): all that varies between callers' lists.
+        return _env_true("PIPELINE_MCP_FULL_TOOL_LIST"), user is not None and not self._is_admin(user)
+
     def _list_tools_for_user(self, user: dict[str, Any] | None) -> dict[str, Any]:
         tools = self.dispatcher.list_tools()
         entries = tools.get("tools") if isinstance(tools, dict) else None
         if not isinstance(entries, list):
             return tools
-        full_list = _env_true("PIPELINE_MCP_FULL_TOOL_LIST")
-        is_admin = self._is_admin(user)
+        full_list, hide_admin = self._tool_list_view(user)
 
         def _visible(name: str) -> bool:
             if not full_list and name in _MCP_LIST_HIDDEN_TOOLS:
                 return False
-            if user is not None and not is_admin and name in _ADMIN_ONLY_TOOLS:
+            if hide_admin and name in _ADMIN_ONLY_TOOLS:
                 return False
             return True
 
@@ -581,7 +741,7 @@ class Handler(BaseHTTPRequestHandler):
             if run_id:
                 self._enforce_run_access(user, run_id)
         if name in {"pipeline.run", "pipeline.run_from_prompt"} and user is not None and not self._is_admin(user):
-            prefix = safe_run_prefix(str(user.get("username") or "user"))
+            prefix = self._run_prefix(user)
             run_id = arguments.get("run_id")
             if run_id:
                 normalized_run_id = self._normalize_scoped_run_id(user, str(run_id))
@@ -615,7 +775,7 @@ class Handler(BaseHTTPRequestHandler):
             arguments.setdefault("user", self._user_context(user))
         out = self._dispatcher_for_tool(user, name).call_tool(name, arguments)
         if name == "pipeline.list_runs" and user is not None and not self._is_admin(user):
-            prefix = safe_run_prefix(str(user.get("username") or "user")) + "_"
+            prefix = self._run_prefix(user) + "_"
             runs = out.get("runs") if isinstance(out, dict) else None
             if isinstance(runs, list):
                 out["runs"] = [r for r in runs if str(r).startswith(prefix)]
@@ -775,7 +935,7 @@ class Handler(BaseHTTPRequestHandler):
             self._json(503, {"ok": False, "error": "API keys unavailable"})
             return
         body = self._read_json()
-        label = str(body.get("label") or "")
+        label = _str_field(body, "label")
         raw_ttl = body.get("ttl_days")
         try:
             ttl_days = (
@@ -792,7 +952,7 @@ class Handler(BaseHTTPRequestHandler):
             return
         store = self.pat_keys
         body = self._read_json()
-        key_id = str(body.get("id") or "")
+        key_id = _str_field(body, "id")
         ok = store.revoke(str(user.get("username") or ""), key_id) if store is not None else False
         self._json(200 if ok else 404, {"ok": ok})
 
@@ -975,239 +1135,270 @@ class Handler(BaseHTTPRequestHandler):
 
     def do_OPTIONS(self) -> None:  # noqa: N802
         self.send_response(204)
-        self._set_cors_headers()
+        self._set_cors_headers(vary_origin=False)
+        self.send_header("Cache-Control", f"public, max-age={_CORS_MAX_AGE_S}")
+        # Publicly cacheable, so the key must include Origin even when this one was not allowed:
+        # otherwise a cache could replay a refused preflight to an allowed origin, or vice versa.
+        self.send_header("Vary", "Origin, Access-Control-Request-Headers")
         self.end_headers()
 
-    def do_GET(self) -> None:  # noqa: N802
-        route_path = self._route_path()
-        if route_path == "/auth/oidc/config":
-            if self.oidc is None:
-                self._json(200, {"ok": True, "enabled": False})
-                return
-            try:
-                discovery = get_oidc_discovery(self.oidc)
-                authorization_endpoint = str(discovery.get("authorization_endpoint") or "")
-            except Exception:
-                authorization_endpoint = ""
-            self._json(
-                200,
-                {
-                    "ok": True,
-                    "enabled": True,
-                    "issuer": self.oidc.issuer,
-                    "client_id": self.oidc.client_id,
-                    "scopes": self.oidc.scopes,
-                    "provider_name": self.oidc.provider_name,
-                    "authorization_endpoint": authorization_endpoint,
-                    "end_session_endpoint": str(discovery.get("end_session_endpoint") or ""),
-                    "account_url": account_console_url(self.oidc),
-                },
-            )
+    def _runpod_callback(self) -> None:
+        # RunPod does not sign webhook calls, so the shared secret comes back in the URL it was given.
+        secret = load_config().runpod.webhook_secret
+        token = (parse_qs(urlsplit(self.path).query).get("token") or [""])[0]
+        if not secret or not hmac.compare_digest(token.encode("utf-8"), secret.encode("utf-8")):
+            self._json(403, {"ok": False, "error": "invalid webhook token"})
             return
-        if route_path == "/auth/me":
-            user = self._require_auth()
-            if user is None:
-                return
-            self._json(200, {"ok": True, "user": user, "session": self._public_session_info()})
+        if not deliver_webhook(self._read_json()):
+            raise ValueError("RunPod webhook body is missing the job id")
+        self._json(200, {"ok": True})
+
+    def _send_oidc_config(self) -> None:
+        if self.oidc is None:
+            self._json(200, {"ok": True, "enabled": False})
             return
-        if route_path == "/auth/mcp_token":
-            self._send_mcp_token()
+        try:
+            discovery = get_oidc_discovery(self.oidc)
+            authorization_endpoint = str(discovery.get("authorization_endpoint") or "")
+        except Exception:
+            authorization_endpoint = ""
+        self._json(
+            200,
+            {
+                "ok": True,
+                "enabled": True,
+                "issuer": self.oidc.issuer,
+                "client_id": self.oidc.client_id,
+                "scopes": self.oidc.scopes,
+                "provider_name": self.oidc.provider_name,
+                "authorization_endpoint": authorization_endpoint,
+                "end_session_endpoint": str(discovery.get("end_session_endpoint") or ""),
+                "account_url": account_console_url(self.oidc),
+            },
+        )
+
+    def _send_auth_me(self) -> None:
+        user = self._require_auth()
+        if user is None:
             return
-        if route_path == "/auth/mcp_keys":
-            self._send_mcp_keys_list()
+        self._json(200, {"ok": True, "user": user, "session": self._public_session_info()})
+
+    def _send_health(self) -> None:
+        self._json_bytes(200, _HEALTHZ_BYTES)
+
+    def _post_login(self) -> None:
+        auth = self.auth
+        if auth is None or not getattr(auth, "enabled", False):
+            self._json(400, {"ok": False, "error": "local auth disabled"})
             return
-        if route_path == "/model_provider_skill.zip":
-            self._send_model_registration_skill_archive()
+        body = self._read_json()
+        username = _str_field(body, "username")
+        password = _str_field(body, "password")
+        result = auth.authenticate(username, password)
+        if result is None:
+            self._json(401, {"ok": False, "error": "invalid credentials"})
             return
-        if route_path == "/pipeline_skill.zip":
-            self._send_pipeline_skill_archive()
+        extra_headers = None
+        manager = self.sessions
+        user = result.get("user") if isinstance(result, dict) else None
+        if _env_true("PIPELINE_REQUIRE_ADMIN") and not self._is_admin(user):
+            self._json(403, {"ok": False, "error": "admin required"})
             return
-        if route_path.startswith("/runs/") and "/exports/" in route_path:
-            self._send_run_export_archive()
+        if manager is not None and isinstance(user, dict):
+            session_id = manager.create_local_session(user)
+            extra_headers = self._session_cookie_headers(session_id, max_age=manager.cookie_max_age(session_id))
+        self._json(200, {"ok": True, **result, "session": {"auth_type": "local"}}, extra_headers=extra_headers)
+
+    def _post_oidc_exchange(self) -> None:
+        if self.oidc is None:
+            self._json(400, {"ok": False, "error": "oidc disabled"})
             return
-        if route_path == "/healthz":
-            self._json(200, {"ok": True})
+        body = self._read_json()
+        code = _str_field(body, "code")
+        redirect_uri = _str_field(body, "redirect_uri")
+        code_verifier = _str_field(body, "code_verifier") or None
+        token_data = exchange_oidc_code(
+            self.oidc,
+            code=code,
+            redirect_uri=redirect_uri,
+            code_verifier=code_verifier,
+        )
+        claims = claims_from_oidc_token_data(self.oidc, token_data)
+        user = self._apply_external_user_policy(claims_to_user(claims, client_id=self.oidc.client_id))
+        if not self._user_is_approved(user):
+            self._json(403, {"ok": False, "error": "approval required", "user": user})
             return
-        self._json(404, {"error": "not found"})
-
-    def do_POST(self) -> None:  # noqa: N802
-        try:
-            route_path = self._route_path()
-            if route_path == "/auth/login":
-                auth = self.auth
-                if auth is None or not getattr(auth, "enabled", False):
-                    self._json(400, {"ok": False, "error": "local auth disabled"})
-                    return
-                body = self._read_json()
-                username = str(body.get("username") or "")
-                password = str(body.get("password") or "")
-                result = auth.authenticate(username, password)
-                if result is None:
-                    self._json(401, {"ok": False, "error": "invalid credentials"})
-                    return
-                extra_headers = None
-                manager = self.sessions
-                user = result.get("user") if isinstance(result, dict) else None
-                if _env_true("PIPELINE_REQUIRE_ADMIN") and not self._is_admin(user):
-                    self._json(403, {"ok": False, "error": "admin required"})
-                    return
-                if manager is not None and isinstance(user, dict):
-                    session_id = manager.create_local_session(user)
-                    extra_headers = self._session_cookie_headers(session_id, max_age=manager.cookie_max_age(session_id))
-                self._json(200, {"ok": True, **result, "session": {"auth_type": "local"}}, extra_headers=extra_headers)
-                return
+        if _env_true("PIPELINE_REQUIRE_ADMIN") and not self._is_admin(user):
+            self._json(403, {"ok": False, "error": "admin required"})
+            return
+        extra_headers = None
+        manager = self.sessions
+        if manager is not None:
+            session_id = manager.create_oidc_session(self.oidc, token_data, user=user)
+            extra_headers = self._session_cookie_headers(session_id, max_age=manager.cookie_max_age(session_id))
+        self._json(
+            200,
+            {
+                "ok": True,
+                "user": user,
+                "session": {"auth_type": "oidc"},
+            },
+            extra_headers=extra_headers,
+        )
 
-            if route_path == "/auth/oidc/exchange":
-                if self.oidc is None:
-                    self._json(400, {"ok": False, "error": "oidc disabled"})
-                    return
-                body = self._read_json()
-                code = str(body.get("code") or "")
-                redirect_uri = str(body.get("redirect_uri") or "")
-                code_verifier = str(body.get("code_verifier") or "") or None
-                token_data = exchange_oidc_code(
-                    self.oidc,
-                    code=code,
+    def _post_logout(self) -> None:
+        body = self._read_json()
+        redirect_uri = _str_field(body, "redirect_uri").strip()
+        logout_url = ""
+        manager = self.sessions
+        session_id = self._session_id_from_cookie()
+        if manager is not None and session_id:
+            session = manager.get_session(session_id, oidc_settings=self.oidc)
+            id_token_hint = manager.get_oidc_id_token(session_id)
+            manager.destroy_session(session_id)
+            if isinstance(session, dict) and str(session.get("auth_type") or "") == "oidc":
+                logout_url = self._build_oidc_logout_url(
+                    id_token_hint=id_token_hint,
                     redirect_uri=redirect_uri,
-                    code_verifier=code_verifier,
-                )
-                claims = claims_from_oidc_token_data(self.oidc, token_data)
-                user = self._apply_external_user_policy(claims_to_user(claims, client_id=self.oidc.client_id))
-                if not self._user_is_approved(user):
-                    self._json(403, {"ok": False, "error": "approval required", "user": user})
-                    return
-                if _env_true("PIPELINE_REQUIRE_ADMIN") and not self._is_admin(user):
-                    self._json(403, {"ok": False, "error": "admin required"})
-                    return
-                extra_headers = None
-                manager = self.sessions
-                if manager is not None:
-                    session_id = manager.create_oidc_session(self.oidc, token_data, user=user)
-                    extra_headers = self._session_cookie_headers(session_id, max_age=manager.cookie_max_age(session_id))
-                self._json(
-                    200,
-                    {
-                        "ok": True,
-                        "user": user,
-                        "session": {"auth_type": "oidc"},
-                    },
-                    extra_headers=extra_headers,
                 )
-                return
-
-            if route_path == "/auth/mcp_keys":
-                self._create_mcp_key()
-                return
-            if route_path == "/auth/mcp_keys/revoke":
-                self._revoke_mcp_key()
-                return
+        self._json(
+            200,
+            {"ok": True, "logout_url": logout_url},
+            extra_headers=self._expire_session_cookie_headers(),
+        )
 
-            if route_path == "/auth/logout":
-                body = self._read_json()
-                redirect_uri = str(body.get("redirect_uri") or "").strip()
-                logout_url = ""
-                manager = self.sessions
-                session_id = self._session_id_from_cookie()
-                if manager is not None and session_id:
-                    session = manager.get_session(session_id, oidc_settings=self.oidc)
-                    id_token_hint = manager.get_oidc_id_token(session_id)
-                    manager.destroy_session(session_id)
-                    if isinstance(session, dict) and str(session.get("auth_type") or "") == "oidc":
-                        logout_url = self._build_oidc_logout_url(
-                            id_token_hint=id_token_hint,
-                            redirect_uri=redirect_uri,
-                        )
-                self._json(
-                    200,
-                    {"ok": True, "logout_url": logout_url},
-                    extra_headers=self._expire_session_cookie_headers(),
-                )
-                return
+    def _post_list_users(self) -> None:
+        auth = self.auth
+        if auth is None or not getattr(auth, "enabled", False):
+            self._json(400, {"ok": False, "error": "auth disabled"})
+            return
+        user = self._require_auth()
+        if user is None:
+            return
+        if not self._is_admin(user):
+            self._json(403, {"ok": False, "error": "admin required"})
+            return
+        self._json(200, {"ok": True, "users": auth.list_users()})
 
-            if route_path == "/auth/list_users":
-                auth = self.auth
-                if auth is None or not getattr(auth, "enabled", False):
-                    self._json(400, {"ok": False, "error": "auth disabled"})
-                    return
-                user = self._require_auth()
-                if user is None:
-                    return
-                if not self._is_admin(user):
-                    self._json(403, {"ok": False, "error": "admin required"})
-                    return
-                self._json(200, {"ok": True, "users": auth.list_users()})
-                return
+    def _post_update_user(self) -> None:
+        auth = self.auth
+        if auth is None or not getattr(auth, "enabled", False):
+            self._json(400, {"ok": False, "error": "auth disabled"})
+            return
+        user = self._require_auth()
+        if user is None:
+            return
+        if not self._is_admin(user):
+            self._json(403, {"ok": False, "error": "admin required"})
+            return
+        body = self._read_json()
+        updated = auth.update_user(
+            username=_str_field(body, "username").strip(),
+            role=_str_field(body, "role").strip() or None,
+            status=_str_field(body, "status").strip() or None,
+        )
+        self._json(200, {"ok": True, "user": updated})
 
-            if route_path == "/auth/update_user":
-                auth = self.auth
-                if auth is None or not getattr(auth, "enabled", False):
-                    self._json(400, {"ok": False, "error": "auth disabled"})
-                    return
-                user = self._require_auth()
-                if user is None:
-                    return
-                if not self._is_admin(user):
-                    self._json(403, {"ok": False, "error": "admin required"})
-                    return
-                body = self._read_json()
-                updated = auth.update_user(
-                    username=str(body.get("username") or "").strip(),
-                    role=str(body.get("role") or "").strip() or None,
-                    status=str(body.get("status") or "").strip() or None,
-                )
-                self._json(200, {"ok": True, "user": updated})
-                return
+    def _post_create_user(self) -> None:
+        auth = self.auth
+        if auth is None or not getattr(auth, "enabled", False):
+            self._json(400, {"ok": False, "error": "auth disabled"})
+            return
+        user = self._require_auth()
+        if user is None:
+            return
+        if not self._is_admin(user):
+            self._json(403, {"ok": False, "error": "admin required"})
+            return
+        body = self._read_json()
+        username = _str_field(body, "username")
+        password = _str_field(body, "password")
+        role = _str_field(body, "role", "user")
+        created = auth.create_user(username=username, password=password, role=role)
+        self._json(200, {"ok": True, "user": created})
+
+    def _post_mcp(self) -> None:
+        user = self._require_auth()
+        if user is None and self._auth_enabled():
+            return
+        body = self._read_json()
+        self._json(200, self._handle_mcp_rpc(body, user))
 
-            if route_path == "/auth/create_user":
-                auth = self.auth
-                if auth is None or not getattr(auth, "enabled", False):
-                    self._json(400, {"ok": False, "error": "auth disabled"})
-                    return
-                user = self._require_auth()
-                if user is None:
-                    return
-                if not self._is_admin(user):
-                    self._json(403, {"ok": False, "error": "admin required"})
-                    return
-                body = self._read_json()
-                username = str(body.get("username") or "")
-                password = str(body.get("password") or "")
-                role = str(body.get("role") or "user")
-                created = auth.create_user(username=username, password=password, role=role)
-                self._json(200, {"ok": True, "user": created})
-                return
+    def _post_tools_list(self) -> None:
+        user = self._require_auth()
+        if user is None and self._auth_enabled():
+            return
+        # The schema dump is the same for every caller with the same view, so it is encoded once.
+        dispatcher = self.dispatcher
+        view = self._tool_list_view(user)
+        cached = _TOOLS_LIST_BYTES.get(view)
+        if cached is None or cached[0] is not dispatcher:
+            cached = (dispatcher, dump_json(self._list_tools_for_user(user)))
+            _TOOLS_LIST_BYTES[view] = cached
+        self._json_bytes(200, cached[1])
+
+    def _post_tools_call(self) -> None:
+        user = self._require_auth()
+        if user is None and self._auth_enabled():
+            return
+        body = self._read_json()
+        name = body.get("name")
+        arguments = body.get("arguments") or {}
+        if not isinstance(name, str) or not isinstance(arguments, dict):
+            raise ValueError("Expected {name: str, arguments: object}")
+        out = self._call_tool_for_user(user, name, arguments)
+        self._json(200, {"ok": True, "result": out})
 
-            if route_path == "/mcp":
-                user = self._require_auth()
-                if user is None and self._auth_enabled():
-                    return
-                body = self._read_json()
-                self._json(200, self._handle_mcp_rpc(body, user))
-                return
+    def do_GET(self) -> None:  # noqa: N802
+        route_path = self._route_path()
+        handler = self._GET_ROUTES.get(route_path)
+        if handler is not None:
+            getattr(self, handler)()
+            return
+        if route_path.startswith("/runs/") and "/exports/" in route_path:
+            self._send_run_export_archive()
+            return
+        self._json(404, {"error": "not found"})
 
-            if route_path == "/tools/list":
-                user = self._require_auth()
-                if user is None and self._auth_enabled():
-                    return
-                self._json(200, self._list_tools_for_user(user))
-                return
-            if route_path == "/tools/call":
-                user = self._require_auth()
-                if user is None and self._auth_enabled():
-                    return
-                body = self._read_json()
-                name = body.get("name")
-                arguments = body.get("arguments") or {}
-                if not isinstance(name, str) or not isinstance(arguments, dict):
-                    raise ValueError("Expected {name: str, arguments: object}")
-                out = self._call_tool_for_user(user, name, arguments)
-                self._json(200, {"ok": True, "result": out})
+    def do_POST(self) -> None:  # noqa: N802
+        self._body_unread = True
+        try:
+            handler = self._POST_ROUTES.get(self._route_path())
+            if handler is None:
+                self._json(404, {"error": "not found"})
                 return
-            self._json(404, {"error": "not found"})
+            getattr(self, handler)()
         except Exception as exc:
-            self.log_error("error handling %s: %s", self.path, exc)
+            self.log_error("error handling %s: %s", _redact_query(str(self.path)), exc)
             status = 403 if isinstance(exc, AuthError) else 400
             self._json(status, {"ok": False, "error": str(exc)})
+        finally:
+            self._discard_unread_body()
+
+    # Exact-match routes -> handler method names; looked up by name so tests can patch handlers.
+    _GET_ROUTES: dict[str, str] = {
+        "/auth/oidc/config": "_send_oidc_config",
+        "/auth/me": "_send_auth_me",
+        "/auth/mcp_token": "_send_mcp_token",
+        "/auth/mcp_keys": "_send_mcp_keys_list",
+        "/model_provider_skill.zip": "_send_model_registration_skill_archive",
+        "/pipeline_skill.zip": "_send_pipeline_skill_archive",
+        "/healthz": "_send_health",
+    }
+    _POST_ROUTES: dict[str, str] = {
+        "/auth/login": "_post_login",
+        "/auth/oidc/exchange": "_post_oidc_exchange",
+        "/auth/mcp_keys": "_create_mcp_key",
+        "/auth/mcp_keys/revoke": "_revoke_mcp_key",
+        "/auth/logout": "_post_logout",
+        "/auth/list_users": "_post_list_users",
+        "/auth/update_user": "_post_update_user",
+        "/auth/create_user": "_post_create_user",
+        "/runpod/callback": "_runpod_callback",
+        "/mcp": "_post_mcp",
+        "/tools/list": "_post_tools_list",
+        "/tools/call": "_post_tools_call",
+    }
 
 
 def _bootstrap_queue_durations(runner) -> None:
@@ -1241,6 +1432,13 @@ def _bootstrap_queue_durations(runner) -> None:
         pass
 
 
+class _HTTPServer(ThreadingHTTPServer):
+    # socketserver listens with a backlog of 5: a burst of clients opening connections at once
+    # (polling dashboards, parallel MCP calls) overflowed it and waited out SYN retransmits
+    # (1s, 3s, ...) before the accept loop ever saw them. Handler threads are cheap next to that.
+    request_queue_size = 128
+
+
 def main(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--host", default="0.0.0.0")
@@ -1249,6 +1447,8 @@ def main(argv: list[str] | None = None) -> None:
 
     from .app import build_runner
 
+    # This process answers /runpod/callback, so its RunPod jobs can ask for webhooks.
+    receive_webhooks()
     runner = build_runner()
     ensure_runpod_metrics_collector(runner)
     _bootstrap_queue_durations(runner)
@@ -1272,7 +1472,7 @@ def main(argv: list[str] | None = None) -> None:
     except Exception as exc:  # noqa: BLE001 - recovery must never block startup
         print(f"[run-recovery] startup hook failed: {exc}", flush=True)
 
-    httpd = ThreadingHTTPServer((args.host, args.port), Handler)
+    httpd = _HTTPServer((args.host, args.port), Handler)
     print(f"listening: http://{args.host}:{args.port}", flush=True)
     httpd.serve_forever()
 
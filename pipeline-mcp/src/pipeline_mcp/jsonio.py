@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dump_json(payload: Any, *, indent: bool = False) -> bytes:
+    """UTF-8 JSON bytes, encoded by orjson when it is installed.
+
+    orjson writes compact separators and turns NaN/Infinity into null (which browsers can parse,
+    unlike the bare NaN the stdlib emits); anything it rejects, such as ints beyond 64 bits, goes
+    through the stdlib encoder instead. ``indent`` pretty-prints with two spaces on either path.
+    """
+    if orjson is not None:
+        try:
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            return orjson.dumps(payload, option=option | orjson.OPT_INDENT_2 if indent else option)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(payload, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+
+def load_json(raw: bytes | bytearray) -> Any:
+    """Parse JSON straight from bytes, with orjson when it is installed.
+
+    orjson reads integers wider than 64 bits as floats, so they lose precision on that path. Only
+    NaN/Infinity literals and invalid UTF-8 make it fall back to the stdlib parser, which accepts
+    both (undecodable bytes become U+FFFD) and keeps big ints exact.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw.decode("utf-8", errors="replace"))
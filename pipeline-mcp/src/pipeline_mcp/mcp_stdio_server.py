@@ -1,42 +1,52 @@
 from __future__ import annotations
 
-import json
 import sys
 from typing import Any
 
 from .app import build_runner
+from .jsonio import dump_json
+from .jsonio import load_json
 from .tools import ToolDispatcher
 
 
+# Cap on one message's header block. A peer that never sends the blank line (or is not speaking
+# this framing at all) would otherwise have its output buffered without limit.
+_MAX_HEADER_BYTES = 32 * 1024
+
+
 def _read_message() -> dict[str, Any] | None:
-    headers: dict[str, str] = {}
+    stdin = sys.stdin.buffer
+    length = 0
+    header_bytes = 0
     while True:
-        line = sys.stdin.buffer.readline()
+        line = stdin.readline(_MAX_HEADER_BYTES - header_bytes + 1)
         if not line:
             return None
-        s = line.decode("utf-8", errors="replace").strip()
-        if not s:
+        header_bytes += len(line)
+        if header_bytes > _MAX_HEADER_BYTES:
+            raise ValueError("MCP message headers too large")
+        if not line.strip():
             break
-        if ":" in s:
-            k, v = s.split(":", 1)
-            headers[k.strip().lower()] = v.strip()
+        # Only Content-Length matters; matched on the raw bytes, int() takes the padding and CRLF.
+        name, sep, value = line.partition(b":")
+        if sep and name.strip().lower() == b"content-length":
+            length = int(value)
 
-    length = int(headers.get("content-length", "0"))
     if length <= 0:
         return None
-    body = sys.stdin.buffer.read(length)
-    return json.loads(body.decode("utf-8", errors="replace"))
+    body = stdin.read(length)
+    return load_json(body)
 
 
 def _write_message(payload: dict[str, Any]) -> None:
-    raw = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    raw = dump_json(payload)
     sys.stdout.buffer.write(f"Content-Length: {len(raw)}\r\n\r\n".encode("ascii"))
     sys.stdout.buffer.write(raw)
     sys.stdout.buffer.flush()
 
 
 def _result_text(obj: object) -> dict[str, Any]:
-    return {"content": [{"type": "text", "text": json.dumps(obj, ensure_ascii=False, indent=2)}]}
+    return {"content": [{"type": "text", "text": dump_json(obj, indent=True).decode("utf-8")}]}
 
 
 def _error(err: Exception) -> dict[str, Any]:
@@ -8,7 +8,7 @@ def _env_true(name: str) -> bool:
     return os.environ.get(name, "").strip().lower() in {"1", "true", "yes", "y", "on"}
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SequenceRecord:
     id: str
     sequence: str
@@ -16,7 +16,7 @@ class SequenceRecord:
     meta: dict[str, object] = field(default_factory=dict)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PipelineRequest:
     target_fasta: str
     target_pdb: str
@@ -176,7 +176,7 @@ class PipelineRequest:
     mask_consensus_apply: bool = False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TierResult:
     tier: float
     fixed_positions: dict[str, list[int]]
@@ -194,7 +194,7 @@ class TierResult:
     novelty_tsv: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PipelineResult:
     run_id: str
     output_dir: str
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from collections import Counter
 from dataclasses import dataclass
 import html
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
 from .bio.alignment import global_alignment_mapping
 from .models import SequenceRecord
 from .storage import write_json
@@ -46,14 +47,17 @@ def _safe_chain_order(chain_order: list[str] | None, n_parts: int) -> list[str]:
     return _default_chain_ids(n_parts) if n_parts > 1 else ["A"]
 
 
+def _same_numbering(native: str, sample: str) -> bool:
+    """True when sample position i can be read against native position i without aligning."""
+    return native == sample or (len(native) == len(sample) and "/" not in native and "/" not in sample)
+
+
 def _aligned_chars_by_native_pos(native: str, sample: str) -> list[str]:
     """
     Returns a list of length len(native) where each entry is the sample AA aligned
     to that native position (or '-' if the sample has a gap at that position).
     """
-    if native == sample:
-        return list(sample)
-    if len(native) == len(sample) and "/" not in native and "/" not in sample:
+    if _same_numbering(native, sample):
         return list(sample)
 
     mapping = global_alignment_mapping(native, sample).mapping_query_to_target
@@ -67,18 +71,38 @@ def _aligned_chars_by_native_pos(native: str, sample: str) -> list[str]:
     return out
 
 
-def _mutation_list(
-    *,
-    native: str,
-    aligned_sample: list[str],
-    chain: str,
-) -> list[Mutation]:
-    muts: list[Mutation] = []
-    for i, (wt, aa) in enumerate(zip(native, aligned_sample), start=1):
-        if aa == wt:
-            continue
-        muts.append(Mutation(chain=chain, pos=i, wt=wt, aa=aa))
-    return muts
+def _tally_aligned_rows(native: str, rows: list[str]) -> tuple[list[dict[str, int]], list[tuple[int, int]]]:
+    """
+    Counts the residues seen at each native position over `rows` (aligned samples, each
+    len(native) long) and finds where they differ from the native.
+
+    Returns one {residue: count} dict per position, keyed in the order residues first appear
+    down the rows, and the (row, position) pairs that differ, in row-then-position order.
+    """
+    n = len(native)
+    if not rows:
+        return [{} for _ in range(n)], []
+    # UTF-32 gives one fixed-width code per character, so the rows become an (rows, n) matrix.
+    codes = np.frombuffer("".join(rows).encode("utf-32-le"), dtype="<u4").reshape(len(rows), n)
+    native_codes = np.frombuffer(native.encode("utf-32-le"), dtype="<u4")
+    symbols, inverse = np.unique(codes.ravel(), return_inverse=True)
+    width = len(symbols)
+    cells = np.arange(codes.size) % n * width + inverse.ravel()
+    counts = np.bincount(cells, minlength=n * width)
+    # First flat index of each (position, residue) cell; cells are row-major, so index // n is
+    # the row it first appeared in, which orders each position's residues.
+    seen, first = np.unique(cells, return_index=True)
+    order = np.lexsort((first // n, seen // width))
+
+    chars = [chr(code) for code in symbols.tolist()]
+    counts_list = counts.tolist()
+    position_counts: list[dict[str, int]] = [{} for _ in range(n)]
+    for cell in seen[order].tolist():
+        pos, symbol = divmod(cell, width)
+        position_counts[pos][chars[symbol]] = counts_list[cell]
+
+    row_idx, pos_idx = np.nonzero(codes != native_codes)
+    return position_counts, list(zip(row_idx.tolist(), pos_idx.tolist()))
 
 
 def _percentiles(values: list[int]) -> dict[str, float | None]:
@@ -181,21 +205,21 @@ def _write_mutations_by_position_svg(
                 f'<text x="{_fmt(x)}" y="{y_bottom + 18}" text-anchor="middle" class="label">{p}</text>'
             )
 
-        d: list[str] = []
-        fixed_points: list[tuple[float, float, int, float]] = []
-        for row in rows:
-            pos = int(row.get("pos") or 0)
-            mutated_fraction = float(row.get("mutated_fraction") or 0.0)
-            is_fixed = bool(row.get("fixed"))
-            if not pos:
-                continue
-            x = x0 + (pos - 1) * (plot_w / denom)
-            y = y_top + (1.0 - max(0.0, min(1.0, mutated_fraction))) * plot_h
-            d.append(("M" if not d else "L") + f"{_fmt(x)},{_fmt(y)}")
-            if is_fixed:
-                fixed_points.append((x, y, pos, mutated_fraction))
-
-        parts.append(f'<path d="{" ".join(d)}" fill="none" stroke="#1f77b4" stroke-width="1.5" />')
+        points = [(int(row.get("pos") or 0), float(row.get("mutated_fraction") or 0.0), row) for row in rows]
+        points = [point for point in points if point[0]]
+        # Coordinates for the whole series at once; the path is then formatted in a single join.
+        positions = np.array([point[0] for point in points], dtype=float)
+        fractions = np.clip(np.array([point[1] for point in points], dtype=float), 0.0, 1.0)
+        xs = (x0 + (positions - 1) * (plot_w / denom)).tolist()
+        ys = (y_top + (1.0 - fractions) * plot_h).tolist()
+        d = " L".join(f"{x:.2f},{y:.2f}" for x, y in zip(xs, ys))
+        fixed_points = [
+            (x, y, pos, mutated_fraction)
+            for (pos, mutated_fraction, row), x, y in zip(points, xs, ys)
+            if row.get("fixed")
+        ]
+
+        parts.append(f'<path d="{"M" + d if d else ""}" fill="none" stroke="#1f77b4" stroke-width="1.5" />')
 
         for x, y, pos, mutated_fraction in fixed_points:
             title = html.escape(f"{chain_id}:{pos} mutated_fraction={mutated_fraction:.3f}")
@@ -250,55 +274,54 @@ def write_mutation_reports(
     fixed_sets: dict[str, set[int]] = {k: set(int(x) for x in v) for k, v in (fixed_positions_by_chain or {}).items()}
     total_samples = len(samples)
 
-    # Count aligned amino acids at each native position.
-    aligned_counts: dict[str, list[Counter[str]]] = {}
-    mutations_by_sequence_rows: list[dict[str, Any]] = []
-    mutation_counts: list[int] = []
+    # Each sample chain as a row read against native numbering ('-' where the sample has a gap).
+    aligned_rows: list[list[str]] = [[] for _ in chain_order]
+    # Other chains need a full DP alignment against the native; samples often repeat a chain
+    # verbatim, so each distinct one is aligned once.
+    realigned: dict[tuple[int, str], str] = {}
 
-    for chain_idx, chain_id in enumerate(chain_order):
-        native_seq = native_parts[chain_idx]
-        aligned_counts[chain_id] = [Counter() for _ in range(len(native_seq))]
-
-    for sample, parts in zip(samples, sample_parts_all):
-        sample_muts: list[Mutation] = []
-        for chain_idx, chain_id in enumerate(chain_order):
+    for parts in sample_parts_all:
+        for chain_idx in range(len(chain_order)):
             native_seq = native_parts[chain_idx]
             sample_seq = parts[chain_idx]
-            aligned = _aligned_chars_by_native_pos(native_seq, sample_seq)
-            for i, aa in enumerate(aligned):
-                aligned_counts[chain_id][i][aa] += 1
-            sample_muts.extend(_mutation_list(native=native_seq, aligned_sample=aligned, chain=chain_id))
-
-        mutation_counts.append(len(sample_muts))
-        mutations_by_sequence_rows.append(
-            {
-                "id": str(sample.id),
-                "mutations": ",".join(m.compact() for m in sample_muts),
-                "num_mutations": len(sample_muts),
-            }
-        )
-
+            if not _same_numbering(native_seq, sample_seq):
+                aligned = realigned.get((chain_idx, sample_seq))
+                if aligned is None:
+                    aligned = "".join(_aligned_chars_by_native_pos(native_seq, sample_seq))
+                    realigned[(chain_idx, sample_seq)] = aligned
+                sample_seq = aligned
+            aligned_rows[chain_idx].append(sample_seq)
+
+    sample_muts: list[list[str]] = [[] for _ in samples]
     positions_payload: dict[str, list[dict[str, Any]]] = {}
     for chain_idx, chain_id in enumerate(chain_order):
         native_seq = native_parts[chain_idx]
         chain_fixed = fixed_sets.get(chain_id, set())
+        position_counts, mismatches = _tally_aligned_rows(native_seq, aligned_rows[chain_idx])
+        rows = aligned_rows[chain_idx]
+        # Formatted as Mutation.compact() would, without building a frozen instance per mutation.
+        prefix = f"{chain_id}:" if chain_id else ""
+        for row_idx, pos in mismatches:
+            sample_muts[row_idx].append(f"{prefix}{native_seq[pos]}{pos + 1}{rows[row_idx][pos]}")
+
         pos_rows: list[dict[str, Any]] = []
         for i, wt in enumerate(native_seq, start=1):
-            counts = aligned_counts[chain_id][i - 1]
+            counts = position_counts[i - 1]
             wt_count = int(counts.get(wt, 0))
             gap_count = int(counts.get("-", 0))
             mutated = total_samples - wt_count
+            # Highest count first; ties keep first-seen order (as Counter.most_common did).
             top_mutants = [
-                {"aa": aa, "count": int(c)}
-                for aa, c in counts.most_common()
-                if aa not in {wt} and aa != ""
+                {"aa": aa, "count": c}
+                for aa, c in sorted(counts.items(), key=lambda item: -item[1])
+                if aa != wt
             ]
             pos_rows.append(
                 {
                     "pos": i,
                     "wt": wt,
                     "fixed": (i in chain_fixed),
-                    "counts": dict(counts),
+                    "counts": counts,
                     "wt_count": wt_count,
                     "gap_count": gap_count,
                     "mutated_count": mutated,
@@ -308,6 +331,16 @@ def write_mutation_reports(
             )
         positions_payload[chain_id] = pos_rows
 
+    mutation_counts = [len(muts) for muts in sample_muts]
+    mutations_by_sequence_rows = [
+        {
+            "id": str(sample.id),
+            "mutations": ",".join(muts),
+            "num_mutations": len(muts),
+        }
+        for sample, muts in zip(samples, sample_muts)
+    ]
+
     payload = {
         "native_id": native.id,
         "native_header": native.header,
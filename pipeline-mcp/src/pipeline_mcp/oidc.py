@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import os
+import threading
 import time
 from typing import Any
 
@@ -13,6 +14,13 @@ from .auth import safe_run_prefix
 _OIDC_CACHE_TTL_S = 300.0
 _OIDC_DISCOVERY_CACHE: dict[str, tuple[float, dict[str, Any]]] = {}
 _OIDC_JWKS_CACHE: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+# Verified bearer tokens -> claims, so a client polling with one token is not re-verified (an RSA
+# signature check) on every request. Entries live at most this long and never past the token's exp.
+_OIDC_TOKEN_CACHE_TTL_S = 30.0
+_OIDC_TOKEN_CACHE_MAX = 512
+_OIDC_TOKEN_CACHE: dict[tuple[OIDCSettings, str], tuple[float, dict[str, Any]]] = {}
+# Handler threads share the cache; the verification itself runs outside the lock.
+_OIDC_TOKEN_CACHE_LOCK = threading.Lock()
 
 
 @dataclass(frozen=True)
@@ -236,6 +244,28 @@ def _select_signing_key(keys: list[dict[str, Any]], kid: Any) -> dict[str, Any]
 
 
 def verify_oidc_token(token: str, settings: OIDCSettings) -> dict[str, Any]:
+    now = time.time()
+    key = (settings, token)
+    with _OIDC_TOKEN_CACHE_LOCK:
+        cached = _OIDC_TOKEN_CACHE.get(key)
+    if cached is not None and cached[0] > now:
+        return dict(cached[1])
+    claims = _verify_oidc_token(token, settings)
+    expires_at = now + _OIDC_TOKEN_CACHE_TTL_S
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        expires_at = min(expires_at, float(exp))
+    with _OIDC_TOKEN_CACHE_LOCK:
+        if len(_OIDC_TOKEN_CACHE) >= _OIDC_TOKEN_CACHE_MAX:
+            for stale in [k for k, (at, _) in _OIDC_TOKEN_CACHE.items() if at <= now]:
+                del _OIDC_TOKEN_CACHE[stale]
+            while len(_OIDC_TOKEN_CACHE) >= _OIDC_TOKEN_CACHE_MAX:
+                del _OIDC_TOKEN_CACHE[next(iter(_OIDC_TOKEN_CACHE))]
+        _OIDC_TOKEN_CACHE[key] = (expires_at, dict(claims))
+    return claims
+
+
+def _verify_oidc_token(token: str, settings: OIDCSettings) -> dict[str, Any]:
     try:
         from jose import jwt
     except Exception as exc:  # pragma: no cover
@@ -44,6 +44,7 @@ from .bio.fasta import to_fasta
 from .bio.ligand_text import normalize_diffdock_ligand_inputs
 from .bio.alignment import global_alignment_mapping
 from .bio.pdb import ca_rmsd
+from .bio.pdb import chain_ids
 from .bio.pdb import dssp_non_loop_positions_by_chain
 from .bio.pdb import ligand_atoms_present
 from .bio.pdb import ligand_proximity_mask
@@ -2572,7 +2573,7 @@ def _resolve_pipeline_chain_strategy(
 ) -> tuple[
     list[str], list[str] | None, list[str] | None, list[str] | None, str | None, str
 ]:
-    pdb_chains = list(residues_by_chain(pdb_text, only_atom_records=True).keys())
+    pdb_chains = chain_ids(pdb_text)
     explicit_design_chains = [
         str(chain_id).strip()
         for chain_id in (request_design_chains or [])
@@ -6893,9 +6894,7 @@ class PipelineRunner:
                     preferred_chains=design_chains,
                     query_seq=query_seq,
                 )
-                ctx_available_chains = list(
-                    residues_by_chain(ctx["pdb_text"], only_atom_records=True).keys()
-                )
+                ctx_available_chains = chain_ids(ctx["pdb_text"])
                 ctx["available_chains"] = ctx_available_chains
                 ctx["design_chains"] = list(ctx_design_chains)
 
@@ -9018,8 +9017,9 @@ class PipelineRunner:
                         selected_pairs = selected_pairs[:af2_top_k]
                     selected_ids = [seq_id for seq_id, _ in selected_pairs]
                     selected_ids_by_tier[tier_str_local] = selected_ids
+                    selected_id_set = set(selected_ids)
                     selected_records = [
-                        rec for rec in tier_records if rec.id in set(selected_ids)
+                        rec for rec in tier_records if rec.id in selected_id_set
                     ]
                     _write_text(
                         tier_dir_local / "af2_selected.fasta",
@@ -10944,8 +10944,9 @@ class PipelineRunner:
                             for seq_id, _ in selected_pairs
                         ]
 
+                        af2_selected_id_set = set(af2_selected_ids)
                         selected_records = [
-                            s for s in af2_candidates if s.id in set(af2_selected_ids)
+                            s for s in af2_candidates if s.id in af2_selected_id_set
                         ]
                         _write_text(
                             af2_selected_path,
@@ -11031,8 +11032,9 @@ class PipelineRunner:
                         candidate_ids = [s.id for s in af2_candidates]
                         af2_top_k = int(request.af2_top_k)
                         af2_selected_ids = candidate_ids[:af2_top_k] if af2_top_k > 0 else candidate_ids
+                        af2_selected_id_set = set(af2_selected_ids)
                         selected_records = [
-                            s for s in af2_candidates if s.id in set(af2_selected_ids)
+                            s for s in af2_candidates if s.id in af2_selected_id_set
                         ]
                         fallback_scores = {seq_id: 0.0 for seq_id in candidate_ids}
                         _write_text(
@@ -11510,10 +11512,11 @@ class PipelineRunner:
                                     seq_id for seq_id, _ in selected_pairs
                                 ]
 
+                            relax_selected_id_set = set(relax_selected_ids)
                             selected_records = [
                                 s
                                 for s in relax_candidates
-                                if s.id in set(relax_selected_ids)
+                                if s.id in relax_selected_id_set
                             ]
                             _write_text(
                                 relax_selected_path,
@@ -11679,10 +11682,9 @@ class PipelineRunner:
                 novelty_selected_ids = (
                     relax_selected_ids if relax_enabled else af2_selected_ids
                 )
+                novelty_selected_id_set = set(novelty_selected_ids or ())
                 novelty_candidates = [
-                    s
-                    for s in passed
-                    if novelty_selected_ids and s.id in set(novelty_selected_ids)
+                    s for s in passed if s.id in novelty_selected_id_set
                 ]
                 if novelty_candidates:
                     _ensure_not_cancelled(stage=f"novelty_{tier_str}")
@@ -12342,8 +12344,8 @@ class PipelineRunner:
                     },
                     "request_hash": expected_request_hash,
                     "input_hash": expected_input_hash,
-                    "native": native.__dict__,
-                    "samples": [s.__dict__ for s in samples],
+                    "native": asdict(native),
+                    "samples": [asdict(s) for s in samples],
                     "fixed_positions": expected_fixed_positions,
                 },
             )
@@ -12403,8 +12405,8 @@ class PipelineRunner:
                 },
                 "request_hash": expected_request_hash,
                 "input_hash": expected_input_hash,
-                "native": native.__dict__,
-                "samples": [s.__dict__ for s in samples],
+                "native": asdict(native),
+                "samples": [asdict(s) for s in samples],
                 "fixed_positions": expected_fixed_positions,
                 "raw": _safe_json(raw),
             },
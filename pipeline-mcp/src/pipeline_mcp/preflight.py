@@ -4,9 +4,10 @@ from dataclasses import asdict
 from typing import Any
 
 from .bio.fasta import parse_fasta
+from .bio.pdb import chain_ids
+from .bio.pdb import count_models
 from .bio.pdb import ligand_atoms_present
 from .bio.pdb import normalize_structure_text
-from .bio.pdb import residues_by_chain
 from .bio.pdb import sequence_by_chain
 from .models import PipelineRequest
 from .pipeline import PipelineRunner
@@ -179,14 +180,14 @@ def preflight_request(request: PipelineRequest, runner: PipelineRunner, *, run_i
     pdb_chains: list[str] | None = None
     if target_pdb:
         try:
-            residues = residues_by_chain(target_pdb, only_atom_records=True)
-            if not residues:
+            target_chains = chain_ids(target_pdb)
+            if not target_chains:
                 errors.append("target_pdb parse failed: no ATOM records found.")
             else:
-                pdb_chains = sorted(residues.keys())
+                pdb_chains = sorted(target_chains)
                 detected["pdb_chains"] = pdb_chains
                 if request.design_chains:
-                    missing = [c for c in request.design_chains if c not in residues]
+                    missing = [c for c in request.design_chains if c not in target_chains]
                     if missing:
                         errors.append(f"design_chains not found in target_pdb: {missing}")
         except Exception as exc:
@@ -204,9 +205,7 @@ def preflight_request(request: PipelineRequest, runner: PipelineRunner, *, run_i
             )
     # Detect multi-model (NMR) input on the raw text: normalize_structure_text has
     # already reduced target_pdb to the first model, so count on request.target_pdb.
-    raw_models = sum(
-        1 for line in str(request.target_pdb or "").splitlines() if line[:5] == "MODEL"
-    )
+    raw_models = count_models(str(request.target_pdb or ""))
     if raw_models > 1:
         warnings.append(
             f"target_pdb contains {raw_models} models (e.g. an NMR ensemble); only the "
@@ -1,2 +1,13 @@
+import pytest
+
+from pipeline_mcp.config import load_config
+
 collect_ignore = ["_tmp"]
 
+
+@pytest.fixture(autouse=True)
+def _fresh_config():
+    # load_config() is cached per process; tests patch os.environ and expect it to be re-read.
+    load_config.cache_clear()
+    yield
+    load_config.cache_clear()
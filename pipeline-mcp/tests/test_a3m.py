@@ -1,8 +1,12 @@
+import base64
+import gzip
 import unittest
 
 from pipeline_mcp.bio.a3m import compute_conservation
 from pipeline_mcp.bio.a3m import conservation_scores
+from pipeline_mcp.bio.a3m import decode_a3m_gz_b64
 from pipeline_mcp.bio.a3m import filter_a3m
+from pipeline_mcp.bio.a3m import fixed_positions
 from pipeline_mcp.bio.a3m import msa_quality
 
 
@@ -79,6 +83,54 @@ ACKE
         self.assertEqual(cons_unweighted.fixed_positions_by_tier[0.6], [1, 2, 3, 4])
         self.assertEqual(cons_weighted.fixed_positions_by_tier[0.6], [1, 2, 4])
 
+    def test_conservation_ignores_gaps_and_unknown_symbols(self) -> None:
+        a3m = """>query
+ACDE
+>hit1
+A-D*
+>hit2
+a.KDE
+>short
+ACD
+"""
+        scores = conservation_scores(a3m, weights=[2.0, 1.0, 5.0])
+        self.assertEqual(scores, [1.0, 1.0, 1.0, 1.0])
+
+        scores = conservation_scores(a3m.replace("A-D*", "ACE*"), weights=[3.0, 1.0, 5.0])
+        self.assertEqual(scores, [1.0, 0.75, 0.75, 1.0])
+
+    def test_quantile_ties_prefer_lower_positions(self) -> None:
+        scores = [0.5, 0.9, 0.5, 0.5, 0.1, 0.9]
+        out = fixed_positions(scores, [0.0, 0.5, 1.0], mode="quantile")
+        self.assertEqual(out[0.0], [])
+        self.assertEqual(out[0.5], [1, 2, 6])
+        self.assertEqual(out[1.0], [1, 2, 3, 4, 5, 6])
+
+    def test_filter_a3m_reports_length_mismatches_and_keeps_raw_records(self) -> None:
+        a3m = """>query
+ACDE
+>hit1
+AcCDE
+>hit2
+ACD
+>hit3
+A.-E
+"""
+        filtered, report = filter_a3m(a3m, min_coverage=0.75)
+        self.assertEqual(report["kept_hits"], 1)
+        self.assertEqual(report["dropped_hits"], 2)
+        self.assertEqual(report["dropped_length_mismatch"], 1)
+        self.assertEqual(filtered, ">query\nACDE\n>hit1\nAcCDE\n")
+
+    def test_decode_a3m_gz_b64_handles_large_and_multi_member_payloads(self) -> None:
+        a3m = ">query\n" + "ACDE" * 50_000 + "\n"
+        blob = gzip.compress(a3m[:1000].encode()) + gzip.compress(a3m[1000:].encode())
+        self.assertEqual(decode_a3m_gz_b64(base64.b64encode(blob).decode("ascii")), a3m)
+
+        truncated = base64.b64encode(gzip.compress(a3m.encode())[:-12]).decode("ascii")
+        with self.assertRaises(EOFError):
+            decode_a3m_gz_b64(truncated)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -64,3 +64,72 @@ def test_issue_token_round_trips_through_verify(tmp_path):
     verified = manager.verify_token(issued["token"])
     assert verified is not None
     assert verified["username"] == "carol"
+
+
+def test_saved_users_reload_without_sharing_cached_state(tmp_path):
+    from pipeline_mcp.auth import _load_users
+
+    store_path = tmp_path / "users.json"
+    manager = AuthManager(
+        config=AuthConfig(
+            enabled=True,
+            store_path=store_path,
+            secret_path=tmp_path / "secret.key",
+            token_ttl_s=3600,
+        ),
+        users={},
+        secret=b"test-secret",
+    )
+    manager.create_user(username="dave", password="pw123456")
+    assert not store_path.with_suffix(".json.tmp").exists()
+
+    loaded = _load_users(store_path)
+    loaded["dave"]["role"] = "admin"
+    assert _load_users(store_path)["dave"]["role"] == "user"
+
+    manager.update_user(username="dave", role="model_manager")
+    assert _load_users(store_path)["dave"]["role"] == "model_manager"
+
+
+def test_token_signature_matches_plain_hmac(tmp_path):
+    import base64
+    import hashlib
+    import hmac
+
+    manager = AuthManager(
+        config=AuthConfig(
+            enabled=True,
+            store_path=tmp_path / "users.json",
+            secret_path=tmp_path / "secret.key",
+            token_ttl_s=3600,
+        ),
+        users={},
+        secret=b"test-secret",
+    )
+    token = manager.issue_token({"username": "erin", "role": "user"})["token"]
+    body, sig = token.split(".")
+    expected = hmac.new(b"test-secret", body.encode("ascii"), hashlib.sha256).digest()
+    assert base64.urlsafe_b64decode(sig + "=" * (-len(sig) % 4)) == expected
+
+
+def test_verify_token_rejects_malformed_tokens(tmp_path):
+    manager = AuthManager(
+        config=AuthConfig(
+            enabled=True,
+            store_path=tmp_path / "users.json",
+            secret_path=tmp_path / "secret.key",
+            token_ttl_s=3600,
+        ),
+        users={},
+        secret=b"test-secret",
+    )
+    manager.create_user(username="frank", password="pw123456")
+    token = manager.issue_token({"username": "frank", "role": "user"})["token"]
+    body, sig = token.split(".")
+
+    assert manager.verify_token(token)["username"] == "frank"
+    assert manager.verify_token("") is None
+    assert manager.verify_token(body) is None
+    assert manager.verify_token(f"{body}.{sig}.extra") is None
+    assert manager.verify_token(f"{body}x.{sig}") is None
+    assert manager.verify_token(f"{body}.{sig}é") is None
@@ -2,7 +2,9 @@
 when parsing UniProt standard-format headers."""
 from __future__ import annotations
 
-from pipeline_mcp.bio.fasta import FastaRecord, parse_fasta
+import pytest
+
+from pipeline_mcp.bio.fasta import FastaRecord, parse_fasta, to_fasta
 
 
 def test_trembl_headers_produce_unique_ids():
@@ -70,3 +72,32 @@ def test_uniprot_truncated_header_falls_back_gracefully():
     records = parse_fasta(text)
     # Without an accession, falls back to original behavior
     assert records[0].id == "tr"
+
+
+def test_parse_fasta_joins_wrapped_sequences_and_keeps_inline_gt():
+    text = "  >a desc\r\nAC DE\r\n\tFG\n\n>b\nXX>YY\n"
+    records = parse_fasta(text)
+    assert [(r.header, r.sequence) for r in records] == [("a desc", "ACDEFG"), ("b", "XX>YY")]
+
+
+def test_parse_fasta_splits_on_every_line_break():
+    expected = [("a", "ACD"), ("b", "EF")]
+    for sep in ("\r", "\r\n", "\x0b", "\x0c", "\x1c", "\x85", "\u2028"):
+        text = sep.join([">a", "ACD", ">b", "EF", ""])
+        assert [(r.header, r.sequence) for r in parse_fasta(text)] == expected
+
+
+def test_parse_fasta_rejects_malformed_input():
+    with pytest.raises(ValueError, match="sequence line before header"):
+        parse_fasta("AC\n>a\nDE\n")
+    with pytest.raises(ValueError, match="Empty FASTA sequence"):
+        parse_fasta(">a\n\n>b\nDE\n")
+    with pytest.raises(ValueError, match="No FASTA records"):
+        parse_fasta("\n \n")
+
+
+def test_to_fasta_round_trips_records():
+    records = [FastaRecord(header="a\ndesc ", sequence="AC\nDE"), FastaRecord(header="b", sequence="FG")]
+    assert to_fasta(records) == ">a desc\nACDE\n>b\nFG\n"
+    assert to_fasta([]) == "\n"
+    assert parse_fasta(to_fasta(records))[0].sequence == "ACDE"
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import io
+import json
 import zipfile
 
 from pipeline_mcp import http_server
@@ -222,9 +223,9 @@ def test_handler_accepts_api_prefixed_healthz_route():
     handler = Handler.__new__(Handler)
     handler.path = "/api/healthz"
     handler.headers = {}
-    handler._json = lambda status, payload, extra_headers=None: captured.update(  # noqa: ARG005
+    handler._json_bytes = lambda status, data, extra_headers=None: captured.update(  # noqa: ARG005
         status=status,
-        payload=payload,
+        payload=json.loads(data),
     )
 
     handler.do_GET()
@@ -645,3 +646,37 @@ def test_mcp_full_tool_list_env_shows_everything(monkeypatch):
     h = Handler.__new__(Handler)
     names = [t["name"] for t in h._list_tools_for_user({"username": "a", "role": "admin"})["tools"]]
     assert names == ["pipeline.run", "pipeline.save_project", "pipeline.cath_list_jobs"]
+
+
+def test_tools_list_body_is_encoded_once_per_view(monkeypatch):
+    calls = []
+
+    class _Disp:
+        def list_tools(self):
+            calls.append(1)
+            return {"tools": [{"name": n} for n in ["pipeline.run", "pipeline.cath_list_jobs"]]}
+
+    monkeypatch.setattr(http_server, "_DISPATCHER", _Disp(), raising=False)
+    monkeypatch.setattr(http_server, "_TOOLS_LIST_BYTES", {})
+    monkeypatch.delenv("PIPELINE_MCP_FULL_TOOL_LIST", raising=False)
+    sent = []
+
+    def _post(user):
+        handler = Handler.__new__(Handler)
+        handler.path = "/tools/list"
+        handler.headers = {}
+        handler._require_auth = lambda: user
+        handler._json_bytes = lambda status, data, extra_headers=None: sent.append(json.loads(data))  # noqa: ARG005
+        handler.do_POST()
+        return [t["name"] for t in sent[-1]["tools"]]
+
+    user = {"username": "u", "role": "user"}
+    assert _post(user) == ["pipeline.run"]
+    assert _post(user) == ["pipeline.run"]
+    assert len(calls) == 1
+    assert _post({"username": "a", "role": "admin"}) == ["pipeline.run", "pipeline.cath_list_jobs"]
+    assert len(calls) == 2
+
+    monkeypatch.setattr(http_server, "_DISPATCHER", _Disp(), raising=False)
+    assert _post(user) == ["pipeline.run"]
+    assert len(calls) == 3
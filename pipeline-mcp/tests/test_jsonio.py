@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from pipeline_mcp import jsonio
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "orjson":
+        if jsonio.orjson is None:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(jsonio, "orjson", None)
+    return request.param
+
+
+def test_dump_and_load_round_trip(backend):
+    payload = {"seq": "café", "score": 0.5, "ids": [1, 2], "big": 2**70}
+    data = jsonio.dump_json(payload)
+    assert isinstance(data, bytes)
+    assert json.loads(data) == payload
+    loaded = jsonio.load_json(data)
+    # orjson reads ints beyond 64 bits back as floats; the stdlib keeps them exact.
+    assert loaded["big"] == (2**70 if backend == "stdlib" else float(2**70))
+    assert {**loaded, "big": 2**70} == payload
+    assert jsonio.load_json(bytearray(b'{"ok": true}')) == {"ok": True}
+
+
+def test_dump_json_indent(backend):
+    text = jsonio.dump_json({"a": [1], "name": "café"}, indent=True).decode("utf-8")
+    assert text == '{\n  "a": [\n    1\n  ],\n  "name": "café"\n}'
+    assert "\n" not in jsonio.dump_json({"a": [1]}).decode("utf-8")
+
+
+def test_load_json_falls_back_for_nan_and_invalid_utf8(backend):
+    nan = jsonio.load_json(b'{"ptm": NaN}')["ptm"]
+    assert nan != nan
+    assert jsonio.load_json(b'{"name": "caf\xe9"}') == {"name": "caf�"}
@@ -179,6 +179,12 @@ def test_local_http_diffdock_does_not_send_callback_in_json_payload(monkeypatch)
 
     assert result["sdf_text"] == "rank1 sdf text"
     assert result["selected_sdf_name"] == "smoke_diffdock/rank1.sdf"
+    assert result["zip_bytes"] == zip_buffer.getvalue()
+    assert result["output"]["out_dir_zip_b64"] == {
+        "omitted": True,
+        "reason": "large inline archive payload",
+        "chars": len(zip_b64),
+    }
     assert "protein_ligand_csv" in calls[0]["input"]
     assert calls[0]["input"]["pdb_files"][0]["filename"] == "smoke_diffdock.pdb"
     assert "on_job_id" not in calls[0]["input"]
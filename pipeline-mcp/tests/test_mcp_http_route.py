@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import json
+
+import pytest
+
 from pipeline_mcp import http_server
 from pipeline_mcp.http_server import Handler
 
@@ -464,3 +468,208 @@ def test_mcp_tool_result_uses_standard_mcp_content_type():
     assert _json.loads(block["text"]) == payload  # serialized JSON in the text block
     assert out["structuredContent"] == payload  # machine-readable structured result
     assert out["isError"] is False
+
+
+def test_read_json_accepts_chunked_bodies():
+    import io
+
+    handler = Handler.__new__(Handler)
+    handler.headers = {"Transfer-Encoding": "chunked"}
+    handler.rfile = io.BytesIO(b'7\r\n{"name"\r\n11;ext=1\r\n: "pipeline.run"}\r\n0\r\nX-Trailer: 1\r\n\r\n')
+    assert handler._read_json() == {"name": "pipeline.run"}
+
+    handler.rfile = io.BytesIO(b"0\r\n\r\n")
+    assert handler._read_json() == {}
+
+    handler.rfile = io.BytesIO(b'a\r\n{"name":')
+    with pytest.raises(ValueError, match="Unexpected EOF"):
+        handler._read_json()
+
+    # Chunks longer than the read buffer are copied over in several reads.
+    handler._CHUNK_READ_BYTES = 4
+    handler.rfile = io.BytesIO(b'18\r\n{"name": "pipeline.run"}\r\n0\r\n\r\n')
+    assert handler._read_json() == {"name": "pipeline.run"}
+    handler.rfile = io.BytesIO(b'18\r\n{"name": "pipe')
+    with pytest.raises(ValueError, match="Unexpected EOF"):
+        handler._read_json()
+    del handler._CHUNK_READ_BYTES
+
+    for size_line in (b"0x2\r\n", b"+2\r\n", b"1_0\r\n", b"\r\n", b"zz;x\r\n"):
+        handler.rfile = io.BytesIO(size_line + b"{}\r\n0\r\n\r\n")
+        with pytest.raises(ValueError, match="Invalid chunk size"):
+            handler._read_json()
+
+
+def test_runpod_callback_requires_the_webhook_token(monkeypatch):
+    from pipeline_mcp.clients import runpod
+
+    env = {
+        "RUNPOD_API_KEY": "k",
+        "MMSEQS_ENDPOINT_ID": "m",
+        "PROTEINMPNN_ENDPOINT_ID": "p",
+        "RUNPOD_WEBHOOK_URL": "https://pipeline.example/runpod/callback",
+        "RUNPOD_WEBHOOK_SECRET": "s3cret",
+    }
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    inbox = runpod._WebhookInbox()
+    monkeypatch.setattr(runpod, "_WEBHOOKS", inbox)
+    body = {"id": "job-1", "status": "COMPLETED", "output": {"ok": True}}
+
+    captured: dict = {}
+    _make_handler("/runpod/callback?token=wrong", body, captured).do_POST()
+    assert captured["code"] == 403
+    assert inbox.take("job-1", timeout=0.0) is None
+
+    _make_handler("/api/runpod/callback?token=s3cret", body, captured).do_POST()
+    assert captured["code"] == 200
+    assert inbox.take("job-1", timeout=0.0) == body
+
+
+def test_runpod_callback_token_is_kept_out_of_the_log(monkeypatch, capsys):
+    monkeypatch.setenv("RUNPOD_API_KEY", "k")
+    monkeypatch.setenv("RUNPOD_WEBHOOK_URL", "https://pipeline.example/runpod/callback")
+    monkeypatch.setenv("RUNPOD_WEBHOOK_SECRET", "s3cret")
+    captured: dict = {}
+    handler = _make_handler("/runpod/callback?token=s3cret&x=1", {}, captured)
+    handler.requestline = "POST /runpod/callback?token=s3cret&x=1 HTTP/1.1"
+    handler.client_address = ("127.0.0.1", 40000)
+
+    handler.do_POST()  # body without a job id: the error path logs the request path
+    handler.log_request(200)
+    err = capsys.readouterr().err
+    assert captured["code"] == 400
+    assert "s3cret" not in err
+    assert "/runpod/callback?token=<redacted>&x=1" in err
+    assert '"POST /runpod/callback?token=<redacted>&x=1 HTTP/1.1" 200 -' in err
+
+
+def test_route_tables_point_at_handler_methods():
+    for table in (Handler._GET_ROUTES, Handler._POST_ROUTES):
+        for path, name in table.items():
+            assert path.startswith("/") and not path.endswith("/")
+            assert callable(getattr(Handler, name, None)), (path, name)
+
+
+def test_cors_headers_match_send_header_output(monkeypatch):
+    monkeypatch.setattr(http_server, "_ALLOW_ALL_ORIGINS", True)
+    handler = Handler.__new__(Handler)
+    handler.request_version = "HTTP/1.1"
+    handler.headers = {"Origin": "https://portal.example"}
+    handler._headers_buffer = []
+    handler._set_cors_headers()
+    assert b"".join(handler._headers_buffer) == (
+        b"Access-Control-Allow-Origin: https://portal.example\r\n"
+        b"Vary: Origin\r\n"
+        b"Access-Control-Allow-Credentials: true\r\n"
+        b"Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
+        b"Access-Control-Allow-Headers: Content-Type, Authorization\r\n"
+        b"Access-Control-Max-Age: 86400\r\n"
+    )
+
+
+def test_cors_max_age_is_configurable(monkeypatch):
+    monkeypatch.setenv("PIPELINE_CORS_MAX_AGE", "7200")
+    for name in ("_ALLOW_ALL_ORIGINS", "_ALLOWED_ORIGINS", "_CORS_MAX_AGE_S"):
+        monkeypatch.setattr(http_server, name, getattr(http_server, name))
+    monkeypatch.setattr(http_server, "_CORS_STATIC_HEADER_BYTES", http_server._CORS_STATIC_HEADER_BYTES)
+    http_server._init_cors()
+    assert http_server._CORS_MAX_AGE_S == 7200
+    assert b"Access-Control-Max-Age: 7200\r\n" in http_server._CORS_STATIC_HEADER_BYTES
+
+
+def test_preflight_always_varies_on_origin(monkeypatch):
+    monkeypatch.setattr(http_server, "_ALLOW_ALL_ORIGINS", False)
+    monkeypatch.setattr(http_server, "_ALLOWED_ORIGINS", {"https://ok.example"})
+    for origin in ("https://ok.example", "https://other.example", None):
+        writes: list[bytes] = []
+        handler = Handler.__new__(Handler)
+        handler.request_version = "HTTP/1.1"
+        handler.headers = {"Origin": origin} if origin else {}
+        handler.log_request = lambda *args: None
+        handler.wfile = type("Writer", (), {"write": lambda self, data: writes.append(bytes(data))})()
+
+        handler.do_OPTIONS()
+        head = b"".join(writes).split(b"\r\n\r\n", 1)[0]
+        assert head.startswith(b"HTTP/1.1 204 ")
+        assert [line for line in head.split(b"\r\n") if line.startswith(b"Vary:")] == [
+            b"Vary: Origin, Access-Control-Request-Headers"
+        ]
+        assert (b"Access-Control-Allow-Origin: https://ok.example" in head) == (origin == "https://ok.example")
+
+
+def test_small_json_response_is_sent_in_one_write(monkeypatch):
+    monkeypatch.setattr(http_server, "_ALLOW_ALL_ORIGINS", True)
+    writes: list[bytes] = []
+    handler = Handler.__new__(Handler)
+    handler.request_version = "HTTP/1.1"
+    handler.headers = {}
+    handler.log_request = lambda *args: None
+    handler.wfile = type("Writer", (), {"write": lambda self, data: writes.append(bytes(data))})()
+
+    handler._json(200, {"ok": True})
+    assert len(writes) == 1
+    head, body = writes[0].split(b"\r\n\r\n", 1)
+    assert head.startswith(b"HTTP/1.1 200 ")
+    assert b"Content-Length: %d" % len(body) in head
+    assert json.loads(body) == {"ok": True}
+
+    writes.clear()
+    handler._binary(200, b"x" * (http_server._COALESCE_BODY_MAX_BYTES + 1), "application/octet-stream")
+    assert len(writes) == 2
+    assert writes[0].endswith(b"\r\n\r\n") and len(writes[1]) == http_server._COALESCE_BODY_MAX_BYTES + 1
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [("gzip, deflate, br", True), ("br;q=1.0, GZIP;q=0.5", True), ("gzip;q=0", False), ("identity", False), (None, False)],
+)
+def test_accepts_gzip(accept_encoding, expected):
+    assert http_server._accepts_gzip(accept_encoding) is expected
+
+
+def test_large_json_is_gzipped_when_the_client_accepts_it(monkeypatch):
+    import gzip
+
+    monkeypatch.setattr(http_server, "_ALLOW_ALL_ORIGINS", True)
+    payload = {"artifacts": [f"tier_{i}/sample_{i}.pdb" for i in range(1000)]}
+    writes: list[bytes] = []
+    handler = Handler.__new__(Handler)
+    handler.request_version = "HTTP/1.1"
+    handler.log_request = lambda *args: None
+    handler.wfile = type("Writer", (), {"write": lambda self, data: writes.append(bytes(data))})()
+
+    handler.headers = {"Accept-Encoding": "gzip, deflate"}
+    handler._json(200, payload)
+    head, body = b"".join(writes).split(b"\r\n\r\n", 1)
+    assert b"Content-Encoding: gzip\r\n" in head and b"Vary: Accept-Encoding\r\n" in head
+    assert head.endswith(b"\r\nContent-Length: %d" % len(body))
+    assert json.loads(gzip.decompress(body)) == payload
+
+    writes.clear()
+    handler.headers = {}
+    handler._json(200, payload)
+    head, body = b"".join(writes).split(b"\r\n\r\n", 1)
+    assert b"Content-Encoding" not in head and b"Vary: Accept-Encoding\r\n" in head
+    assert json.loads(body) == payload
+
+
+def test_unread_post_body_is_drained_or_the_connection_closed():
+    import io
+
+    def _post(headers, raw):
+        handler = Handler.__new__(Handler)
+        handler.path = "/no-such-route"
+        handler.headers = headers
+        handler.rfile = io.BytesIO(raw)
+        handler.close_connection = False
+        handler._json = lambda code, payload, extra_headers=None: None
+        handler.do_POST()
+        return handler
+
+    handler = _post({"Content-Length": "5"}, b"hello" + b"POST /mcp HTTP/1.1\r\n")
+    assert handler.close_connection is False
+    assert handler.rfile.read() == b"POST /mcp HTTP/1.1\r\n"
+
+    for headers in ({"Transfer-Encoding": "chunked"}, {"Content-Length": str(10**6)}, {"Content-Length": "x"}):
+        assert _post(headers, b"5\r\nhello\r\n0\r\n\r\n").close_connection is True
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+
+from pipeline_mcp import mcp_stdio_server
+
+
+class _Stream:
+    def __init__(self, data: bytes = b"") -> None:
+        self.buffer = io.BytesIO(data)
+
+
+def test_messages_round_trip_through_content_length_framing(monkeypatch):
+    stdout = _Stream()
+    monkeypatch.setattr(mcp_stdio_server.sys, "stdout", stdout)
+    mcp_stdio_server._write_message({"jsonrpc": "2.0", "id": 1, "result": {"name": "café"}})
+
+    monkeypatch.setattr(mcp_stdio_server.sys, "stdin", _Stream(stdout.buffer.getvalue()))
+    assert mcp_stdio_server._read_message() == {"jsonrpc": "2.0", "id": 1, "result": {"name": "café"}}
+    assert mcp_stdio_server._read_message() is None
+
+
+def test_result_text_is_indented_json():
+    text = mcp_stdio_server._result_text({"ids": [1, 2], "big": 2**70})["content"][0]["text"]
+    assert json.loads(text) == {"ids": [1, 2], "big": 2**70}
+    assert text.startswith('{\n  "ids": [')
+
+
+def test_read_message_bounds_the_header_block(monkeypatch):
+    body = b'{"id": 7}'
+    framed = b"X-Note: a:b\r\ncontent-length:  %d \r\n\r\n" % len(body) + body
+    monkeypatch.setattr(mcp_stdio_server.sys, "stdin", _Stream(framed))
+    assert mcp_stdio_server._read_message() == {"id": 7}
+
+    for flood in (b"X" * 40000, b"X-Pad: y\r\n" * 4000):
+        monkeypatch.setattr(mcp_stdio_server.sys, "stdin", _Stream(flood + b"\r\n\r\n{}"))
+        with pytest.raises(ValueError, match="headers too large"):
+            mcp_stdio_server._read_message()
@@ -166,3 +166,21 @@ def test_esm_embedding_runpod_client_chunks_large_requests():
     assert fake_runpod.payload_sizes == [2, 2, 1]
     assert embeddings.shape == (5, 3)
     assert embeddings[:, 0].tolist() == [1.0, 1.0, 2.0, 2.0, 3.0]
+
+
+def test_build_runner_requests_webhooks_only_in_the_receiving_process(tmp_path, monkeypatch):
+    from pipeline_mcp.clients import runpod
+
+    env = {
+        "RUNPOD_API_KEY": "runpod-key",
+        "MMSEQS_ENDPOINT_ID": "mmseqs-runpod",
+        "PROTEINMPNN_ENDPOINT_ID": "proteinmpnn-runpod",
+        "PIPELINE_OUTPUT_ROOT": str(tmp_path),
+        "RUNPOD_WEBHOOK_URL": "https://pipeline.example/runpod/callback",
+        "RUNPOD_WEBHOOK_SECRET": "s3cret",
+    }
+    monkeypatch.setattr(runpod, "_RECEIVES_WEBHOOKS", False)
+    with patch.dict(os.environ, env, clear=True):
+        assert build_runner().mmseqs.runpod.webhook_url is None
+        runpod.receive_webhooks()
+        assert build_runner().mmseqs.runpod.webhook_url == "https://pipeline.example/runpod/callback?token=s3cret"
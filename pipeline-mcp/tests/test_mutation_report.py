@@ -0,0 +1,48 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from pipeline_mcp import mutation_report
+from pipeline_mcp.models import SequenceRecord
+
+
+class TestWriteMutationReports(unittest.TestCase):
+    def _write(self, native: str, samples: list[str], **kwargs) -> dict:
+        with tempfile.TemporaryDirectory() as tmp:
+            mutation_report.write_mutation_reports(
+                Path(tmp),
+                native=SequenceRecord(id="native", sequence=native),
+                samples=[SequenceRecord(id=f"s{i}", sequence=seq) for i, seq in enumerate(samples)],
+                fixed_positions_by_chain=kwargs.get("fixed", {}),
+                design_chains=kwargs.get("chains"),
+            )
+            return json.loads((Path(tmp) / "mutation_report.json").read_text(encoding="utf-8"))
+
+    def test_repeated_length_changed_chains_are_aligned_once(self) -> None:
+        real = mutation_report.global_alignment_mapping
+        with mock.patch.object(mutation_report, "global_alignment_mapping", side_effect=real) as align:
+            report = self._write("ACDE", ["ACE", "ACE", "ACDE", "AWDE", "ACE"])
+        self.assertEqual(align.call_count, 1)
+        rows = report["positions"]["A"]
+        self.assertEqual([row["gap_count"] for row in rows], [0, 0, 3, 0])
+        self.assertEqual(rows[1]["top_mutants"], [{"aa": "W", "count": 1}])
+        self.assertEqual(report["mutation_counts"]["per_sample"]["max"], 1.0)
+
+    def test_position_counts_keep_first_seen_order_and_break_ties_by_it(self) -> None:
+        report = self._write("ACDE/GH", ["AWDE/GH", "AYDE/GK", "AYDQ/GH", "AWDE/GH"], chains=["A", "B"])
+        self.assertEqual(list(report["positions"]["A"][1]["counts"].items()), [("W", 2), ("Y", 2)])
+        self.assertEqual(report["positions"]["A"][1]["top_mutants"], [{"aa": "W", "count": 2}, {"aa": "Y", "count": 2}])
+        self.assertEqual(report["positions"]["B"][1]["counts"], {"H": 3, "K": 1})
+        self.assertEqual(report["positions"]["A"][3]["mutated_count"], 1)
+
+    def test_tally_aligned_rows(self) -> None:
+        counts, mismatches = mutation_report._tally_aligned_rows("ACD", ["ACD", "A-E", "éCD"])
+        self.assertEqual(counts, [{"A": 2, "é": 1}, {"C": 2, "-": 1}, {"D": 2, "E": 1}])
+        self.assertEqual(mismatches, [(1, 1), (1, 2), (2, 0)])
+        self.assertEqual(mutation_report._tally_aligned_rows("AC", []), ([{}, {}], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
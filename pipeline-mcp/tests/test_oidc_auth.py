@@ -187,14 +187,49 @@ def test_verify_oidc_token_uses_cached_metadata_when_upstream_fetch_temporarily_
     monkeypatch.setitem(sys.modules, "jose", SimpleNamespace(jwt=FakeJWT))
     monkeypatch.setattr(oidc, "_OIDC_DISCOVERY_CACHE", {}, raising=False)
     monkeypatch.setattr(oidc, "_OIDC_JWKS_CACHE", {}, raising=False)
+    monkeypatch.setattr(oidc, "_OIDC_TOKEN_CACHE", {}, raising=False)
 
     assert verify_oidc_token("header.payload.sig", settings) == claims
 
     # The second verification should keep using cached discovery/JWKS data.
+    oidc._OIDC_TOKEN_CACHE.clear()
     assert verify_oidc_token("header.payload.sig", settings) == claims
     assert request_attempts == [discovery_url, jwks_url]
 
 
+def test_verify_oidc_token_reuses_claims_until_ttl_or_token_expiry(monkeypatch):
+    settings = OIDCSettings(
+        issuer="https://sso.example.org/realms/kbf",
+        client_id="protein-pipeline",
+        audience=None,
+        scopes="openid",
+        provider_name="KBF SSO",
+        jwks_url=None,
+        algorithms=("RS256",),
+    )
+    now = [1000.0]
+    decoded: list[str] = []
+
+    def fake_verify(token, _settings):
+        decoded.append(token)
+        return {"sub": token, "exp": 1010.0 if token == "short" else 9999.0}
+
+    monkeypatch.setattr(oidc, "_verify_oidc_token", fake_verify)
+    monkeypatch.setattr(oidc, "_OIDC_TOKEN_CACHE", {}, raising=False)
+    monkeypatch.setattr(oidc.time, "time", lambda: now[0])
+
+    first = verify_oidc_token("long", settings)
+    first["sub"] = "mutated"
+    assert verify_oidc_token("long", settings)["sub"] == "long"
+    assert verify_oidc_token("short", settings)["sub"] == "short"
+    now[0] = 1015.0  # past "short"'s exp, inside the 30 s window
+    verify_oidc_token("long", settings)
+    verify_oidc_token("short", settings)
+    now[0] = 1031.0
+    verify_oidc_token("long", settings)
+    assert decoded == ["long", "short", "short", "long"]
+
+
 def test_refresh_oidc_tokens_uses_refresh_token_grant(monkeypatch):
     settings = OIDCSettings(
         issuer="https://sso.k-biofoundrycopilot.duckdns.org/realms/kbf",
@@ -242,3 +277,44 @@ def test_refresh_oidc_tokens_uses_refresh_token_grant(monkeypatch):
             10,
         )
     ]
+
+
+def test_verify_oidc_token_cache_is_safe_across_threads(monkeypatch):
+    import threading
+
+    settings = OIDCSettings(
+        issuer="https://sso.example.org/realms/kbf",
+        client_id="protein-pipeline",
+        audience=None,
+        scopes="openid",
+        provider_name="KBF SSO",
+        jwks_url=None,
+        algorithms=("RS256",),
+    )
+    monkeypatch.setattr(oidc, "_verify_oidc_token", lambda token, _settings: {"sub": token, "exp": 1e12})
+    monkeypatch.setattr(oidc, "_OIDC_TOKEN_CACHE", {}, raising=False)
+    monkeypatch.setattr(oidc, "_OIDC_TOKEN_CACHE_MAX", 8)
+    errors: list[BaseException] = []
+    start = threading.Barrier(8)
+
+    def worker(n):
+        start.wait()
+        try:
+            for i in range(2000):
+                token = f"t{n}-{i}"
+                assert verify_oidc_token(token, settings)["sub"] == token
+        except BaseException as exc:  # noqa: BLE001 - reported below
+            errors.append(exc)
+
+    old_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(old_interval)
+    assert errors == []
+    assert len(oidc._OIDC_TOKEN_CACHE) <= 8
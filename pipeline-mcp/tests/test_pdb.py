@@ -1,13 +1,27 @@
 import unittest
+from unittest import mock
 
+import numpy as np
+
+from pipeline_mcp.bio import pdb as pdb_module
 from pipeline_mcp.bio.pdb import ca_rmsd
+from pipeline_mcp.bio.pdb import ca_rmsd_batch
+from pipeline_mcp.bio.pdb import chain_ids
+from pipeline_mcp.bio.pdb import count_models
 from pipeline_mcp.bio.pdb import dssp_non_loop_positions_by_chain
+from pipeline_mcp.bio.pdb import iter_atoms
 from pipeline_mcp.bio.pdb import ligand_atoms_present
 from pipeline_mcp.bio.pdb import ligand_proximity_mask
+from pipeline_mcp.bio.pdb import ligand_proximity_mask_batch
 from pipeline_mcp.bio.pdb import mmcif_to_pdb
+from pipeline_mcp.bio.pdb import parse_pdb_arrays
 from pipeline_mcp.bio.pdb import preprocess_pdb
+from pipeline_mcp.bio.pdb import residues_by_chain
 from pipeline_mcp.bio.pdb import sequence_by_chain
+from pipeline_mcp.bio.pdb import strip_to_first_model
 from pipeline_mcp.bio.sdf import append_ligand_pdb
+from pipeline_mcp.bio.sdf import parse_sdf_arrays
+from pipeline_mcp.bio.sdf import parse_sdf_atoms
 from pipeline_mcp.bio.sdf import sdf_to_pdb
 
 
@@ -74,6 +88,142 @@ def _shift_residue_backbone(pdb_text: str, offsets: dict[int, tuple[float, float
     return "\n".join(out) + "\n"
 
 
+class TestPdbAtomParsing(unittest.TestCase):
+    def test_iter_atoms_fixed_columns_and_defaults(self) -> None:
+        pdb = (
+            "REMARK header\n"
+            "ATOM      1  CA  ALA A  12A      1.500  -2.250   3.000  1.00 20.00           C\n"
+            "hetatm    2 FE   HEM   100        x.xxx   0.000\n"
+            "ATOM      3  N   GLY B    \n"
+        )
+        atoms = [
+            (a.record, a.atom_name, a.resname, a.chain_id, a.resseq, a.icode, a.x, a.y, a.z, a.element)
+            for a in iter_atoms(pdb)
+        ]
+        self.assertEqual(
+            atoms,
+            [
+                ("ATOM", "CA", "ALA", "A", 12, "A", 1.5, -2.25, 3.0, "C"),
+                ("HETATM", "FE", "HEM", "_", 100, "", 0.0, 0.0, 0.0, "F"),
+                ("ATOM", "N", "GLY", "B", 0, "", 0.0, 0.0, 0.0, "N"),
+            ],
+        )
+
+    def test_iter_atoms_decodes_numeric_columns_like_float_and_int(self) -> None:
+        pdb = (
+            "ATOM      1  CA  ALA A  -3       -.500   +3.25  1.2e3   1.00 20.00           C\n"
+            "ATOM      2  CA  ALA A 1_0     -0.000 1.0.0      7.     1.00 20.00           C\n"
+        )
+        atoms = [(a.resseq, a.x, a.y, a.z) for a in iter_atoms(pdb)]
+        self.assertEqual(atoms, [(-3, -0.5, 3.25, 1200.0), (10, -0.0, 0.0, 7.0)])
+        self.assertEqual(str(atoms[1][1]), "-0.0")
+
+    def test_parse_pdb_arrays_matches_iter_atoms(self) -> None:
+        pdb = (
+            "REMARK header\n"
+            "ATOM      1  CA  ALA A  12A      1.500  -2.250   3.000  1.00 20.00           C\n"
+            "HETATM    2 FE   HEM   100       0.000   0.000   0.500\n"
+        )
+        arrays = parse_pdb_arrays(pdb)
+        self.assertEqual(arrays["record"].tolist(), ["ATOM", "HETATM"])
+        self.assertEqual(arrays["chain_id"].tolist(), ["A", "_"])
+        self.assertEqual(arrays["resseq"].tolist(), [12, 100])
+        self.assertEqual(arrays["xyz"].shape, (2, 3))
+        atoms = list(iter_atoms(pdb))
+        for i, atom in enumerate(atoms):
+            self.assertEqual(
+                (atom.record, atom.atom_name, atom.resname, atom.icode, atom.element),
+                tuple(arrays[key][i] for key in ("record", "atom_name", "resname", "icode", "element")),
+            )
+            self.assertEqual((atom.x, atom.y, atom.z), tuple(arrays["xyz"][i].tolist()))
+        with self.assertRaises(ValueError):
+            arrays["xyz"][0, 0] = 9.0
+
+    def test_iter_atoms_record_detection_matches_stripped_upper_record_names(self) -> None:
+        pdb = (
+            "  ATOM    1  CA  ALA A   1       1.000   0.000   0.000  1.00 20.00           c\r\n"
+            "ATOMS     2  CA  ALA A   2       2.000   0.000   0.000\r\n"
+            "\tatom    3  CB  ALA A   3       3.000   0.000   0.000\r"
+            "HETAT     4  C1  LIG L 100       4.000   0.000   0.000\x0c"
+            "HeTaTm    5  C2  LIG L 100       5.000   0.000   0.000  1.00 20.00          se\n"
+            "ATOM"
+        )
+        atoms = [(a.record, a.atom_name, a.x, a.element) for a in iter_atoms(pdb)]
+        self.assertEqual(
+            atoms,
+            [
+                ("ATOM", "CA", 1.0, "C"),
+                ("ATOM", "CB", 3.0, "C"),
+                ("HETATM", "C2", 5.0, "SE"),
+                ("ATOM", "", 0.0, ""),
+            ],
+        )
+
+    def test_residues_by_chain_groups_consecutive_atoms_and_numbers_per_chain(self) -> None:
+        pdb = (
+            "ATOM      1  N   ALA A   1       0.000   0.000   0.000  1.00 20.00           N\n"
+            "ATOM      2  CA  ALA A   1       1.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      3  CA  GLY B   5       2.000   0.000   0.000  1.00 20.00           C\n"
+            "HETATM    4  C1  LIG A 100       0.000   0.000   5.000  1.00 20.00           C\n"
+            "ATOM      5  CA  SER A   1A      3.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      6  CA  CYS A   2       4.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      7  CA  CYX A   2       5.000   0.000   0.000  1.00 20.00           C\n"
+        )
+        by_chain = residues_by_chain(pdb)
+        self.assertEqual(list(by_chain), ["A", "B"])
+        self.assertEqual(chain_ids(pdb), ["A", "B"])
+        self.assertEqual(chain_ids("HETATM    1  C1  LIG Z   1       0.000   0.000   0.000\n"), [])
+        self.assertEqual(
+            [(r.index, r.resname, r.resseq, r.icode, len(r.atoms)) for r in by_chain["A"]],
+            [(1, "ALA", 1, "", 2), (2, "SER", 1, "A", 1), (3, "CYS", 2, "", 2)],
+        )
+        self.assertEqual([(r.index, r.resseq) for r in by_chain["B"]], [(1, 5)])
+        self.assertEqual([a.atom_name for a in by_chain["A"][0].atoms], ["N", "CA"])
+        self.assertIsInstance(by_chain["A"][0].atoms, list)
+        with_het = residues_by_chain(pdb, only_atom_records=False)
+        self.assertEqual([r.resname for r in with_het["A"]], ["ALA", "LIG", "SER", "CYS"])
+
+        keys, coords = pdb_module._ca_coords_by_chain(pdb)["A"]
+        self.assertEqual(
+            keys.tolist(),
+            pdb_module._residue_keys(np.array([1, 1, 2]), np.array(["", "A", ""])).tolist(),
+        )
+        self.assertEqual(coords.tolist(), [[1.0, 0.0, 0.0], [3.0, 0.0, 0.0], [4.0, 0.0, 0.0]])
+        self.assertEqual(list(pdb_module._ca_coords_by_chain(pdb, chains=["B"])), ["B"])
+
+    def test_structure_is_parsed_once_across_queries(self) -> None:
+        pdb = (
+            "ATOM      1  CA  ALA A   1       0.000   0.000   0.000  1.00 20.00           C\n"
+            "HETATM    2  C1  LIG A 100       0.000   0.000   3.000  1.00 20.00           C\n"
+        )
+        pdb_module._parse_pdb.cache_clear()
+        with mock.patch.object(pdb_module, "_atom_columns", wraps=pdb_module._atom_columns) as parse:
+            self.assertEqual(sequence_by_chain(pdb), {"A": "A"})
+            self.assertTrue(ligand_atoms_present(pdb))
+            self.assertEqual(ligand_proximity_mask(pdb, chains=["A"]), {"A": [1]})
+            self.assertEqual(len(residues_by_chain(pdb)["A"]), 1)
+        self.assertEqual(parse.call_count, 1)
+        with self.assertRaises(ValueError):
+            pdb_module._parse_pdb(pdb).atoms.coords[0, 0] = 1.0
+
+    def test_iter_atoms_non_ascii_text_keeps_character_columns(self) -> None:
+        pdb = "ATOM      1  CA  ÅLA A   1       1.000   2.000   3.000  1.00 20.00           C\n"
+        atom = next(iter_atoms(pdb))
+        self.assertEqual((atom.resname, atom.chain_id, atom.x, atom.z), ("ÅLA", "A", 1.0, 3.0))
+
+        malformed = pdb + "ATOM      2  CB  ÅLA A           1.500   n/a     3.500  1.00 20.00           C\n"
+        atoms = list(iter_atoms(malformed))
+        self.assertEqual([(a.resseq, a.x, a.y, a.z) for a in atoms], [(1, 1.0, 2.0, 3.0), (0, 1.5, 0.0, 3.5)])
+
+    def test_model_lines_are_found_at_every_line_boundary(self) -> None:
+        pdb = "REMARK MODEL 9\rMODEL        1\nATOM\r\nENDMDL\x1cMODEL        2\fATOM\n MODEL 3\n"
+        self.assertEqual(count_models(pdb), 2)
+        self.assertEqual(strip_to_first_model(pdb), "REMARK MODEL 9\rMODEL        1\nATOM\r\nENDMDL\x1c")
+        single = "REMARK no MODEL here\nATOM\n"
+        self.assertEqual(count_models(single), 0)
+        self.assertIs(strip_to_first_model(single), single)
+
+
 class TestPdbLigandMask(unittest.TestCase):
     def test_ligand_mask_distance(self) -> None:
         pdb = (
@@ -113,6 +263,129 @@ class TestPdbLigandMask(unittest.TestCase):
         mask = ligand_proximity_mask(pdb, chains=["A"], distance_angstrom=6.0, ligand_atom_chains=["A"])
         self.assertEqual(mask, {"A": []})
 
+    def test_ligand_mask_cutoff_is_inclusive_and_skips_hydrogens(self) -> None:
+        pdb = (
+            "ATOM      1  CA  ALA A   1       0.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      2  H   GLY A   2       0.000   0.000   4.000  1.00 20.00           H\n"
+            "ATOM      3  CA  GLY A   2      20.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      4  CA  SER B   1       0.000   6.001   5.000  1.00 20.00           C\n"
+            "ATOM      5  CA  SER B   2       0.000   6.000   5.000  1.00 20.00           C\n"
+            "HETATM    6  C1  LIG L 100       0.000   0.000   5.000  1.00 20.00           C\n"
+            "HETATM    7  H1  LIG L 100       0.000   0.000   2.000  1.00 20.00           H\n"
+            "END\n"
+        )
+        mask = ligand_proximity_mask(pdb, distance_angstrom=6.0)
+        self.assertEqual(mask, {"A": [1], "B": [2]})
+        with mock.patch.object(pdb_module, "_KDTREE_MIN_PAIRS", 0):
+            self.assertEqual(ligand_proximity_mask(pdb, distance_angstrom=6.0), mask)
+
+    def test_ligand_mask_ignores_nan_ligand_coordinates(self) -> None:
+        pdb = (
+            "ATOM      1  CA  ALA A   1       0.000   0.000   0.000  1.00 20.00           C\n"
+            "HETATM    2  C1  LIG L 100       1.000   0.000   0.000  1.00 20.00           C\n"
+            "HETATM    3  C2  LIG L 100         nan   0.000   0.000  1.00 20.00           C\n"
+        )
+        self.assertEqual(ligand_proximity_mask(pdb, distance_angstrom=6.0), {"A": [1]})
+        with mock.patch.object(pdb_module, "_KDTREE_MIN_PAIRS", 0):
+            self.assertEqual(ligand_proximity_mask(pdb, distance_angstrom=6.0), {"A": [1]})
+        only_nan = pdb_module._near_bounding_sphere(
+            np.zeros((1, 3)), np.zeros(1, dtype=np.intp), np.ones(1, dtype=bool), 1, np.full((1, 3), np.nan), 6.0
+        )
+        self.assertEqual(only_nan.tolist(), [False])
+
+    def test_ligand_mask_zero_cutoff_keeps_coincident_atoms(self) -> None:
+        pdb = (
+            "ATOM      1  CA  ALA A   1       0.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      2  CA  GLY A   2       0.000   0.000   0.001  1.00 20.00           C\n"
+            "HETATM    3  C1  LIG L 100       0.000   0.000   0.000  1.00 20.00           C\n"
+        )
+        self.assertEqual(ligand_proximity_mask(pdb, distance_angstrom=0.0), {"A": [1]})
+        with mock.patch.object(pdb_module, "_KDTREE_MIN_PAIRS", 0):
+            self.assertEqual(ligand_proximity_mask(pdb, distance_angstrom=0.0), {"A": [1]})
+
+    def test_ligand_mask_keeps_extra_coordinate_decimals(self) -> None:
+        # Thousandths would round 6.00004 onto the cutoff; such files must use full precision.
+        pdb = (
+            "ATOM      1  CA  ALA A   1       0.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      2  CA  GLY A   2       0.000 0.00001   0.000  1.00 20.00           C\n"
+            "HETATM    3  C1  LIG L 100       0.000   0.000 6.00004  1.00 20.00           C\n"
+            "HETATM    4  C2  LIG L 100       0.000   0.000  -6.000  1.00 20.00           C\n"
+        )
+        self.assertEqual(ligand_proximity_mask(pdb, distance_angstrom=6.0), {"A": [1]})
+        self.assertEqual(pdb_module._milli_angstrom(np.array([[1.5, -2.25, 1e4]])).tolist(), [[1500, -2250, 10000000]])
+        self.assertIsNone(pdb_module._milli_angstrom(np.array([[6.00004, 0.0, 0.0]])))
+
+    def test_ligand_mask_kdtree_path_matches_dense_path(self) -> None:
+        lines = []
+        serial = 1
+        for resseq in range(1, 41):
+            for offset in (0.0, 1.5):
+                x = float(resseq) * 1.9 + offset
+                lines.append(
+                    f"ATOM  {serial:5d}  CA  ALA A{resseq:4d}    {x:8.3f}{offset:8.3f}{0.0:8.3f}  1.00 20.00           C"
+                )
+                serial += 1
+        lines.append(f"HETATM{serial:5d}  C1  LIG L 100    {20.0:8.3f}{0.0:8.3f}{4.0:8.3f}  1.00 20.00           C")
+        pdb = "\n".join(lines) + "\n"
+
+        with mock.patch.object(pdb_module, "_KDTREE_MIN_PAIRS", 10**12):
+            dense = ligand_proximity_mask(pdb, distance_angstrom=6.0)
+        with mock.patch.object(pdb_module, "_KDTREE_MIN_PAIRS", 0):
+            tree = ligand_proximity_mask(pdb, distance_angstrom=6.0)
+        self.assertTrue(dense["A"])
+        self.assertEqual(dense, tree)
+
+    def test_atoms_within_grid_path_matches_dense_path_without_scipy(self) -> None:
+        rng = np.random.default_rng(7)
+        points = np.round(rng.uniform(-20.0, 20.0, (600, 3)), 3)
+        targets = np.round(rng.uniform(-4.0, 4.0, (40, 3)), 3)
+        points[:5] = targets[:5] + [6.0, 0.0, 0.0]
+        with mock.patch.object(pdb_module, "cKDTree", None), mock.patch.object(pdb_module, "_GRID_MIN_PAIRS", 0):
+            with mock.patch.object(pdb_module, "_grid_within", wraps=pdb_module._grid_within) as grid:
+                near = pdb_module._atoms_within(points, targets, 6.0)
+            self.assertEqual(grid.call_count, 1)
+        dense = pdb_module._dense_within(points, targets, 6.0, block_cells=1 << 18)
+        self.assertTrue(near[:5].all())
+        self.assertEqual(near.tolist(), dense.tolist())
+
+    def test_ligand_mask_skips_residues_outside_the_ligand_bounding_sphere(self) -> None:
+        pdb = (
+            "ATOM      1  N   ALA A   1       0.000   0.000   0.000  1.00 20.00           N\n"
+            "ATOM      2  CA  ALA A   1       1.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      3  CA  GLY A   2      30.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      4  N   SER A   3       0.000  40.000   0.000  1.00 20.00           N\n"
+            "ATOM      5  CA  SER A   3       0.000  41.000   0.000  1.00 20.00           C\n"
+            "ATOM      6  CA  CYS A   4       5.000   0.000   0.000  1.00 20.00           C\n"
+            "HETATM    7  C1  LIG L 100       0.000   0.000   4.000  1.00 20.00           C\n"
+            "HETATM    8  C2  LIG L 100       1.000   0.000   4.000  1.00 20.00           C\n"
+        )
+        with mock.patch.object(pdb_module, "_atoms_within", wraps=pdb_module._atoms_within) as within:
+            mask = ligand_proximity_mask(pdb, distance_angstrom=6.0)
+        self.assertEqual(mask, {"A": [1, 4]})
+        # Residues 2 and 3 are rejected by their bounding spheres before any pairwise distance.
+        self.assertEqual(len(within.call_args.args[0]), 3)
+
+    def test_ligand_mask_works_on_columns_without_building_atoms(self) -> None:
+        pdb = (
+            "ATOM      1  CA  ALA A   1       0.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      2  CA  GLY A   2      30.000   0.000   0.000  1.00 20.00           C\n"
+            "HETATM    3  C1  LIG L 100       0.000   0.000   4.000  1.00 20.00           C\n"
+        )
+        with mock.patch.object(pdb_module, "_atoms_from_columns", side_effect=AssertionError("Atom objects built")):
+            self.assertEqual(ligand_proximity_mask(pdb, distance_angstrom=6.0), {"A": [1]})
+            self.assertTrue(ligand_atoms_present(pdb))
+
+    def test_ligand_mask_batch_matches_single_calls(self) -> None:
+        pdbs = [
+            "ATOM      1  CA  ALA A   1       0.000   0.000   0.000  1.00 20.00           C\n"
+            f"HETATM    2  C1  LIG A 100       0.000   0.000 {z:7.3f}  1.00 20.00           C\n"
+            for z in (3.0, 9.0, 5.0)
+        ]
+        expected = [ligand_proximity_mask(pdb, chains=["A"]) for pdb in pdbs]
+        self.assertEqual(expected, [{"A": [1]}, {}, {"A": [1]}])
+        self.assertEqual(ligand_proximity_mask_batch(pdbs, chains=["A"], max_workers=2), expected)
+        self.assertEqual(ligand_proximity_mask_batch(pdbs, chains=["A"], max_workers=1), expected)
+
     def test_ligand_atoms_present(self) -> None:
         pdb = (
             "ATOM      1  CA  ALA A   1       0.000   0.000   0.000  1.00 20.00           C\n"
@@ -145,6 +418,25 @@ class TestSdfHelpers(unittest.TestCase):
         self.assertIn("HETATM", pdb)
         self.assertIn("LIG", pdb)
 
+    def test_parse_sdf_arrays_matches_atoms(self) -> None:
+        sdf = (
+            "test\n"
+            "  test\n"
+            "\n"
+            "  3  0  0  0  0  0  0  0  0  0  0  0 V2000\n"
+            "    1.0000    2.0000    3.0000 cl  0  0\n"
+            "    bad\n"
+            "   -1.5000       x      0.2500 N   0  0\n"
+            "M  END\n"
+            "$$$$\n"
+        )
+        arrays = parse_sdf_arrays(sdf)
+        self.assertEqual(arrays["xyz"].shape, (2, 3))
+        self.assertEqual(arrays["xyz"].tolist(), [[1.0, 2.0, 3.0], [-1.5, 0.0, 0.25]])
+        self.assertEqual(arrays["element"].tolist(), ["CL", "N"])
+        atoms = parse_sdf_atoms(sdf)
+        self.assertEqual([(a.x, a.y, a.z, a.element) for a in atoms], [(1.0, 2.0, 3.0, "CL"), (-1.5, 0.0, 0.25, "N")])
+
     def test_append_ligand_pdb(self) -> None:
         protein = (
             "ATOM      1  CA  ALA A   1       0.000   0.000   0.000  1.00 20.00           C\n"
@@ -171,6 +463,27 @@ class TestPdbSequenceExtraction(unittest.TestCase):
         seqs = sequence_by_chain(pdb)
         self.assertEqual(seqs, {"A": "AG"})
 
+    def test_sequence_by_chain_maps_case_insensitively_and_marks_unknown_names(self) -> None:
+        pdb = (
+            "ATOM      1  CA  mse B   1       0.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      2  CA  ALA A   1       0.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      3  CA  Hsd B   2       1.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      4  CA  AB1 B   3       2.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      5  CA   DA A   2       1.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      6  CA  GLΥ A   3       2.000   0.000   0.000  1.00 20.00           C\n"
+            "END\n"
+        )
+        self.assertEqual(sequence_by_chain(pdb), {"B": "MHX", "A": "AXX"})
+        self.assertEqual(sequence_by_chain(pdb, unknown="", chains=["A"]), {"A": "A"})
+        self.assertEqual(sequence_by_chain(pdb, unknown="?", chains=["B", "Z"]), {"B": "MH?"})
+
+    def test_sequence_by_chain_results_do_not_share_cached_state(self) -> None:
+        pdb = "ATOM      1  CA  ALA A   1       0.000   0.000   0.000  1.00 20.00           C\nEND\n"
+        first = sequence_by_chain(pdb)
+        first["A"] = "mutated"
+        first["Z"] = "extra"
+        self.assertEqual(sequence_by_chain(pdb), {"A": "A"})
+
     def test_mmcif_to_pdb_supports_target_sequence_extraction(self) -> None:
         cif = """data_demo
 #
@@ -227,6 +540,65 @@ class TestPdbPreprocess(unittest.TestCase):
             },
         )
 
+    def test_renumbering_preserves_other_lines_and_normalises_line_breaks(self) -> None:
+        pdb = (
+            "REMARK  kept as is\r\n"
+            "ATOM      1  CA  ALA A  -5A      0.000   0.000   0.000  1.00 20.00           C\r\n"
+            "ATOM      2  CA  GLY A   7\r\n"
+            "HETATM    3  C1  LIG A 900       0.000   0.000   0.000  1.00 20.00    Ç      C\r\n"
+            "TER       4      LIG A 900\r\n"
+            "END"
+        )
+        out, mapping = preprocess_pdb(pdb, renumber_resseq_from_1=True)
+        self.assertEqual(
+            out,
+            "REMARK  kept as is\n"
+            "ATOM      1  CA  ALA A   1       0.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      2  CA  GLY A   2 \n"
+            "HETATM    3  C1  LIG A   3       0.000   0.000   0.000  1.00 20.00    Ç      C\n"
+            "TER       4      LIG A   3 \n"
+            "END",
+        )
+        self.assertEqual([row["processed_resseq"] for row in mapping["A"]], [1, 2, 3])
+        self.assertEqual(mapping["A"][0]["original_icode"], "A")
+
+        out, mapping = preprocess_pdb(pdb.replace("\r\n", "\n") + "\n", strip_nonpositive_resseq=True)
+        self.assertEqual(out.splitlines()[1][:26], "ATOM      2  CA  GLY A   7")
+        self.assertTrue(out.endswith("END\n"))
+        self.assertEqual([row["original_resseq"] for row in mapping["A"]], [7, 900])
+
+    def test_trailing_blank_line_survives_line_break_normalisation(self) -> None:
+        atom = "ATOM      1  CA  ALA A   1       0.000   0.000   0.000  1.00 20.00           C"
+        for pdb, expected in (
+            (atom + "\r\n\r\n", atom + "\n\n"),
+            (atom + "\r\r", atom + "\n"),
+            (atom + "\n\r", atom + "\n"),
+            ("\r\n", "\n"),
+        ):
+            self.assertEqual(preprocess_pdb(pdb)[0], expected)
+            self.assertEqual(preprocess_pdb(pdb, renumber_resseq_from_1=True)[0], expected)
+
+    def test_column_path_matches_per_line_path(self) -> None:
+        pdb = (
+            "REMARK  kept as is\n"
+            "TER       1      ALA B   4\n"
+            "ATOM      2  CA  ALA A  -5A      0.000   0.000   0.000  1.00 20.00           C\n"
+            "atom      3  CA  GLY A   7\n"
+            " HETATM   4  C1  LIG    900       0.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      5  CA  ALA A  -5A      1.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      6  CA  SER B   0       0.000   1.000   0.000  1.00 20.00           C\n"
+            "TER       7      SER B   0\n"
+            "ATOM      8  CA  SER A 1_2       0.000   1.000   0.000  1.00 20.00           C\n"
+            "END"
+        )
+        for chains in (None, ["A", "_"], []):
+            for strip in (False, True):
+                for renumber in (False, True):
+                    kwargs = {"strip_nonpositive_resseq": strip, "renumber_resseq_from_1": renumber}
+                    buf, mapping = pdb_module._preprocess_lines(pdb, pdb_module._chain_filter(chains), **kwargs)
+                    expected = (bytes(buf[:-1]).decode("ascii"), mapping)
+                    self.assertEqual(preprocess_pdb(pdb, chains=chains, **kwargs), expected)
+
     def test_renumbers_selected_chains_only(self) -> None:
         pdb = (
             "ATOM      1  CA  ALA A  10       0.000   0.000   0.000  1.00 20.00           C\n"
@@ -264,6 +636,45 @@ class TestCaRmsd(unittest.TestCase):
         rmsd = ca_rmsd(pdb_ref, pdb_mob)
         self.assertAlmostEqual(rmsd, 0.0, places=5)
 
+    def test_ca_rmsd_superposes_half_turns_but_not_mirror_images(self) -> None:
+        def ca_pdb(coords: list[tuple[float, float, float]]) -> str:
+            return "".join(
+                f"ATOM  {i:5d}  CA  ALA A{i:4d}    {x:8.3f}{y:8.3f}{z:8.3f}  1.00 20.00           C\n"
+                for i, (x, y, z) in enumerate(coords, start=1)
+            )
+
+        ref = [(1.0, 2.0, 3.0), (4.0, -1.0, 0.5), (-2.0, 0.0, 1.0), (0.0, 3.0, -2.0)]
+        half_turn = [(-x, -y, z) for x, y, z in ref]
+        mirror = [(x, y, -z) for x, y, z in ref]
+        self.assertAlmostEqual(ca_rmsd(ca_pdb(ref), ca_pdb(half_turn)), 0.0, places=5)
+        self.assertGreater(ca_rmsd(ca_pdb(ref), ca_pdb(mirror)), 1.0)
+
+    def test_ca_rmsd_handles_degenerate_planar_geometry(self) -> None:
+        def ca_pdb(coords: list[tuple[float, float, float]]) -> str:
+            return "".join(
+                f"ATOM  {i:5d}  CA  ALA A{i:4d}    {x:8.3f}{y:8.3f}{z:8.3f}  1.00 20.00           C\n"
+                for i, (x, y, z) in enumerate(coords, start=1)
+            )
+
+        # A square has two equal singular values and a zero one; tilt it 90 degrees about x and shift it.
+        square = [(2.0, 0.0, 0.0), (0.0, 2.0, 0.0), (-2.0, 0.0, 0.0), (0.0, -2.0, 0.0)]
+        tilted = [(x + 5.0, -z, y - 1.0) for x, y, z in square]
+        self.assertAlmostEqual(ca_rmsd(ca_pdb(square), ca_pdb(tilted)), 0.0, places=5)
+        self.assertAlmostEqual(ca_rmsd(ca_pdb(square), ca_pdb([(x, y, -z) for x, y, z in square])), 0.0, places=5)
+
+    def test_ca_rmsd_batch_matches_single_calls(self) -> None:
+        ref = (
+            "ATOM      1  CA  ALA A   1       0.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      2  CA  GLY A   2       2.000   0.000   0.000  1.00 20.00           C\n"
+            "ATOM      3  CA  SER A   3       0.000   2.000   0.000  1.00 20.00           C\n"
+        )
+        mob = ref.replace("   0.000   2.000", "   0.000   3.000")
+        single = [ca_rmsd(ref, ref), ca_rmsd(ref, mob), ca_rmsd(ref, "END\n")]
+        self.assertIsNone(single[2])
+        self.assertEqual(ca_rmsd_batch([ref, ref, ref], [ref, mob, "END\n"], max_workers=2), single)
+        with self.assertRaises(ValueError):
+            ca_rmsd_batch([ref], [])
+
     def test_ca_rmsd_subset_matching(self) -> None:
         # Reference: Residues 10-12
         pdb_ref = (
@@ -3,6 +3,7 @@ import os
 import unittest
 from unittest.mock import patch
 
+from pipeline_mcp.clients import proteinmpnn
 from pipeline_mcp.clients.proteinmpnn import ProteinMPNNClient
 from pipeline_mcp.config import load_config
 
@@ -58,10 +59,13 @@ class ProteinMPNNGpuHttpClientTest(unittest.TestCase):
                 num_seq_per_target=2,
                 fixed_positions={"A": [1, 2]},
             )
+            _, _, full = client.design(pdb_text="ATOM\nEND\n", return_raw_output=True)
 
         self.assertEqual(native.sequence, "AAA")
         self.assertEqual(samples[0].sequence, "AFA")
-        self.assertEqual(raw["native"]["sequence"], "AAA")
+        self.assertNotIn("native", raw)
+        self.assertNotIn("samples", raw)
+        self.assertEqual(full["native"]["sequence"], "AAA")
         self.assertEqual(calls[0]["url"], "http://gpu.internal:18101/run")
         self.assertEqual(calls[0]["headers"]["Authorization"], "Bearer worker-secret")
         self.assertEqual(calls[0]["timeout"], 123.0)
@@ -71,6 +75,17 @@ class ProteinMPNNGpuHttpClientTest(unittest.TestCase):
         self.assertEqual(base64.b64decode(sent_input["pdb_base64"]).decode("utf-8"), "ATOM\nEND\n")
 
 
+class ProteinMPNNPayloadEncodingTest(unittest.TestCase):
+    def test_chunked_base64_matches_stdlib_encoding(self):
+        chunk = proteinmpnn._B64_CHUNK_CHARS
+        texts = ["", "A", "AB", "ATOM  " * (chunk // 3 + 1), "X" * (2 * chunk + 1), "HETATM caf\u00e9\n"]
+        with patch.object(proteinmpnn, "pybase64", None):
+            for text in texts:
+                self.assertEqual(
+                    proteinmpnn._b64encode_text(text), base64.b64encode(text.encode("utf-8")).decode("ascii")
+                )
+
+
 class ProteinMPNNGpuHttpConfigTest(unittest.TestCase):
     def test_gpu_http_provider_does_not_require_runpod_proteinmpnn_endpoint(self):
         env = {
@@ -90,6 +105,15 @@ class ProteinMPNNGpuHttpConfigTest(unittest.TestCase):
         self.assertEqual(cfg.proteinmpnn.gpu_token, "worker-secret")
         self.assertEqual(cfg.proteinmpnn.gpu_timeout_s, 456.0)
 
+    def test_load_config_is_read_once_until_cache_is_cleared(self):
+        env = {"RUNPOD_API_KEY": "k", "MMSEQS_ENDPOINT_ID": "m", "PROTEINMPNN_ENDPOINT_ID": "p"}
+        with patch.dict(os.environ, env, clear=True):
+            cfg = load_config()
+            os.environ["PIPELINE_OUTPUT_ROOT"] = "elsewhere"
+            self.assertIs(load_config(), cfg)
+            load_config.cache_clear()
+            self.assertEqual(load_config().output_root, "elsewhere")
+
 
 if __name__ == "__main__":
     unittest.main()
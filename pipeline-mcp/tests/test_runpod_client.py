@@ -1,12 +1,23 @@
 import base64
+import binascii
 import io
 import json
 import tarfile
+import threading
+import time
 import unittest
+import zipfile
+from unittest import mock
 
 import requests
 
 from pipeline_mcp.clients.alphafold2_runpod import AlphaFold2RunPodClient
+from pipeline_mcp.clients.alphafold2_runpod import _Base64Reader
+from pipeline_mcp.clients.alphafold2_runpod import _best_plddt_from_ranking_debug
+from pipeline_mcp.clients.alphafold2_runpod import _extract_members
+from pipeline_mcp.clients.diffdock_runpod import DiffDockRunPodClient
+from pipeline_mcp.clients.proteinmpnn import ProteinMPNNClient
+from pipeline_mcp.clients import runpod as runpod_module
 from pipeline_mcp.clients.runpod import RunPodClient
 from pipeline_mcp.models import SequenceRecord
 
@@ -73,6 +84,219 @@ class TestRunPodClient(unittest.TestCase):
         with self.assertRaisesRegex(RuntimeError, "does not have permission"):
             client._raise_for_status(_FakeResponse(403))
 
+    def test_status_long_polls_with_wait_param(self) -> None:
+        client = RunPodClient(api_key="key", timeout_s=10.0, status_ttl_s=0.0)
+        response = mock.Mock(content=b"{}")
+        response.json.return_value = {"status": "IN_PROGRESS"}
+        with mock.patch.object(client._session, "get", return_value=response) as get:
+            client.status("ep", "job", wait_s=30.0)
+            client.status("ep", "job")
+        self.assertEqual(get.call_args_list[0].kwargs["params"], {"wait": 30000})
+        self.assertEqual(get.call_args_list[0].kwargs["timeout"], 40.0)
+        self.assertIsNone(get.call_args_list[1].kwargs["params"])
+
+    def test_status_reuses_a_fresh_response_until_the_job_finishes(self) -> None:
+        client = RunPodClient(api_key="key", status_ttl_s=0.5)
+        responses = iter([{"status": "IN_PROGRESS"}, {"status": "IN_PROGRESS"}, {"status": "COMPLETED"}, {"status": "COMPLETED"}])
+        response = mock.Mock(content=b"{}")
+        response.json.side_effect = lambda: next(responses)
+        clock = iter([10.0, 10.2, 10.4, 10.95, 11.0, 11.1])
+        with mock.patch.object(client._session, "get", return_value=response) as get, mock.patch(
+            "pipeline_mcp.clients.runpod.time.monotonic", side_effect=lambda: next(clock)
+        ):
+            first = client.status("ep", "job")  # fetched, stamped at 10.0
+            first["status"] = "mutated"
+            self.assertEqual(client.status("ep", "job"), {"status": "IN_PROGRESS"})  # 10.2: cached
+            self.assertEqual(client.status("ep", "job", wait_s=5.0), {"status": "IN_PROGRESS"})  # long poll, 10.4
+            self.assertEqual(client.status("ep", "job")["status"], "COMPLETED")  # 10.95: expired, fetched
+            self.assertEqual(client.status("ep", "job")["status"], "COMPLETED")  # terminal is never cached
+        self.assertEqual(get.call_count, 4)
+        self.assertEqual(client._status_cache, {})
+
+    def test_peek_skips_parsing_large_bodies_of_running_jobs_only(self) -> None:
+        client = RunPodClient(api_key="key", status_ttl_s=0.0)
+        logs = "x" * (70 * 1024)
+        bodies = [
+            {"id": "job", "output": {"log": logs}, "status": "IN_PROGRESS"},
+            {"id": "job", "output": {"log": logs, "status": "IN_PROGRESS"}, "status": "COMPLETED"},
+            {"id": "job", "output": {"log": logs}, "status": "COMPLETED"},
+            {"id": "job", "status": "IN_PROGRESS"},
+        ]
+        responses = []
+        for body in bodies:
+            response = mock.Mock(content=json.dumps(body).encode("utf-8"))
+            response.json.return_value = body
+            responses.append(response)
+        with mock.patch.object(client._session, "get", side_effect=responses):
+            seen = [client._fetch_status("ep", "job", peek=True) for _ in bodies]
+        self.assertEqual(seen[0], {"id": "job", "status": "IN_PROGRESS"})
+        self.assertFalse(responses[0].json.called)
+        self.assertEqual(seen[1:], bodies[1:])
+
+    def test_clients_reuse_one_pooled_session(self) -> None:
+        client = RunPodClient(api_key="key")
+        adapter = client._session.get_adapter("https://api.runpod.ai/v2")
+        self.assertEqual(adapter.max_retries.status_forcelist, (502, 503, 504))
+        self.assertFalse(adapter.max_retries.raise_on_status)
+        self.assertIn("gzip", client._session.headers["Accept-Encoding"])
+        self.assertIsNot(RunPodClient(api_key="key")._session, client._session)
+        self.assertEqual(RunPodClient(api_key="key"), client)
+
+    def test_verify_and_auth_headers_are_resolved_once_at_construction(self) -> None:
+        with mock.patch.dict("os.environ", {"RUNPOD_INSECURE": "1"}):
+            insecure = RunPodClient(api_key="key", ca_bundle="/ca.pem")
+        client = RunPodClient(api_key="key", ca_bundle="/ca.pem")
+        response = mock.Mock(content=b"{}")
+        response.json.return_value = {"id": "job-1"}
+        with mock.patch.object(client._session, "post", return_value=response) as post, mock.patch.dict(
+            "os.environ", {"RUNPOD_INSECURE": "1"}
+        ):
+            client.run("ep", {})
+        self.assertEqual(post.call_args.kwargs["verify"], "/ca.pem")
+        self.assertEqual(post.call_args.kwargs["headers"], {"Authorization": "Bearer key"})
+        self.assertFalse(insecure._verify)
+
+    def test_wait_backs_off_only_for_time_the_server_did_not_hold(self) -> None:
+        client = RunPodClient(api_key="key", poll_interval_s=2.0, status_wait_s=5.0)
+        statuses = iter([{"status": "IN_QUEUE"}] * 4 + [{"status": "IN_PROGRESS"}, {"status": "COMPLETED"}])
+        clock = iter([0.0, 0.0, 0.0, 1.0, 1.5, 3.0, 3.0, 5.0, 10.0, 10.0, 10.5, 12.0])
+        with mock.patch.object(RunPodClient, "_fetch_status", side_effect=lambda *a, **kw: next(statuses)) as status, mock.patch(
+            "pipeline_mcp.clients.runpod.time.monotonic", side_effect=lambda: next(clock)
+        ), mock.patch("pipeline_mcp.clients.runpod.time.sleep") as sleep:
+            self.assertEqual(client.wait("ep", "job"), {"status": "COMPLETED"})
+        self.assertEqual(status.call_args.kwargs, {"wait_s": 5.0, "peek": True})
+        # 0.5s, 1s, 2s, 2s, 2s backoff minus time already spent in each status call; none after a held poll.
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [0.5, 0.5, 2.0, 1.5])
+
+    def test_completion_hook_runs_off_the_polling_thread(self) -> None:
+        release = threading.Event()
+        recorded: list[tuple[str, dict, str]] = []
+
+        def slow_hook(endpoint_id, data):  # type: ignore[no-untyped-def]
+            release.wait(timeout=5)
+            recorded.append((endpoint_id, data, threading.current_thread().name))
+            raise OSError("disk full")  # swallowed: never affects the job result
+
+        client = RunPodClient(api_key="key", on_job_complete=slow_hook)
+        done = {"id": "job", "status": "COMPLETED", "executionTime": 1200}
+        with mock.patch.object(RunPodClient, "_fetch_status", return_value=done):
+            self.assertEqual(client.wait("ep", "job"), done)
+        self.assertEqual(recorded, [])
+        release.set()
+        deadline = time.monotonic() + 5
+        while not recorded and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.assertEqual([(eid, data) for eid, data, _ in recorded], [("ep", done)])
+        self.assertTrue(recorded[0][2].startswith("runpod-cb"))
+
+    def test_concurrent_waits_on_one_job_share_a_single_poller(self) -> None:
+        client = RunPodClient(api_key="key")
+        release = threading.Event()
+        polls: list[str] = []
+
+        def fake_poll(self, endpoint_id, job_id):  # type: ignore[no-untyped-def]
+            polls.append(job_id)
+            release.wait(timeout=5)
+            return {"id": job_id, "status": "COMPLETED"}
+
+        results: list[dict] = []
+        with mock.patch.object(RunPodClient, "_poll_until_done", fake_poll):
+            leader = threading.Thread(target=lambda: results.append(client.wait("ep", "job")))
+            leader.start()
+            while ("ep", "job") not in client._watches:
+                time.sleep(0.001)
+            followers = [threading.Thread(target=lambda: results.append(client.wait("ep", "job"))) for _ in range(2)]
+            for thread in followers:
+                thread.start()
+            time.sleep(0.05)
+            release.set()
+            for thread in [leader, *followers]:
+                thread.join(timeout=5)
+
+        self.assertEqual(polls, ["job"])
+        self.assertEqual(results, [{"id": "job", "status": "COMPLETED"}] * 3)
+        self.assertEqual(client._watches, {})
+
+    def test_wait_returns_webhook_delivery_without_polling_again(self) -> None:
+        client = RunPodClient(api_key="key", webhook_url="https://pipeline.example/runpod/callback?token=t")
+        submitted = mock.Mock(content=b"{}")
+        submitted.json.return_value = {"id": "job-1"}
+        polled = mock.Mock(content=b"{}")
+        polled.json.return_value = {"id": "job-1", "status": "IN_QUEUE"}
+        pushed = {"id": "job-1", "status": "COMPLETED", "output": {"ok": True}}
+        inbox = runpod_module._WebhookInbox()
+
+        def fake_get(url, **kwargs):  # type: ignore[no-untyped-def]
+            threading.Timer(0.05, runpod_module.deliver_webhook, args=(pushed,)).start()
+            return polled
+
+        with mock.patch.object(runpod_module, "_WEBHOOKS", inbox), mock.patch.object(
+            client._session, "post", return_value=submitted
+        ) as post, mock.patch.object(client._session, "get", side_effect=fake_get) as get:
+            job_id, data = client.run_and_wait_with_job_id("ep", {"x": 1})
+
+        self.assertEqual((job_id, data), ("job-1", pushed))
+        self.assertEqual(post.call_args.kwargs["json"]["webhook"], client.webhook_url)
+        self.assertEqual(get.call_count, 1)
+        self.assertIsNone(get.call_args.kwargs["params"])  # no long-poll when the result is pushed
+
+    def test_run_and_wait_many_submits_everything_before_waiting(self) -> None:
+        events: list[str] = []
+        lock = threading.Lock()
+
+        def fake_run(self, endpoint_id, payload):  # type: ignore[no-untyped-def]
+            with lock:
+                events.append(f"run {payload['n']}")
+            return f"job{payload['n']}"
+
+        def fake_wait(self, endpoint_id, job_id):  # type: ignore[no-untyped-def]
+            with lock:
+                events.append(f"wait {job_id}")
+            return {"status": "COMPLETED", "output": {"job": job_id}}
+
+        reported: list[tuple[int, str]] = []
+        with mock.patch.object(RunPodClient, "run", fake_run), mock.patch.object(RunPodClient, "wait", fake_wait):
+            out = RunPodClient(api_key="key").run_and_wait_many(
+                "ep", [{"n": i} for i in range(5)], on_job_id=lambda i, j: reported.append((i, j)), max_concurrency=3
+            )
+
+        self.assertEqual([job_id for job_id, _ in out], [f"job{i}" for i in range(5)])
+        self.assertEqual([data["output"]["job"] for _, data in out], [f"job{i}" for i in range(5)])
+        self.assertEqual(reported, [(i, f"job{i}") for i in range(5)])
+        self.assertTrue(all(e.startswith("run") for e in events[:5]))
+        self.assertEqual(RunPodClient(api_key="key").run_and_wait_many("ep", []), [])
+
+    def test_proteinmpnn_chunks_are_queued_together(self) -> None:
+        class _FakeRunPod:
+            def __init__(self) -> None:
+                self.payloads: list[dict[str, object]] = []
+
+            def run_and_wait_many(self, endpoint_id, payloads, on_job_id=None):  # type: ignore[no-untyped-def]
+                self.payloads = list(payloads)
+                out = []
+                for i, payload in enumerate(payloads):
+                    on_job_id(i, f"job{i}")
+                    samples = [{"name": f"x{k}", "sequence": "AC"} for k in range(int(payload["num_seq_per_target"]))]
+                    out.append((f"job{i}", {"status": "COMPLETED", "output": {"native": {"sequence": "AA"}, "samples": samples}}))
+                return out
+
+        runpod = _FakeRunPod()
+        seen: list[str] = []
+        client = ProteinMPNNClient(runpod=runpod, endpoint_id="ep")
+        with mock.patch.dict("os.environ", {"PROTEINMPNN_MAX_SEQS_PER_JOB": "2"}):
+            native, samples, meta = client.design(pdb_text="ATOM\n", num_seq_per_target=5, seed=7, on_job_id=seen.append)
+
+        self.assertEqual([p["seed"] for p in runpod.payloads], [7, 8, 9])
+        self.assertEqual([p["num_seq_per_target"] for p in runpod.payloads], [2, 2, 1])
+        self.assertEqual(seen, ["job0", "job1", "job2"])
+        self.assertEqual(native.sequence, "AA")
+        self.assertEqual([s.id for s in samples], ["s00001", "s00002", "s00003", "s00004", "s00005"])
+        self.assertEqual(samples[4].meta["chunk"], 3)
+        self.assertEqual(
+            [(c["chunk"], c["job_ids"], c["sample_count"]) for c in meta["chunks"]],
+            [(1, ["job0"], 2), (2, ["job1"], 2), (3, ["job2"], 1)],
+        )
+
     def test_alphafold2_runpod_client_retries_missing_pdb_outputs_with_fresh_job(self) -> None:
         class _FakeRunPod:
             def __init__(self) -> None:
@@ -106,6 +330,114 @@ class TestRunPodClient(unittest.TestCase):
         self.assertEqual(out["seq1"]["best_model"], "model_1")
         self.assertIn("MODEL 1", str(out["seq1"]["ranked_0_pdb"] or ""))
 
+    def test_alphafold2_runpod_client_runs_sequences_concurrently_in_input_order(self) -> None:
+        barrier = threading.Barrier(3, timeout=5)
+
+        class _FakeRunPod:
+            def run_and_wait_with_job_id(self, endpoint_id: str, payload: dict[str, object], on_job_id=None):  # type: ignore[no-untyped-def]
+                job_id = f"job_{payload['sequence']}"
+                if callable(on_job_id):
+                    on_job_id(job_id)
+                barrier.wait()  # only returns once all three jobs are in flight
+                return job_id, _successful_af2_job()
+
+        observed_job_ids: list[tuple[str, str]] = []
+        client = AlphaFold2RunPodClient(runpod=_FakeRunPod(), endpoint_id="endpoint-1")
+        records = [SequenceRecord(id=f"seq{i}", sequence=seq) for i, seq in enumerate(["AAA", "CCC", "DDD"])]
+
+        out = client.predict(records, on_job_id=lambda seq_id, job_id: observed_job_ids.append((seq_id, job_id)))
+
+        self.assertEqual(list(out), ["seq0", "seq1", "seq2"])
+        self.assertEqual(sorted(observed_job_ids), [("seq0", "job_AAA"), ("seq1", "job_CCC"), ("seq2", "job_DDD")])
+        self.assertEqual({rec["best_model"] for rec in out.values()}, {"model_1"})
+
+    def test_alphafold2_runpod_client_raises_without_waiting_for_jobs_in_flight(self) -> None:
+        release = threading.Event()
+        finished = threading.Event()
+
+        class _FakeRunPod:
+            def run_and_wait_with_job_id(self, endpoint_id: str, payload: dict[str, object], on_job_id=None):  # type: ignore[no-untyped-def]
+                if payload["sequence"] == "AAA":
+                    raise RuntimeError("endpoint failed")
+                release.wait(2)
+                finished.set()
+                return "job", _successful_af2_job()
+
+        client = AlphaFold2RunPodClient(runpod=_FakeRunPod(), endpoint_id="endpoint-1")
+        records = [SequenceRecord(id=f"seq{i}", sequence=seq) for i, seq in enumerate(["AAA", "CCC", "DDD"])]
+        try:
+            with self.assertRaisesRegex(RuntimeError, "endpoint failed"):
+                client.predict(records, max_concurrency=2)
+            self.assertFalse(finished.is_set())  # CCC is still running: predict did not wait for it
+        finally:
+            release.set()
+
+    def test_extract_members_takes_first_match_per_suffix_in_one_streamed_pass(self) -> None:
+        raw = io.BytesIO()
+        with tarfile.open(fileobj=raw, mode="w:gz") as tar:
+            folder = tarfile.TarInfo("out")
+            folder.type = tarfile.DIRTYPE
+            tar.addfile(folder)
+            for name, text in (
+                ("out/ranked_0.pdb", "first"),
+                ("out/ranking_debug.json", "{}"),
+                ("copy/ranked_0.pdb", "second"),
+            ):
+                payload = text.encode("utf-8")
+                info = tarfile.TarInfo(name)
+                info.size = len(payload)
+                tar.addfile(info, io.BytesIO(payload))
+
+        raw.seek(0)
+        with tarfile.open(fileobj=raw, mode="r|gz") as tar:
+            members = _extract_members(tar, {"ranking_debug.json", "ranked_0.pdb", "missing.txt"})
+        self.assertEqual(members, {"ranked_0.pdb": b"first", "ranking_debug.json": b"{}"})
+
+    def test_base64_reader_decodes_lazily_like_b64decode(self) -> None:
+        data = bytes(range(256)) * 40 + b"tail"
+        clean = base64.b64encode(data).decode("ascii")
+        wrapped = base64.encodebytes(data).decode("ascii")
+        for text in (clean, wrapped, clean[:100] + " *" + clean[100:]):
+            self.assertEqual(_Base64Reader(text, chunk_chars=64).read(), base64.b64decode(text))
+
+        reader = _Base64Reader(clean, chunk_chars=64)
+        self.assertEqual(reader.read(10), data[:10])
+        self.assertEqual(reader._pos, 64)
+        with self.assertRaises(binascii.Error):
+            _Base64Reader(clean[:-1], chunk_chars=64).read()
+
+    def test_best_plddt_falls_back_to_first_highest_numeric_score(self) -> None:
+        plddts = {"model_1": float("nan"), "model_2": 88.0, 3: 99.0, "model_3": "97", "model_4": 88.0}
+        self.assertEqual(_best_plddt_from_ranking_debug({"plddts": plddts}), ("model_2", 88.0))
+        self.assertEqual(
+            _best_plddt_from_ranking_debug({"plddts": plddts, "order": ["model_4"]}), ("model_4", 88.0)
+        )
+        with self.assertRaisesRegex(RuntimeError, "no numeric scores"):
+            _best_plddt_from_ranking_debug({"plddts": {"model_1": float("-inf"), "model_2": float("nan")}})
+
+    def test_diffdock_runpod_client_prefers_complex_rank1_and_drops_inline_zip_text(self) -> None:
+        raw = io.BytesIO()
+        with zipfile.ZipFile(raw, "w") as zf:
+            zf.writestr("results/other/rank1.sdf", "other")
+            zf.writestr("results/lig/rank1.sdf", "wanted")
+            zf.writestr("results/lig/rank10.sdf", "rank10")
+            zf.writestr("lig/z/rank1.sdf", "later")
+        zip_b64 = base64.b64encode(raw.getvalue()).decode("ascii")
+
+        class _FakeRunPod:
+            def run_and_wait_with_job_id(self, endpoint_id: str, payload: dict[str, object], on_job_id=None):  # type: ignore[no-untyped-def]
+                return "dd-job", {"status": "COMPLETED", "output": {"returncode": 0, "out_dir_zip_b64": zip_b64}}
+
+        out = DiffDockRunPodClient(runpod=_FakeRunPod(), endpoint_id="endpoint-1").dock(
+            protein_pdb="ATOM\n", ligand_smiles="CCO", complex_name="lig"
+        )
+
+        self.assertEqual(out["selected_sdf_name"], "lig/z/rank1.sdf")
+        self.assertEqual(out["sdf_text"], "later")
+        self.assertEqual(out["zip_bytes"], raw.getvalue())
+        self.assertEqual(out["output"]["returncode"], 0)
+        self.assertEqual(out["output"]["out_dir_zip_b64"]["chars"], len(zip_b64))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,51 @@
+import threading
+import unittest
+from unittest import mock
+
+from pipeline_mcp.clients.soluprot import SoluProtClient
+from pipeline_mcp.models import SequenceRecord
+
+
+class _FakeResponse:
+    def __init__(self, payload: dict[str, object]) -> None:
+        self._payload = payload
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def json(self) -> dict[str, object]:
+        return self._payload
+
+
+class TestSoluProtClient(unittest.TestCase):
+    def test_score_splits_into_concurrent_batches_and_merges_in_order(self) -> None:
+        barrier = threading.Barrier(3, timeout=5)
+        batches: list[list[str]] = []
+
+        def fake_post(url, json, timeout):  # type: ignore[no-untyped-def]
+            ids = [item["id"] for item in json["sequences"]]
+            batches.append(ids)
+            barrier.wait()  # only returns once all three batches are in flight
+            return _FakeResponse({"results": [{"id": sid, "score": float(sid[1:]) / 10} for sid in ids]})
+
+        client = SoluProtClient(url="http://soluprot/score", batch_size=2, concurrency=3)
+        records = [SequenceRecord(id=f"s{i}", sequence="ACDE") for i in range(5)]
+        with mock.patch.object(client._session, "post", side_effect=fake_post):
+            scores = client.score(records)
+
+        self.assertEqual(sorted(batches), [["s0", "s1"], ["s2", "s3"], ["s4"]])
+        self.assertEqual(list(scores), ["s0", "s1", "s2", "s3", "s4"])
+        self.assertEqual(scores["s4"], 0.4)
+
+    def test_score_sends_one_request_for_small_or_empty_inputs(self) -> None:
+        client = SoluProtClient(url="http://soluprot/score")
+        response = _FakeResponse({"results": [{"id": "a", "score": 0.7}, {"id": "", "score": 1.0}, "junk"]})
+        with mock.patch.object(client._session, "post", return_value=response) as post:
+            self.assertEqual(client.score([SequenceRecord(id="a", sequence="ACDE")]), {"a": 0.7})
+            self.assertEqual(client.score([]), {"a": 0.7})
+        self.assertEqual(post.call_count, 2)
+        self.assertEqual(post.call_args.kwargs["json"], {"sequences": []})
+
+
+if __name__ == "__main__":
+    unittest.main()
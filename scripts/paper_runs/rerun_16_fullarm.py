@@ -9,7 +9,7 @@ first; corrected runs overwrite the standard run_ids so the analysis script
 regenerates correct summary/sequences/paired-test CSVs and Figure 3.
 """
 from __future__ import annotations
-import json, os, shutil, sys
+import dataclasses, json, os, shutil, sys
 from pathlib import Path
 
 PROJECT_ROOT = Path("/opt/protein_pipeline-work")
@@ -44,7 +44,7 @@ def main() -> int:
                 shutil.move(str(run_dir), str(bdir))
                 print(f"[backup] {run_id} -> {bdir}", flush=True)
             request = abl.build_request(pdb_text, arm, seed=1)
-            request = request.__class__(**{**request.__dict__, "force": True})
+            request = dataclasses.replace(request, force=True)
             print(f"[run] {run_id}  (input {fname}, arm {arm})", flush=True)
             try:
                 runner.run(request, run_id=run_id)
@@ -12,7 +12,7 @@ feeds the reported 18-target ablation statistics.
 Skips runs already corrected and completed; backs up originals once.
 """
 from __future__ import annotations
-import json, os, shutil, sys
+import dataclasses, json, os, shutil, sys
 from pathlib import Path
 
 PR = Path("/opt/protein_pipeline-work")
@@ -51,7 +51,7 @@ def main():
         if not bd.exists() and rd.exists():
             shutil.move(str(rd), str(bd)); print(f"[backup] {run_id}", flush=True)
         req = abl.build_request((SC / PDB[t]).read_text(), arm, seed=1)
-        req = req.__class__(**{**req.__dict__, "force": True})
+        req = dataclasses.replace(req, force=True)
         print(f"[run] {run_id} (chain-corrected, arm {arm})", flush=True)
         try:
             runner.run(req, run_id=run_id)